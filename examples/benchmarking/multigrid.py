@@ -0,0 +1,59 @@
+"""Cost of geometric multigrid as a `Grid2D` is refined
+
+For a Poisson problem on grids of `N = n * n` cells, the number of
+multigrid cycles taken by
+:class:`~fipy.solvers.scipy.linearMultigridSolver.LinearMultigridSolver`,
+and of conjugate gradient iterations preconditioned by
+:class:`~fipy.solvers.scipy.preconditioners.multigridPreconditioner.MultigridPreconditioner`,
+should not grow with `n`, so the time per cell should stay roughly
+constant.  Run as::
+
+    $ python examples/benchmarking/multigrid.py --largestGrid=1024
+"""
+from __future__ import print_function
+from __future__ import division
+from __future__ import unicode_literals
+
+from fipy import CellVariable, Grid2D, DiffusionTerm
+from fipy.solvers.scipy import LinearMultigridSolver, LinearPCGSolver
+from fipy.solvers.scipy.preconditioners import MultigridPreconditioner
+from fipy.tools.parser import parse
+from fipy.tools.timer import Timer
+
+def problem(n):
+    mesh = Grid2D(nx=n, ny=n, dx=1. / n, dy=1. / n)
+    var = CellVariable(mesh=mesh)
+    var.constrain(0., where=mesh.facesLeft | mesh.facesRight)
+    var.constrain(1., where=mesh.facesTop)
+    return var, DiffusionTerm() == -mesh.x * mesh.y
+
+def main():
+    largest = parse('--largestGrid', action='store',
+                    type='int', default=512)
+    tolerance = parse('--tolerance', action='store',
+                      type='float', default=1e-8)
+
+    print("n\tcycles\tcycle time / (ns / cell)\t"
+          "PCG iterations\tPCG time / (ns / cell)")
+
+    n = 32
+    while n <= largest:
+        var, eq = problem(n)
+        solver = LinearMultigridSolver(tolerance=tolerance)
+        with Timer() as multigrid:
+            eq.solve(var=var, solver=solver)
+        cycles = solver._cycles
+
+        var, eq = problem(n)
+        solver = LinearPCGSolver(tolerance=tolerance,
+                                 precon=MultigridPreconditioner())
+        with Timer() as pcg:
+            eq.solve(var=var, solver=solver)
+        iterations = solver._preconditionedIterations
+
+        print("%d\t%d\t%g\t%d\t%g" % (n, cycles, multigrid.elapsed / n**2,
+                                      iterations, pcg.elapsed / n**2))
+        n *= 2
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,8 @@ def OffsetSparseMatrix(SparseMatrix, numberOfVariables, numberOfEquations):
     class OffsetSparseMatrixClass(SparseMatrix):
         equationIndex = 0
         varIndex = 0
+        _offsetBaseClass = SparseMatrix
+        _offsetBlocks = (numberOfEquations, numberOfVariables)
 
         def __init__(self, mesh, nonZerosPerRow=1, exactNonZeros=False,
                      numberOfVariables=numberOfVariables,
@@ -9,8 +9,9 @@ from collections.abc import Iterable
 from petsc4py import PETSc
 
 from fipy.tools import numerix
-from fipy.matrices.sparseMatrix import (_SparseMatrix, _RowMesh2Matrix,
-                                        _ColMesh2Matrix, _RowColMesh2Matrix)
+from fipy.matrices.sparseMatrix import (_SparseMatrix, _SparsityPattern,
+                                        _RowMesh2Matrix, _ColMesh2Matrix,
+                                        _RowColMesh2Matrix)
 
 class _PETScMatrix(_SparseMatrix):
 
@@ -28,8 +29,26 @@ class _PETScMatrix(_SparseMatrix):
     def __del__(self):
         self.matrix.destroy()
 
+    #: The `_SparsityPattern` digest of each insertion into `matrix`, in
+    #: order, or `None` if the structure of `matrix` can't be told from
+    #: its insertions.
+    _patternDigests = None
+
+    @staticmethod
+    def _combinedDigests(*matrices):
+        """The insertions that make up the sum of `matrices`
+        """
+        digests = ()
+        for matrix in matrices:
+            if matrix._patternDigests is None:
+                return None
+            digests += matrix._patternDigests
+        return digests
+
     def copy(self):
-        return _PETScMatrix(matrix=self.matrix.copy())
+        copy = _PETScMatrix(matrix=self.matrix.copy())
+        copy._patternDigests = self._patternDigests
+        return copy
 
     def __getitem__(self, index):
         self.matrix.assemble()
@@ -48,6 +67,7 @@ class _PETScMatrix(_SparseMatrix):
         if other != 0:
             other.matrix.assemble()
             self.matrix = self.matrix + other.matrix
+            self._patternDigests = self._combinedDigests(self, other)
         return self
 
     def __add__(self, other):
@@ -77,7 +97,9 @@ class _PETScMatrix(_SparseMatrix):
         else:
             self.matrix.assemble()
             other.matrix.assemble()
-            return _PETScMatrix(matrix=self.matrix + other.matrix)
+            result = _PETScMatrix(matrix=self.matrix + other.matrix)
+            result._patternDigests = self._combinedDigests(self, other)
+            return result
 
     __radd__ = __add__
 
@@ -88,7 +110,9 @@ class _PETScMatrix(_SparseMatrix):
         else:
             self.matrix.assemble()
             other.matrix.assemble()
-            return _PETScMatrix(matrix=self.matrix - other.matrix)
+            result = _PETScMatrix(matrix=self.matrix - other.matrix)
+            result._patternDigests = self._combinedDigests(self, other)
+            return result
 
     def __rsub__(self, other):
         return -self + other
@@ -98,6 +122,7 @@ class _PETScMatrix(_SparseMatrix):
             self.matrix.assemble()
             other.matrix.assemble()
             self.matrix = self.matrix - other.matrix
+            self._patternDigests = self._combinedDigests(self, other)
         return self
 
     def __mul__(self, other):
@@ -140,6 +165,7 @@ class _PETScMatrix(_SparseMatrix):
             other.matrix.assemble()
             copy = self.copy()
             copy.matrix = self.matrix.matMult(other.matrix)
+            copy._patternDigests = None
             return copy
         elif isinstance(other, PETSc.Vec):
             y = other.duplicate()
@@ -198,7 +224,9 @@ class _PETScMatrix(_SparseMatrix):
         self.matrix.assemble(self.matrix.AssemblyType.FLUSH)
         self.matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector))
 
-    def _ijv2csr(self, i, j, v):
+    _patternCache = None
+
+    def _ijv2csr(self, i, j, v, sumDuplicates=False):
         """Convert arrays of matrix indices and values into CSR format
 
         see: http://netlib.org/linalg/html_templates/node91.html#SECTION00931100000000000000
@@ -215,6 +243,14 @@ class _PETScMatrix(_SparseMatrix):
             row indices
         v : array_like
             non-zero values
+        sumDuplicates : bool
+            Whether repeated (`i`, `j`) entries may be summed together,
+            allowing a cached `_SparsityPattern` to be used in place of
+            sorting the indices (default False).
+
+        The `_SparsityPattern` digest of the entries is recorded in
+        `_patternDigests` either way, so that solvers can tell whether two
+        matrices share their nonzero structure without extracting it.
 
         Returns
         -------
@@ -231,6 +267,27 @@ class _PETScMatrix(_SparseMatrix):
         v = numerix.asarray(v)
         start_row, end_row = self.matrix.getOwnershipRange()
 
+        own = (j >= start_row) & (j < end_row)
+        shape = (end_row - start_row, self.matrix.getSize()[1])
+
+        if sumDuplicates and self._patternCache is not None:
+            pattern = self._patternCache.pattern(j[own] - start_row, i[own],
+                                                 shape)
+            digest = pattern.digest
+        else:
+            pattern = None
+            digest = _SparsityPattern._digest(
+                _SparsityPattern._linearize(j[own] - start_row, i[own], shape),
+                shape)
+
+        if self._patternDigests is not None:
+            self._patternDigests += (digest,)
+
+        if pattern is not None:
+            return (pattern.indptr.astype('int32'),
+                    pattern.indices.astype('int32'),
+                    pattern.scatter(v[own]))
+
         ix = numerix.lexsort([i, j])
         ix = ix[(j[ix] >= start_row) & (j[ix] < end_row)]
         cols = i[ix]
@@ -291,7 +348,8 @@ class _PETScMatrix(_SparseMatrix):
              2.500000      ---     2.200000  
         """
         self.matrix.assemble(self.matrix.AssemblyType.FLUSH)
-        self.matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector),
+        self.matrix.setValuesCSR(*self._ijv2csr(id2, id1, vector,
+                                                sumDuplicates=True),
                                  addv=True)
 
     def addAtDiagonal(self, vector):
@@ -522,6 +580,7 @@ class _PETScMatrixFromShape(_PETScMatrix):
                 matrix.setPreallocationNNZ(nonZerosPerRow)
                 if not exactNonZeros:
                     matrix.setOption(matrix.Option.NEW_NONZERO_ALLOCATION_ERR, False)
+            self._patternDigests = ()
 
         super(_PETScMatrixFromShape, self).__init__(matrix=matrix)
 
@@ -567,6 +626,7 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
         tmp = super(_PETScBaseMeshMatrix, self).copy()
         copy = self.__class__(mesh=self.mesh) # FIXME: ??? , nonZerosPerRow=self.nonZerosPerRow)
         copy.matrix = tmp.matrix
+        copy._patternDigests = tmp._patternDigests
         return copy
 
     def __del__(self):
@@ -605,6 +665,13 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
 
         return self._ao_
 
+    @property
+    def _patternCache(self):
+        """Sparsity patterns shared by all matrices assembled on `mesh`
+        """
+        from fipy.matrices.sparseMatrix import _getSparsityPatternCache
+        return _getSparsityPatternCache(self.mesh)
+
     def _matrix2mesh(self, ids):
         """Convert matrix row indices to mesh cell indices
         """
@@ -615,9 +682,12 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
         """
         return self._ao.app2petsc(ids.astype('int32'))
 
-    def _fipy2petscGhost(self, var):
+    def _fipy2petscGhost(self, var, vec=None):
         """Convert a FiPy Variable to a PETSc `GhostVec`
 
+        If `vec` is given, it must have the ghost layout of this matrix
+        and is filled in place instead of creating a new `GhostVec`.
+
         Moves the ghosts to the end, as necessary.
         `var` may be coupled/vector and so moving the ghosts is a bit subtle.
 
@@ -647,10 +717,14 @@ class _PETScBaseMeshMatrix(_PETScMatrixFromShape):
         incorporeal = numerix.asarray(var[..., ~self._m2m.bodies]).ravel()
         array = numerix.concatenate([corporeal, incorporeal])
 
-        comm = self.mesh.communicator.petsc4py_comm
-        vec = PETSc.Vec().createGhostWithArray(ghosts=self._m2m.ghosts.astype('int32'),
-                                               array=array,
-                                               comm=comm)
+        if vec is None:
+            comm = self.mesh.communicator.petsc4py_comm
+            vec = PETSc.Vec().createGhostWithArray(ghosts=self._m2m.ghosts.astype('int32'),
+                                                   array=array,
+                                                   comm=comm)
+        else:
+            with vec.localForm() as lf:
+                lf.setArray(array)
 
         return vec
 
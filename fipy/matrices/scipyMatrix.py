@@ -16,20 +16,127 @@ class _ScipyMatrix(_SparseMatrix):
     `_ScipyMatrix` is always `NxN`.
     Allows basic python operations __add__, __sub__ etc.
     Facilitate matrix populating in an easy way.
+
+    Contributions from `addAt()` are accumulated as (row, column, value)
+    triplets in preallocated buffers and are only merged into the
+    internal CSR matrix when `matrix` is next accessed (or `finalize()` is
+    called), rather than performing a full CSR merge on every call.
     """
 
-    def __init__(self, matrix):
+    _pendingCount = 0
+    _patternCache = None
+
+    def __init__(self, matrix, nonZerosPerRow=0):
         """Creates a `_ScipyMatrix`.
 
         Parameters
         ----------
         matrix : ~scipy.sparse.csr_matrix
             The internal SciPy matrix
+        nonZerosPerRow : int or array_like of int
+            The approximate number of sparse entries per row.  Either a
+            typical number, or an iterable of values for each row.  Used
+            to preallocate the triplet buffers (default: 0).
         """
         self.matrix = matrix
 
+        if hasattr(nonZerosPerRow, "__iter__"):
+            capacity = int(numerix.sum(nonZerosPerRow))
+        else:
+            capacity = int(nonZerosPerRow) * matrix.shape[0]
+        self._allocateTriplets(capacity)
+
         super(_ScipyMatrix, self).__init__()
 
+    def _allocateTriplets(self, capacity):
+        self._pendingRows = numerix.empty((capacity,), dtype=numerix.INT_DTYPE)
+        self._pendingCols = numerix.empty((capacity,), dtype=numerix.INT_DTYPE)
+        self._pendingData = numerix.empty((capacity,), dtype='d')
+        self._pendingCount = 0
+
+    def _accumulate(self, vector, id1, id2):
+        """Append (`id1`, `id2`, `vector`) triplets to the pending buffers
+
+        The buffers are grown geometrically, so repeated calls are
+        amortized O(1) per entry.
+        """
+        vector = numerix.asarray(vector, dtype='d').ravel()
+        start = self._pendingCount
+        stop = start + len(vector)
+
+        if stop > len(self._pendingData):
+            capacity = max(stop, 2 * len(self._pendingData))
+            rows, cols, data = (self._pendingRows[:start],
+                                self._pendingCols[:start],
+                                self._pendingData[:start])
+            self._allocateTriplets(capacity)
+            self._pendingRows[:start] = rows
+            self._pendingCols[:start] = cols
+            self._pendingData[:start] = data
+
+        self._pendingRows[start:stop] = numerix.asarray(id1).ravel()
+        self._pendingCols[start:stop] = numerix.asarray(id2).ravel()
+        self._pendingData[start:stop] = vector
+        self._pendingCount = stop
+
+    def finalize(self):
+        """Merge any pending `addAt()` contributions into the CSR matrix
+
+        Duplicate (row, column) entries are summed by a single COO to CSR
+        conversion.  This happens automatically the first time `matrix`
+        is accessed after an `addAt()`.
+
+        >>> L = _ScipyMatrixFromShape(rows=3, cols=3, nonZerosPerRow=1)
+        >>> L.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        >>> L.addAt([1., 2., 3.], [0, 1, 2], [0, 1, 2])
+        >>> L.addAt([4., 5.], [0, 2], [2, 0])
+        >>> L.matrix.nnz == 0
+        False
+        >>> L._pendingCount
+        0
+        >>> print(L)
+         2.000000      ---     4.000000  
+            ---     4.000000      ---    
+         5.000000      ---     6.000000  
+        """
+        if self._pendingCount > 0:
+            if self._matrix.nnz > 0:
+                # merge with the existing entries in the same conversion,
+                # so that the sparsity does not depend on how the
+                # contributions were added
+                coo = self._matrix.tocoo()
+                self._accumulate(coo.data, coo.row, coo.col)
+            n = self._pendingCount
+            shape = self._matrix.shape
+            if self._patternCache is None:
+                temp = sp.csr_matrix((self._pendingData[:n],
+                                      (self._pendingRows[:n], self._pendingCols[:n])),
+                                     shape)
+            else:
+                pattern = self._patternCache.pattern(self._pendingRows[:n],
+                                                     self._pendingCols[:n],
+                                                     shape)
+                temp = sp.csr_matrix((pattern.scatter(self._pendingData[:n]),
+                                      pattern.indices.copy(),
+                                      pattern.indptr.copy()),
+                                     shape)
+            self._allocateTriplets(0)
+            self._matrix = temp
+
+    def _getMatrix(self):
+        self.finalize()
+        return self._matrix
+
+    def _setMatrix(self, m):
+        self._pendingCount = 0
+        self._matrix = m
+
+    def _delMatrix(self):
+        self._allocateTriplets(0)
+        del self._matrix
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
     def copy(self):
         return _ScipyMatrix(matrix=self.matrix.copy())
 
@@ -44,13 +151,33 @@ class _ScipyMatrix(_SparseMatrix):
         return self._iadd(other)
 
     def _iadd(self, other, sign=1):
-        if hasattr(other, "matrix"):
+        if isinstance(other, _ScipyMatrix) and other._matrix.shape == self._matrix.shape:
+            if (self._pendingCount == 0 and self._matrix.nnz == 0
+                and other._pendingCount == 0):
+                # nothing to merge with, e.g., when copying a cached
+                # contribution, so retain the sparsity of `other`
+                matrix = other._matrix.copy()
+                matrix.data *= sign
+                self.matrix = matrix
+            else:
+                # take over the pending triplets of `other`, rather than
+                # finalizing it, so that no sparsity pattern is derived
+                # for a matrix that is only an intermediate
+                coo = other._matrix.tocoo()
+                self._accumulate(sign * coo.data, coo.row, coo.col)
+                n = other._pendingCount
+                self._accumulate(sign * other._pendingData[:n],
+                                 other._pendingRows[:n], other._pendingCols[:n])
+        elif hasattr(other, "matrix"):
             self.matrix = self.matrix + (sign * other.matrix)
         elif isinstance(other, (float, int)):
-            fillVec = numerix.repeat(other, self.matrix.nnz)
+            # stored entries, including any explicit zeros left by
+            # accumulation, are what `nnz` counts
+            coo = self.matrix.tocoo()
+            fillVec = numerix.repeat(other, coo.nnz)
 
             self.matrix = self.matrix \
-                          + sp.csr_matrix((fillVec, self.matrix.nonzero()),
+                          + sp.csr_matrix((fillVec, (coo.row, coo.col)),
                                           self.matrix.shape)
         else:
             self.matrix = self.matrix + (sign * other)
@@ -249,9 +376,7 @@ class _ScipyMatrix(_SparseMatrix):
         """
         assert len(id1) == len(id2) == len(vector)
 
-        temp = sp.csr_matrix((vector, (id1, id2)), self.matrix.shape)
-
-        self.matrix = self.matrix + temp
+        self._accumulate(vector, id1, id2)
 
     def addAtDiagonal(self, vector):
         if isinstance(vector, (int, float)):
@@ -387,7 +512,8 @@ class _ScipyMatrixFromShape(_ScipyMatrix):
         mesh : ~fipy.meshes.mesh.Mesh
             The `Mesh` to assemble the matrix for.
         nonZerosPerRow : int or array_like of int
-            *ignored*
+            The approximate number of sparse entries per row, used to
+            preallocate storage for `addAt()` contributions.
         exactNonZeros : bool
             *ignored*
         matrix : ~scipy.sparse.csr_matrix
@@ -398,7 +524,8 @@ class _ScipyMatrixFromShape(_ScipyMatrix):
         if matrix is None:
             matrix = sp.csr_matrix((rows, cols))
 
-        super(_ScipyMatrixFromShape, self).__init__(matrix=matrix)
+        super(_ScipyMatrixFromShape, self).__init__(matrix=matrix,
+                                                    nonZerosPerRow=nonZerosPerRow)
 
 class _ScipyBaseMeshMatrix(_ScipyMatrixFromShape):
     def __init__(self, mesh, rows, cols,
@@ -415,7 +542,8 @@ class _ScipyBaseMeshMatrix(_ScipyMatrixFromShape):
         cols : int
             The number of local matrix columns.
         nonZerosPerRow : int or array_like of int
-            *ignored*
+            The approximate number of sparse entries per row, used to
+            preallocate storage for `addAt()` contributions.
         exactNonZeros : bool
             *ignored*
         matrix : ~scipy.sparse.csr_matrix
@@ -444,6 +572,55 @@ class _ScipyBaseMeshMatrix(_ScipyMatrixFromShape):
         """
         return var.value
 
+    @property
+    def _patternCache(self):
+        """Sparsity patterns shared by all matrices assembled on `mesh`
+
+        The symbolic structure derived by the first assembly of a given
+        set of coordinates is reused by later sweeps and time steps, which
+        then only scatter values into the existing nonzero slots.
+
+        >>> from fipy import Grid1D, CellVariable, DiffusionTerm
+        >>> from fipy.tools import serialComm
+        >>> mesh = Grid1D(nx=4, communicator=serialComm)
+        >>> var = CellVariable(mesh=mesh)
+        >>> D = CellVariable(mesh=mesh, value=1.)
+        >>> eq = DiffusionTerm(coeff=D)
+        >>> L1 = eq._buildMatrix(var, _ScipyMeshMatrix)[1]
+        >>> print(L1.numpyArray)
+        [[-1.  1.  0.  0.]
+         [ 1. -2.  1.  0.]
+         [ 0.  1. -2.  1.]
+         [ 0.  0.  1. -1.]]
+        >>> D.setValue(2.)
+        >>> L2 = eq._buildMatrix(var, _ScipyMeshMatrix)[1]
+        >>> print(L2.numpyArray)
+        [[-2.  2.  0.  0.]
+         [ 2. -4.  2.  0.]
+         [ 0.  2. -4.  2.]
+         [ 0.  0.  2. -2.]]
+        >>> L1._patternCache is L2._patternCache
+        True
+        >>> L1.matrix.indices is L2.matrix.indices
+        False
+
+        The terms of an equation are summed before its matrix is
+        finalized, so the whole equation needs a single pattern
+
+        >>> from fipy import TransientTerm, ConvectionTerm, ImplicitSourceTerm
+        >>> mesh = Grid1D(nx=5, communicator=serialComm)
+        >>> var = CellVariable(mesh=mesh)
+        >>> eq = (TransientTerm() == DiffusionTerm(coeff=1.)
+        ...       - ConvectionTerm(coeff=(1.,)) + ImplicitSourceTerm(coeff=1.))
+        >>> from fipy.solvers.scipy import LinearLUSolver
+        >>> eq.cacheMatrix()
+        >>> eq.solve(var=var, dt=1., solver=LinearLUSolver())
+        >>> print(len(eq.matrix._patternCache._patterns))
+        1
+        """
+        from fipy.matrices.sparseMatrix import _getSparsityPatternCache
+        return _getSparsityPatternCache(self.mesh)
+
 class _ScipyRowMeshMatrix(_ScipyBaseMeshMatrix):
     def __init__(self, mesh, cols, numberOfEquations=1,
                  nonZerosPerRow=0, exactNonZeros=False,
@@ -460,7 +637,8 @@ class _ScipyRowMeshMatrix(_ScipyBaseMeshMatrix):
             The rows of the matrix are determined by
             `numberOfEquations * mesh.numberOfCells`.
         nonZerosPerRow : int or array_like of int
-            *ignored*
+            The approximate number of sparse entries per row, used to
+            preallocate storage for `addAt()` contributions.
         exactNonZeros : bool
             *ignored*
         matrix : ~scipy.sparse.csr_matrix
@@ -494,7 +672,8 @@ class _ScipyColMeshMatrix(_ScipyBaseMeshMatrix):
             The columns of the matrix are determined by
             `numberOfVariables * mesh.globalNumberOfCells`.
         nonZerosPerRow : int or array_like of int
-            *ignored*
+            The approximate number of sparse entries per row, used to
+            preallocate storage for `addAt()` contributions.
         exactNonZeros : bool
             *ignored*
         matrix : ~scipy.sparse.csr_matrix
@@ -512,6 +691,75 @@ class _ScipyColMeshMatrix(_ScipyBaseMeshMatrix):
                                                   matrix=matrix,
                                                   storeZeros=storeZeros)
 
+class _BSRStructure(object):
+    """Block sparse structure of a CSR matrix of coupled unknowns
+
+    The block row, block column and slot within the block of each stored
+    entry of the CSR matrix are found once.  Any CSR matrix with the
+    same pattern is then converted by summing its `data` into the slots,
+    without sorting.
+
+    >>> A = sp.csr_matrix(numerix.array([[1., 0., 0., 2.],
+    ...                                  [0., 0., 5., 0.],
+    ...                                  [3., 0., 0., 4.],
+    ...                                  [0., 6., 0., 0.]]))
+    >>> structure = _BSRStructure(A, numberOfCells=2, blocksize=(2, 2))
+    >>> print(structure.convert(A).toarray())
+    [[ 1.  0.  0.  2.]
+     [ 3.  0.  0.  4.]
+     [ 0.  5.  0.  0.]
+     [ 0.  0.  6.  0.]]
+    >>> print(structure.matches(2 * A), structure.matches(A + sp.identity(4)))
+    True False
+    >>> print(structure.convert(2 * A).blocksize)
+    (2, 2)
+    """
+
+    def __init__(self, matrix, numberOfCells, blocksize):
+        """
+        Parameters
+        ----------
+        matrix : ~scipy.sparse.csr_matrix
+            Matrix with the unknowns ordered by field.
+        numberOfCells : int
+            The number of cells of each field.
+        blocksize : tuple of int
+            The number of equations and of variables.
+        """
+        R, C = blocksize
+        self.shape = matrix.shape
+        self.blocksize = blocksize
+        self.indptr = matrix.indptr.copy()
+        self.indices = matrix.indices.copy()
+        self.rowOrder = _ScipyMeshMatrix._interleaving(numberOfCells, R)
+        self.colOrder = _ScipyMeshMatrix._interleaving(numberOfCells, C)
+
+        rows = self.rowOrder[numerix.repeat(numerix.arange(self.shape[0]),
+                                            numerix.diff(self.indptr))]
+        cols = self.colOrder[self.indices]
+        blockColumns = self.shape[1] // C
+        keys = (rows // R) * blockColumns + cols // C
+        blockKeys, blockIDs = numerix.unique(keys, return_inverse=True)
+
+        self.blockIndices = (blockKeys % blockColumns).astype(numerix.INT_DTYPE)
+        self.blockIndptr = numerix.searchsorted(blockKeys // blockColumns,
+                                                numerix.arange(self.shape[0] // R + 1)).astype(numerix.INT_DTYPE)
+        self.slots = blockIDs * (R * C) + (rows % R) * C + cols % C
+        self.size = len(blockKeys) * R * C
+
+    def matches(self, matrix):
+        return (matrix.shape == self.shape
+                and numerix.array_equal(matrix.indptr, self.indptr)
+                and numerix.array_equal(matrix.indices, self.indices))
+
+    def convert(self, matrix):
+        """Block sparse form of a CSR `matrix` that `matches()`
+        """
+        data = numerix.bincount(self.slots, weights=matrix.data, minlength=self.size)
+        return sp.bsr_matrix((data.reshape((-1,) + tuple(self.blocksize)),
+                              self.blockIndices, self.blockIndptr),
+                             shape=self.shape)
+
 class _ScipyMeshMatrix(_ScipyRowMeshMatrix):
     def __init__(self, mesh, numberOfVariables=1, numberOfEquations=1,
                  nonZerosPerRow=0, exactNonZeros=False, matrix=None, storeZeros=True):
@@ -528,7 +776,8 @@ class _ScipyMeshMatrix(_ScipyRowMeshMatrix):
             The rows of the matrix are determined by
             `numberOfEquations * mesh.numberOfCells`.
         nonZerosPerRow : int or array_like of int
-            *ignored*
+            The approximate number of sparse entries per row, used to
+            preallocate storage for `addAt()` contributions.
         exactNonZeros : bool
             *ignored*
         matrix : ~scipy.sparse.csr_matrix
@@ -553,6 +802,70 @@ class _ScipyMeshMatrix(_ScipyRowMeshMatrix):
         else:
             return _ScipyMatrixFromShape.__mul__(self, other)
 
+    @staticmethod
+    def _interleaving(numberOfCells, blocks):
+        """Position of each unknown when those of a cell are made contiguous
+
+        The unknowns of coupled equations are ordered by field, i.e., all
+        the cells of the first variable, then all the cells of the
+        second, etc.  Interleaving orders them by cell instead.
+
+        >>> print(_ScipyMeshMatrix._interleaving(numberOfCells=3, blocks=2))
+        [0 2 4 1 3 5]
+        """
+        IDs = numerix.arange(numberOfCells * blocks)
+        return (IDs % numberOfCells) * blocks + IDs // numberOfCells
+
+    @property
+    def BSR(self):
+        """Block sparse matrix with the unknowns of each cell interleaved
+
+        Each block couples the equations of a cell to the variables of a
+        cell, so a coupled system of `numberOfEquations` equations in
+        `numberOfVariables` variables is stored as blocks of that size.
+
+        >>> from fipy import Grid1D
+        >>> L = _ScipyMeshMatrix(mesh=Grid1D(nx=3),
+        ...                      numberOfVariables=2, numberOfEquations=2)
+        >>> L.addAt((1., 2., 3., 4., 5.), (0, 0, 3, 3, 4), (0, 3, 0, 3, 2))
+        >>> print(L.numpyArray)
+        [[ 1.  0.  0.  2.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.]
+         [ 3.  0.  0.  4.  0.  0.]
+         [ 0.  0.  5.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.]]
+        >>> A = L.BSR
+        >>> print(A.blocksize)
+        (2, 2)
+        >>> print(A.toarray())
+        [[ 1.  2.  0.  0.  0.  0.]
+         [ 3.  4.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  5.  0.]
+         [ 0.  0.  0.  0.  0.  0.]
+         [ 0.  0.  0.  0.  0.  0.]]
+        """
+        return self._BSRStructure().convert(self._CSR)
+
+    @property
+    def _CSR(self):
+        matrix = self.matrix
+        if matrix.format != "csr":
+            matrix = matrix.tocsr()
+        return matrix
+
+    def _BSRStructure(self):
+        """Where the entries of `matrix` go in `BSR`
+
+        Only depends on the sparsity pattern, so it can be kept for the
+        matrices of later sweeps and time steps of the same equations.
+        """
+        return _BSRStructure(self._CSR,
+                             numberOfCells=self.mesh.numberOfCells,
+                             blocksize=(self.numberOfEquations,
+                                        self.numberOfVariables))
+
     def asTrilinosMeshMatrix(self):
         """Transforms a scipy matrix into a trilinos matrix and maintains the
         trilinos matrix as an attribute.
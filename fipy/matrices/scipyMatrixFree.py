@@ -0,0 +1,319 @@
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+from scipy.sparse.linalg import LinearOperator
+
+from fipy.tools import numerix
+from fipy.matrices.sparseMatrix import _SparseMatrix
+from fipy.matrices.scipyMatrix import _ScipyMeshMatrix
+
+class _FaceFluxOperator(LinearOperator):
+    """`LinearOperator` for the SciPy Krylov solvers
+
+    Also provides `diagonal()`, which is all that a Jacobi
+    preconditioner needs.
+    """
+    def __init__(self, matrix):
+        self._meshMatrix = matrix
+        super(_FaceFluxOperator, self).__init__(dtype=numerix.dtype('d'),
+                                                shape=matrix._shape)
+
+    def _matvec(self, x):
+        return self._meshMatrix.matvec(numerix.ravel(x))
+
+    def diagonal(self):
+        return self._meshMatrix.takeDiagonal()
+
+class _ScipyMatrixFreeMeshMatrix(_SparseMatrix):
+    """Mesh matrix that is applied without being assembled
+
+    Rather than merging the contributions of each term into a sparse
+    matrix, the coefficients of the fluxes across faces (see
+    :meth:`~fipy.matrices.sparseMatrix._SparseMatrix._addAtFaces`) are
+    summed into two arrays over the faces of the mesh, together with the
+    cell diagonal. The flux across a face leaves the cell on one side as
+    much as it enters the cell on the other, so the two coefficients of
+    the cell on the first side are all that is kept. The product with a
+    vector is evaluated directly from these, gathering the values on
+    either side of each face from the `_adjacentCellIDs` of the mesh and
+    scattering the fluxes back to the cells, so neither the column
+    indices of a sparse matrix nor the triplets needed to assemble it
+    are ever stored.
+
+    The few contributions that are neither face fluxes nor diagonal,
+    e.g., from :class:`~fipy.boundaryConditions.boundaryCondition.BoundaryCondition`
+    objects, are assembled in an ordinary `_ScipyMeshMatrix`.
+
+    >>> from fipy import CellVariable, Grid2D, DiffusionTerm, ImplicitSourceTerm
+    >>> from fipy.solvers.scipy import LinearGMRESSolver
+    >>> mesh = Grid2D(nx=4, ny=3)
+    >>> var = CellVariable(mesh=mesh, value=mesh.x * mesh.y**2)
+    >>> var.constrain(1., where=mesh.facesLeft)
+    >>> eq = (DiffusionTerm(coeff=mesh.x.faceValue + 1.)
+    ...       - ImplicitSourceTerm(coeff=mesh.y))
+    >>> solver = eq._prepareLinearSystem(var, LinearGMRESSolver(matrixFree=True), (), None)
+    >>> L = solver.matrix
+    >>> solver = eq._prepareLinearSystem(var, LinearGMRESSolver(), (), None)
+    >>> A = solver.matrix
+    >>> x = numerix.arange(mesh.numberOfCells, dtype=float)
+    >>> print(numerix.allclose(L * x, A * x))
+    True
+    >>> print(numerix.allclose(L.takeDiagonal(), A.takeDiagonal()))
+    True
+    >>> print(numerix.allclose(L.numpyArray, A.numpyArray))
+    True
+    >>> print(numerix.allclose(L.matrix * x, A.matrix * x))
+    True
+
+    The coefficients of both terms share one pair of arrays over the
+    faces, rather than being entries in two rows
+
+    >>> print(L._fluxCoefficients.shape == (2, mesh.numberOfFaces))
+    True
+    >>> print(L._remainder is None)
+    True
+
+    Contributions that are not conservative fluxes are assembled
+    instead
+
+    >>> ids = numerix.array([[[1, 2]]])
+    >>> M = _ScipyMatrixFreeMeshMatrix(mesh=mesh)
+    >>> M._addAtFaces(ids, ids + 1, numerix.ones(2), numerix.ones(2),
+    ...               numerix.ones(2), numerix.ones(2))
+    >>> print(M._fluxCoefficients is None, M._remainder is not None)
+    True True
+    >>> print(M[1:4, 1:4]) # doctest: +NORMALIZE_WHITESPACE
+     1.000000   1.000000      ---
+     1.000000   2.000000   1.000000
+        ---     1.000000   1.000000
+    """
+
+    def __init__(self, mesh, nonZerosPerRow=0, exactNonZeros=False,
+                 numberOfVariables=1, numberOfEquations=1):
+        """
+        Parameters
+        ----------
+        mesh : ~fipy.meshes.mesh.Mesh
+            The `Mesh` to apply the operator on.
+        nonZerosPerRow : int or array_like of int
+            *ignored*
+        exactNonZeros : bool
+            *ignored*
+        numberOfVariables : int
+            Must be 1.
+        numberOfEquations : int
+            Must be 1.
+        """
+        if numberOfVariables != 1 or numberOfEquations != 1:
+            raise NotImplementedError("matrix-free operators are only "
+                                      "available for a single scalar equation")
+
+        self.mesh = mesh
+        N = mesh.numberOfCells
+        self._diagonal = numerix.zeros((N,), 'd')
+        self._fluxCoefficients = None
+        self._remainder = None
+
+        super(_ScipyMatrixFreeMeshMatrix, self).__init__()
+
+    @property
+    def _shape(self):
+        N = self.mesh.numberOfCells
+        return (N, N)
+
+    @property
+    def _range(self):
+        return list(range(self._shape[1])), list(range(self._shape[0]))
+
+    def _getRemainder(self):
+        if self._remainder is None:
+            self._remainder = _ScipyMeshMatrix(mesh=self.mesh)
+        return self._remainder
+
+    def copy(self):
+        other = _ScipyMatrixFreeMeshMatrix(mesh=self.mesh)
+        other._iadd(self)
+        return other
+
+    def _getFluxCoefficients(self):
+        if self._fluxCoefficients is None:
+            self._fluxCoefficients = numerix.zeros((2, self.mesh.numberOfFaces), 'd')
+        return self._fluxCoefficients
+
+    def _addAtFaces(self, id1, id2, cell1diag, cell1offdiag, cell2offdiag, cell2diag):
+        interiorFaces = numerix.nonzero(self.mesh.interiorFaces)[0]
+        faceID1, faceID2 = self.mesh._adjacentCellIDs
+        if (numerix.array_equal(id1.ravel(), numerix.take(faceID1, interiorFaces))
+            and numerix.array_equal(id2.ravel(), numerix.take(faceID2, interiorFaces))
+            and numerix.array_equal(cell2offdiag, -numerix.asarray(cell1diag))
+            and numerix.array_equal(cell2diag, -numerix.asarray(cell1offdiag))):
+            coefficients = self._getFluxCoefficients()
+            coefficients[0, interiorFaces] += cell1diag
+            coefficients[1, interiorFaces] += cell1offdiag
+        else:
+            super(_ScipyMatrixFreeMeshMatrix, self)._addAtFaces(id1, id2,
+                                                                cell1diag, cell1offdiag,
+                                                                cell2offdiag, cell2diag)
+
+    def addAt(self, vector, id1, id2):
+        id1 = numerix.asarray(id1)
+        id2 = numerix.asarray(id2)
+        if id1 is id2 or numerix.array_equal(id1, id2):
+            self._diagonal += numerix.bincount(id1, weights=vector,
+                                               minlength=self._shape[0])
+        else:
+            self._getRemainder().addAt(vector, id1, id2)
+
+    def addAtDiagonal(self, vector):
+        self._diagonal += vector
+
+    def takeDiagonal(self):
+        diagonal = self._diagonal.copy()
+        N = self._shape[0]
+        if self._fluxCoefficients is not None:
+            c1, c2 = self._fluxCoefficients
+            id1, id2 = self.mesh._adjacentCellIDs
+            diagonal += numerix.bincount(id1, weights=c1, minlength=N)
+            diagonal -= numerix.bincount(id2, weights=c2, minlength=N)
+            # faces with the same cell on both sides, e.g., across a
+            # periodic mesh only one cell wide
+            same = id1 == id2
+            diagonal += numerix.bincount(id1[same], weights=c2[same] - c1[same], minlength=N)
+        if self._remainder is not None:
+            diagonal += self._remainder.takeDiagonal()
+        return diagonal
+
+    def putDiagonal(self, vector):
+        self._diagonal += vector - self.takeDiagonal()
+
+    def matvec(self, x):
+        """Evaluate the product of the operator with the vector `x`
+
+        The contributions of each face are gathered from the cells on
+        either side and scattered back to them.
+        """
+        x = numerix.asarray(x, dtype='d')
+        N = self._shape[0]
+        y = self._diagonal * x
+        if self._fluxCoefficients is not None:
+            c1, c2 = self._fluxCoefficients
+            id1, id2 = self.mesh._adjacentCellIDs
+            flux = c1 * x[id1] + c2 * x[id2]
+            y += numerix.bincount(id1, weights=flux, minlength=N)
+            y -= numerix.bincount(id2, weights=flux, minlength=N)
+        if self._remainder is not None:
+            y += self._remainder * x
+        return y
+
+    @property
+    def matrix(self):
+        return _FaceFluxOperator(self)
+
+    def _assemble(self):
+        """Equivalent `_ScipyMeshMatrix`, for inspection
+        """
+        A = _ScipyMeshMatrix(mesh=self.mesh)
+        A.addAtDiagonal(self._diagonal)
+        if self._fluxCoefficients is not None:
+            c1, c2 = self._fluxCoefficients
+            id1, id2 = self.mesh._adjacentCellIDs
+            A.addAt(c1, id1, id1)
+            A.addAt(c2, id1, id2)
+            A.addAt(-c1, id2, id1)
+            A.addAt(-c2, id2, id2)
+        if self._remainder is not None:
+            A += self._remainder
+        return A
+
+    @property
+    def numpyArray(self):
+        return self._assemble().numpyArray
+
+    @property
+    def CSR(self):
+        return self._assemble().CSR
+
+    @property
+    def LIL(self):
+        return self._assemble().LIL
+
+    def exportMmf(self, filename):
+        self._assemble().exportMmf(filename)
+
+    def __getitem__(self, index):
+        return self._assemble()[index]
+
+    def __str__(self):
+        return str(self._assemble())
+
+    def __repr__(self):
+        return "<%s %dx%d>" % ((self.__class__.__name__,) + self._shape)
+
+    def _scaled(self, factor):
+        scaled = _ScipyMatrixFreeMeshMatrix(mesh=self.mesh)
+        scaled._diagonal = self._diagonal * factor
+        if self._fluxCoefficients is not None:
+            scaled._fluxCoefficients = self._fluxCoefficients * factor
+        if self._remainder is not None:
+            scaled._remainder = _ScipyMeshMatrix(mesh=self.mesh,
+                                                 matrix=self._remainder.matrix * factor)
+        return scaled
+
+    def _iadd(self, other, sign=1):
+        if isinstance(other, (int, float)) and other == 0:
+            pass
+        elif isinstance(other, _ScipyMatrixFreeMeshMatrix):
+            self._diagonal += sign * other._diagonal
+            if other._fluxCoefficients is not None:
+                self._getFluxCoefficients()[:] += sign * other._fluxCoefficients
+            if other._remainder is not None:
+                self._getRemainder()._iadd(other._remainder, sign=sign)
+        else:
+            self._getRemainder()._iadd(other, sign=sign)
+        return self
+
+    def __iadd__(self, other):
+        return self._iadd(other)
+
+    def __isub__(self, other):
+        return self._iadd(other, sign=-1)
+
+    def __add__(self, other):
+        return self.copy()._iadd(other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        return self.copy()._iadd(other, sign=-1)
+
+    def __rsub__(self, other):
+        return (-self)._iadd(other)
+
+    def __neg__(self):
+        return self._scaled(-1)
+
+    def __mul__(self, other):
+        if isinstance(other, _SparseMatrix):
+            if isinstance(other, _ScipyMatrixFreeMeshMatrix):
+                other = other._assemble()
+            return self._assemble() * other
+        elif numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            return self.matvec(other)
+
+    def __rmul__(self, other):
+        if numerix.shape(other) == ():
+            return self._scaled(other)
+        else:
+            return other * self._assemble()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
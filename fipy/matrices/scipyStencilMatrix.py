@@ -0,0 +1,234 @@
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+__all__ = []
+
+import scipy.sparse as sp
+
+from fipy.tools import numerix
+from fipy.matrices.scipyMatrix import _ScipyMatrix, _ScipyMeshMatrix
+from fipy.meshes.uniformGrid1D import UniformGrid1D
+from fipy.meshes.uniformGrid2D import UniformGrid2D
+from fipy.meshes.uniformGrid3D import UniformGrid3D
+
+class _ScipyStencilMeshMatrix(_ScipyMeshMatrix):
+    """Mesh matrix stored as one array for each offset from the diagonal
+
+    On a :class:`~fipy.meshes.uniformGrid1D.UniformGrid1D`,
+    :class:`~fipy.meshes.uniformGrid2D.UniformGrid2D` or
+    :class:`~fipy.meshes.uniformGrid3D.UniformGrid3D`, each cell is coupled to
+    its neighbors at the same few offsets (`1`, `nx`, `nx * ny`) in the
+    cell numbering, so the matrices of the terms are 3, 5 or 7 point
+    stencils.  Rather than as general CSR, they are stored like a
+    :class:`~scipy.sparse.dia_matrix`, with one array of values for
+    each offset and no column indices.  `addAt()` scatters into these
+    arrays directly and `matrix` is a :class:`~scipy.sparse.dia_matrix`
+    that shares them, so products with a vector never build CSR.
+    Conversion to other formats only happens when they are needed, e.g.,
+    to factor the matrix.
+
+    >>> from fipy import CellVariable, Grid2D, DiffusionTerm, ImplicitSourceTerm
+    >>> mesh = Grid2D(nx=4, ny=3)
+    >>> var = CellVariable(mesh=mesh)
+    >>> var.constrain(1., where=mesh.facesLeft)
+    >>> eq = DiffusionTerm(coeff=mesh.x.faceValue + 1.) - ImplicitSourceTerm(coeff=mesh.y)
+    >>> L = eq._buildAndAddMatrices(var, _ScipyStencilMeshMatrix)[1]
+    >>> A = eq._buildAndAddMatrices(var, _ScipyMeshMatrix)[1]
+    >>> print(numerix.allclose(L.numpyArray, A.numpyArray))
+    True
+    >>> print(sorted(L._offsets))
+    [-4, -1, 0, 1, 4]
+    >>> print(L.matrix.format)
+    dia
+    >>> x = numerix.arange(mesh.numberOfCells, dtype=float)
+    >>> print(numerix.allclose(L * x, A * x))
+    True
+    >>> print(numerix.allclose(L.takeDiagonal(), A.takeDiagonal()))
+    True
+
+    Matrices can be combined with each other and with CSR matrices
+
+    >>> L += A
+    >>> print(numerix.allclose(L.numpyArray, 2 * A.numpyArray))
+    True
+    >>> L -= L.copy()
+    >>> print(numerix.allclose(L.numpyArray, 0))
+    True
+
+    and support the other operations of a mesh matrix
+
+    >>> L = _ScipyStencilMeshMatrix(mesh=Grid2D(nx=3, ny=1))
+    >>> L.put([3., 10., numerix.pi, 2.5], [0, 0, 1, 2], [2, 1, 1, 0])
+    >>> L.addAt([1.73, 2.2, 8.4, 3.9, 1.23], [1, 2, 0, 0, 1], [2, 2, 0, 0, 2])
+    >>> print(L)
+    12.300000  10.000000   3.000000  
+        ---     3.141593   2.960000  
+     2.500000      ---     2.200000  
+    >>> ptrs, cols, data = L.CSR
+    >>> print(numerix.asarray(cols))
+    [0 1 2 1 2 0 2]
+    >>> L.putDiagonal(1.)
+    >>> print(L.takeDiagonal())
+    [ 1.  1.  1.]
+    >>> L.addAtDiagonal([1., 2., 3.])
+    >>> print(L.take([0, 2], [0, 2]))
+    [[ 2.  4.]]
+
+    Any other mesh is refused, as cells that are numbered without regard
+    to their neighbors may need an array for nearly every offset
+
+    >>> from fipy import Tri2D
+    >>> _ScipyStencilMeshMatrix(mesh=Tri2D(nx=2, ny=2))
+    Traceback (most recent call last):
+        ...
+    TypeError: stencil matrices require a UniformGrid1D, UniformGrid2D or UniformGrid3D, not a Tri2D
+    """
+
+    def __init__(self, mesh, numberOfVariables=1, numberOfEquations=1,
+                 nonZerosPerRow=0, exactNonZeros=False, matrix=None, storeZeros=True):
+        """
+        Parameters
+        ----------
+        mesh : ~fipy.meshes.uniformGrid.UniformGrid
+            The `UniformGrid1D`, `UniformGrid2D` or `UniformGrid3D` to
+            assemble the matrix for.
+        numberOfVariables : int
+            The columns of the matrix are determined by
+            `numberOfVariables * mesh.numberOfCells`.
+        numberOfEquations : int
+            The rows of the matrix are determined by
+            `numberOfEquations * mesh.numberOfCells`.
+        nonZerosPerRow : int or array_like of int
+            *ignored*
+        exactNonZeros : bool
+            *ignored*
+        matrix : ~scipy.sparse.spmatrix
+            Pre-assembled SciPy matrix to copy into the stencil storage.
+        storeZeros : bool
+            *ignored*
+        """
+        if not isinstance(mesh, (UniformGrid1D, UniformGrid2D, UniformGrid3D)):
+            raise TypeError("stencil matrices require a UniformGrid1D, "
+                            "UniformGrid2D or UniformGrid3D, not a %s"
+                            % mesh.__class__.__name__)
+        super(_ScipyStencilMeshMatrix, self).__init__(mesh=mesh,
+                                                      numberOfVariables=numberOfVariables,
+                                                      numberOfEquations=numberOfEquations,
+                                                      matrix=matrix)
+
+    def _allocateTriplets(self, capacity):
+        # contributions are added to the stencil arrays directly
+        self._pendingCount = 0
+
+    def finalize(self):
+        pass
+
+    def _getMatrix(self):
+        return sp.dia_matrix((self._bands, self._offsets), shape=self._stencilShape)
+
+    def _setMatrix(self, m):
+        m = sp.dia_matrix(m)
+        self._stencilShape = m.shape
+        self._offsets = numerix.array(m.offsets, dtype=numerix.INT_DTYPE)
+        self._bands = numerix.zeros((len(self._offsets), m.shape[1]), dtype='d')
+        self._bands[:, :m.data.shape[1]] = m.data[:, :m.shape[1]]
+
+    def _delMatrix(self):
+        self._setMatrix(sp.csr_matrix(self._stencilShape))
+
+    matrix = property(_getMatrix, _setMatrix, _delMatrix)
+
+    @property
+    def _shape(self):
+        return self._stencilShape
+
+    def _bandsFor(self, offsets):
+        """Rows of `_bands` holding each of `offsets`, adding any that are missing
+        """
+        unique, inverse = numerix.unique(offsets, return_inverse=True)
+        missing = unique[~numerix.in1d(unique, self._offsets)]
+        if len(missing) > 0:
+            self._offsets = numerix.concatenate((self._offsets,
+                                                 missing.astype(self._offsets.dtype)))
+            self._bands = numerix.concatenate((self._bands,
+                                               numerix.zeros((len(missing), self._bands.shape[1]), dtype='d')))
+
+        order = numerix.argsort(self._offsets)
+        positions = order[numerix.searchsorted(self._offsets[order], unique)]
+
+        return positions[inverse]
+
+    def addAt(self, vector, id1, id2):
+        id1 = numerix.asarray(id1).ravel()
+        id2 = numerix.asarray(id2).ravel()
+        vector = numerix.asarray(vector, dtype='d').ravel()
+        assert len(id1) == len(id2) == len(vector)
+
+        bands = self._bandsFor(id2 - id1)
+        cols = self._bands.shape[1]
+        self._bands += numerix.bincount(bands * cols + id2,
+                                        weights=vector,
+                                        minlength=self._bands.size).reshape(self._bands.shape)
+
+    def addAtDiagonal(self, vector):
+        if isinstance(vector, (int, float)):
+            vector = numerix.repeat(vector, min(self._shape))
+
+        band = self._bandsFor([0])[0]
+        self._bands[band, :len(vector)] += vector
+
+    def putDiagonal(self, vector):
+        if isinstance(vector, (int, float)):
+            vector = numerix.repeat(vector, min(self._shape))
+
+        band = self._bandsFor([0])[0]
+        self._bands[band, :len(vector)] = vector
+
+    def takeDiagonal(self):
+        return self.matrix.diagonal()
+
+    def put(self, vector, id1, id2, overlapping=False):
+        current = numerix.asarray(self.take(id1, id2)).ravel()
+        self.addAt(numerix.asarray(vector, dtype='d') - current, id1, id2)
+
+    def take(self, id1, id2):
+        return self.matrix.tocsr()[id1, id2]
+
+    def __getitem__(self, index):
+        return _ScipyMatrix(matrix=self.matrix.tocsr())[index]
+
+    @property
+    def CSR(self):
+        csr = self.matrix.tocsr()
+        return csr.indptr, csr.indices, csr.data
+
+    def copy(self):
+        other = _ScipyStencilMeshMatrix(mesh=self.mesh,
+                                        numberOfVariables=self.numberOfVariables,
+                                        numberOfEquations=self.numberOfEquations)
+        other._offsets = self._offsets.copy()
+        other._bands = self._bands.copy()
+        return other
+
+    def _iadd(self, other, sign=1):
+        if (isinstance(other, _ScipyStencilMeshMatrix)
+            and other._shape == self._shape):
+            bands = self._bandsFor(other._offsets)
+            self._bands[bands] += sign * other._bands
+        elif (isinstance(other, _ScipyMatrix)
+              and other._shape == self._shape):
+            coo = other.matrix.tocoo()
+            self.addAt(sign * coo.data, coo.row, coo.col)
+        elif isinstance(other, (float, int)) and other == 0:
+            pass
+        else:
+            _ScipyMatrix._iadd(self, other, sign=sign)
+
+        return self
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -4,6 +4,9 @@ __docformat__ = 'restructuredtext'
 
 __all__ = []
 
+import weakref
+import zlib
+
 from fipy.tools import numerix
 
 class _SparseMatrix(object):
@@ -117,6 +120,28 @@ class _SparseMatrix(object):
     def addAtDiagonal(self, vector):
         raise NotImplementedError
 
+    def _addAtFaces(self, id1, id2, cell1diag, cell1offdiag, cell2offdiag, cell2diag):
+        """Add the coefficients of fluxes between pairs of cells
+
+        The flux across each face couples the cell `id1` on one side to
+        the cell `id2` on the other. Row `id1` receives `cell1diag` in
+        column `id1` and `cell1offdiag` in column `id2`; row `id2`
+        receives `cell2offdiag` in column `id1` and `cell2diag` in
+        column `id2`.
+
+        Parameters
+        ----------
+        id1, id2 : array_like of int
+            Cell IDs on either side of the faces, as reshaped by
+            :meth:`~fipy.terms.term.Term._reshapeIDs`
+        cell1diag, cell1offdiag, cell2offdiag, cell2diag : array_like of float
+            Coefficients, one per entry of the raveled `id1` and `id2`
+        """
+        self.addAt(cell1diag, id1.ravel(), id1.swapaxes(0, 1).ravel())
+        self.addAt(cell1offdiag, id1.ravel(), id2.swapaxes(0, 1).ravel())
+        self.addAt(cell2offdiag, id2.ravel(), id1.swapaxes(0, 1).ravel())
+        self.addAt(cell2diag, id2.ravel(), id2.swapaxes(0, 1).ravel())
+
     def exportMmf(self, filename):
         raise NotImplementedError
 
@@ -148,6 +173,134 @@ class _SparseMatrix(object):
 ##         numMatrix = self.take(indices[0].ravel(), indices[1].ravel())
 ##      return numerix.reshape(numMatrix, shape)
 
+class _SparsityPattern(object):
+    """Symbolic CSR structure of a sequence of (row, column) coordinates
+
+    Holds the row pointers and column indices of the nonzero slots, along
+    with a scatter map from each input coordinate to the slot it
+    accumulates into, so that values supplied in the same order can be
+    summed directly into a CSR `data` array without re-sorting.
+    """
+
+    def __init__(self, keys, shape):
+        """
+        Parameters
+        ----------
+        keys : ndarray of int
+            Linearized `rows * shape[1] + cols` coordinates, in the order
+            in which values will be supplied.
+        shape : tuple of int
+            The shape of the matrix.
+        """
+        self.keys = keys
+        self.shape = shape
+        self.digest = self._digest(keys, shape)
+
+        uniqueKeys = numerix.unique(keys)
+        uniqueRows = uniqueKeys // shape[1]
+
+        self.indices = (uniqueKeys - uniqueRows * shape[1]).astype(numerix.INT_DTYPE)
+        self.indptr = numerix.searchsorted(uniqueRows,
+                                           numerix.arange(shape[0] + 1)).astype(numerix.INT_DTYPE)
+        self.slots = numerix.searchsorted(uniqueKeys, keys)
+
+    @staticmethod
+    def _linearize(rows, cols, shape):
+        return (numerix.asarray(rows, dtype=numerix.int64) * shape[1]
+                + numerix.asarray(cols, dtype=numerix.int64))
+
+    @staticmethod
+    def _digest(keys, shape):
+        """Cheap summary of the coordinates, to rule out most mismatches
+        without comparing them all
+        """
+        return (tuple(shape), len(keys),
+                zlib.crc32(numerix.ascontiguousarray(keys).view(numerix.uint8)))
+
+    def matches(self, keys, shape):
+        return (shape == self.shape
+                and numerix.array_equal(keys, self.keys))
+
+    def scatter(self, values):
+        """Sum `values` into the nonzero slots of the pattern
+
+        Parameters
+        ----------
+        values : ndarray of float
+            Values in the same order as the coordinates the pattern
+            was built from.
+
+        Returns
+        -------
+        ndarray of float
+            The CSR `data` array.
+        """
+        return numerix.bincount(self.slots, weights=values,
+                                minlength=len(self.indices))
+
+class _SparsityPatternCache(object):
+    """Most-recently-used collection of `_SparsityPattern` objects
+
+    For a fixed mesh and equation, the same sequence of coordinates is
+    assembled on every sweep and time step, so the symbolic structure
+    only needs to be derived once.  Matrices are only finalized once all
+    of their terms are added together, so each equation, coupled or not,
+    needs a single pattern.
+
+    >>> cache = _SparsityPatternCache(maxPatterns=2)
+    >>> p0 = cache.pattern([0, 1, 1], [0, 1, 0], (2, 2))
+    >>> cache.pattern([0, 1, 1], [0, 1, 0], (2, 2)) is p0
+    True
+    >>> p1 = cache.pattern([0, 1], [0, 1], (2, 2))
+    >>> p2 = cache.pattern([1, 0], [1, 0], (2, 2))
+    >>> cache.pattern([0, 1, 1], [0, 1, 0], (2, 2)) is p0
+    False
+    """
+
+    def __init__(self, maxPatterns=4):
+        self.maxPatterns = maxPatterns
+        self._patterns = []
+
+    def pattern(self, rows, cols, shape):
+        """Find (or derive and store) the pattern for these coordinates
+
+        Parameters
+        ----------
+        rows : array_like of int
+            The row indices.
+        cols : array_like of int
+            The column indices.
+        shape : tuple of int
+            The shape of the matrix.
+
+        Returns
+        -------
+        ~fipy.matrices.sparseMatrix._SparsityPattern
+        """
+        keys = _SparsityPattern._linearize(rows, cols, shape)
+        digest = _SparsityPattern._digest(keys, shape)
+
+        for i, pattern in enumerate(self._patterns):
+            if pattern.digest == digest and pattern.matches(keys, shape):
+                if i > 0:
+                    self._patterns.insert(0, self._patterns.pop(i))
+                return pattern
+
+        pattern = _SparsityPattern(keys, shape)
+        self._patterns.insert(0, pattern)
+        del self._patterns[self.maxPatterns:]
+
+        return pattern
+
+_sparsityPatternCaches = weakref.WeakKeyDictionary()
+
+def _getSparsityPatternCache(mesh):
+    """The `_SparsityPatternCache` shared by all matrices of `mesh`
+    """
+    if mesh not in _sparsityPatternCaches:
+        _sparsityPatternCaches[mesh] = _SparsityPatternCache()
+    return _sparsityPatternCaches[mesh]
+
 class _Mesh2Matrix(object):
     _bodies = None
     _ghosts = None
@@ -179,7 +332,6 @@ class _Mesh2Matrix(object):
         #
         # See https://lists.mcs.anl.gov/pipermail/petsc-users/2020-October/042652.html
         # and https://github.com/usnistgov/fipy/pull/761
-        import weakref
         self.matrix = weakref.ref(matrix)
 
     @staticmethod
@@ -10,7 +10,7 @@ if solver_suite == 'trilinos':
 elif solver_suite == 'no-pysparse':
     docTestModuleNames = ('trilinosMatrix',)
 elif solver_suite == 'scipy' or solver_suite == 'pyamg':
-    docTestModuleNames = ('scipyMatrix',)
+    docTestModuleNames = ('scipyMatrix', 'scipyMatrixFree', 'scipyStencilMatrix')
 elif solver_suite == 'pysparse':
     docTestModuleNames = ('pysparseMatrix',)
 elif solver_suite == 'pyamgx':
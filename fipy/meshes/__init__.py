@@ -7,6 +7,7 @@ from fipy.meshes.factoryMeshes import *
 from fipy.meshes.periodicGrid1D import *
 from fipy.meshes.periodicGrid2D import *
 from fipy.meshes.periodicGrid3D import *
+from fipy.meshes.batchGrid1D import *
 from fipy.meshes.skewedGrid2D import *
 from fipy.meshes.tri2D import *
 from fipy.meshes.gmshMesh import *
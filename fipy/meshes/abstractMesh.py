@@ -65,6 +65,387 @@ class AbstractMesh(object):
     def getNearestCell(self, point):
         return self._getCellsByID([self._getNearestCellID(point)])[0]
 
+    @property
+    def _cellPieces(self):
+        """Simple shapes that the cells are divided into to locate points
+
+        Simplices (segments, triangles and tetrahedra) and, in 2D,
+        quadrilaterals are pieces of their own.  Any other cell is
+        divided into a fan of simplices, each joining the cell center to
+        (part of) one of its faces.  The nodes of the pieces are the
+        vertices, followed by the cell centers.
+
+        Built on first use and kept until the vertices or the cell
+        centers move.
+
+        Returns
+        -------
+        simplices : ndarray of int
+            (D + 1, S) nodes of each simplex.
+        quads : ndarray of int
+            (4, Q) nodes of each quadrilateral, in order around it.
+        tree : ~scipy.spatial.cKDTree
+            Spatial index of the centroids of the simplices, followed by
+            those of the quadrilaterals.
+        radii : ndarray of float
+            Distance from the centroid of each piece to its farthest node.
+        nodes : ndarray of float
+            (D, V + N) coordinates of the nodes.
+        """
+        vertices = numerix.array(self.vertexCoords, dtype=float)
+        centers = numerix.array(self.cellCenters.value, dtype=float)
+        nodes = numerix.concatenate((vertices, centers), axis=1)
+        cached = getattr(self, "_cellPiecesData", None)
+        if (cached is not None
+            and cached[0].shape == nodes.shape
+            and numerix.array_equal(cached[0], nodes)):
+            return cached[1]
+
+        D = self.dim
+        V = vertices.shape[-1]
+
+        # vertices of each cell, largest ID first and unused slots last
+        cellVertexIDs = -numerix.sort(-MA.filled(self._cellVertexIDs, -1), axis=0)
+        counts = (cellVertexIDs >= 0).sum(axis=0)
+
+        simplexCells = numerix.nonzero(counts == D + 1)[0]
+        simplices = [cellVertexIDs[:D + 1, simplexCells]]
+
+        if D == 2:
+            quadCells = numerix.nonzero(counts == 4)[0]
+            quads = cellVertexIDs[:4, quadCells]
+            angles = numerix.arctan2(vertices[1, quads] - centers[1, quadCells],
+                                     vertices[0, quads] - centers[0, quadCells])
+            quads = numerix.take_along_axis(quads, numerix.argsort(angles, axis=0), axis=0)
+        else:
+            quadCells = numerix.arange(0)
+            quads = numerix.zeros((4, 0), dtype=int)
+
+        fanned = numerix.ones(counts.shape, dtype=bool)
+        fanned[simplexCells] = False
+        fanned[quadCells] = False
+        fanCells = numerix.nonzero(fanned)[0]
+        if len(fanCells) > 0:
+            cellFaceIDs = MA.filled(self.cellFaceIDs, -1)[:, fanCells]
+            faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
+            for faces in cellFaceIDs:
+                cells = fanCells[faces >= 0]
+                faceVertices = faceVertexIDs[:, faces[faces >= 0]]
+                for i in range(1, faceVertexIDs.shape[0] - D + 2):
+                    # triangulate each face from its first vertex
+                    piece = numerix.concatenate(([V + cells],
+                                                 faceVertices[:1],
+                                                 faceVertices[i:i + D - 1]))
+                    simplices.append(piece[:, (piece >= 0).all(axis=0)])
+        simplices = numerix.concatenate(simplices, axis=1)
+
+        centroids = []
+        radii = []
+        for piece in (simplices, quads):
+            X = nodes[:, piece]
+            centroid = X.mean(axis=1)
+            centroids.append(centroid)
+            radii.append(numerix.sqrt(((X - centroid[:, numerix.newaxis])**2).sum(axis=0)).max(axis=0,
+                                                                                             initial=0.))
+        centroids = numerix.concatenate(centroids, axis=1)
+        radii = numerix.concatenate(radii)
+
+        pieces = (simplices, quads, numerix._nearestTree(centroids), radii, nodes)
+        self._cellPiecesData = (nodes, pieces)
+
+        return pieces
+
+    @property
+    def _vertexInterpolationOperator(self):
+        """(V + N, N) sparse matrix taking cell values to the vertices and cell centers
+
+        The value at each vertex is that of the linear function fitted,
+        by least squares weighted by inverse distance, to the cells around
+        it, so it is exact for linear fields.  When these cells are too
+        few to fit a gradient, as at the corners of a grid, their
+        neighbors are included as well.
+
+            >>> from fipy import Grid2D, CellVariable
+            >>> m = Grid2D(nx=3, ny=2)
+            >>> x, y = m.cellCenters.value
+            >>> X, Y = m.vertexCoords
+            >>> values = m._vertexInterpolationOperator * (x - 2 * y)
+            >>> print(numerix.allclose(values[:len(X)], X - 2 * Y))
+            True
+        """
+        from scipy import sparse
+
+        vertices = numerix.array(self.vertexCoords, dtype=float)
+        centers = numerix.array(self.cellCenters.value, dtype=float)
+        D = self.dim
+        V = vertices.shape[-1]
+        N = centers.shape[-1]
+
+        cellVertexIDs = MA.filled(self._cellVertexIDs, -1)
+        cellIDs = numerix.resize(numerix.arange(N), cellVertexIDs.shape)
+        used = cellVertexIDs >= 0
+        vertexIDs = cellVertexIDs[used]
+        cellIDs = cellIDs[used]
+
+        vertexIDs, cellIDs, weights, fitted = self._fitVertexValues(vertices, centers,
+                                                                    vertexIDs, cellIDs)
+
+        unfitted = ~fitted[vertexIDs]
+        if unfitted.any():
+            # add the neighbors of the cells around each vertex that
+            # could not be fitted
+            cellToCellIDs = MA.filled(self._cellToCellIDs, -1)
+            extraVertexIDs = numerix.repeat(vertexIDs[unfitted][numerix.newaxis], cellToCellIDs.shape[0], axis=0)
+            extraCellIDs = cellToCellIDs[:, cellIDs[unfitted]]
+            valid = extraCellIDs >= 0
+            pairs = numerix.unique(numerix.concatenate((vertexIDs[unfitted] * N + cellIDs[unfitted],
+                                                        extraVertexIDs[valid] * N + extraCellIDs[valid])))
+            extended = self._fitVertexValues(vertices, centers, pairs // N, pairs % N)
+
+            keep = ~unfitted
+            vertexIDs = numerix.concatenate((vertexIDs[keep], extended[0]))
+            cellIDs = numerix.concatenate((cellIDs[keep], extended[1]))
+            weights = numerix.concatenate((weights[keep], extended[2]))
+
+        return sparse.vstack([sparse.csr_matrix((weights, (vertexIDs, cellIDs)), shape=(V, N)),
+                              sparse.identity(N, format="csr")]).tocsr()
+
+    @staticmethod
+    def _fitVertexValues(vertices, centers, vertexIDs, cellIDs):
+        """Weights of the cells in the least squares fit of each vertex value
+
+        Fits a linear function, weighted by inverse distance, to the cells
+        `cellIDs` around the vertices `vertexIDs` and returns the weight
+        of each cell in its value at the vertex.  Vertices whose cells
+        cannot determine a gradient take the inverse distance weighted
+        average of their cells and are not `fitted`.
+        """
+        D, V = vertices.shape
+
+        offsets = centers[:, cellIDs] - vertices[:, vertexIDs]
+        distances = numerix.sqrt((offsets**2).sum(axis=0))
+        inverse = 1. / numerix.maximum(distances, numerix.finfo(float).tiny)
+
+        # scale each vertex's offsets by its farthest cell, so that the
+        # rank of the fit doesn't depend on the size of the cells
+        scale = numerix.zeros((V,))
+        numerix.maximum.at(scale, vertexIDs, distances)
+        scale[scale == 0] = 1.
+        A = numerix.concatenate((numerix.ones((1, len(vertexIDs))),
+                                 offsets / scale[vertexIDs]))
+
+        G = numerix.zeros((V, D + 1, D + 1))
+        for i in range(D + 1):
+            for j in range(D + 1):
+                G[:, i, j] = numerix.bincount(vertexIDs, weights=inverse * A[i] * A[j], minlength=V)
+
+        fitted = numerix.linalg.matrix_rank(G, tol=1e-10 * abs(G).max(axis=(1, 2))) == D + 1
+        G[~fitted] = numerix.identity(D + 1)
+        first = numerix.linalg.inv(G)[:, 0]
+        weights = inverse * (first[vertexIDs].T * A).sum(axis=0)
+
+        average = ~fitted[vertexIDs]
+        totals = numerix.bincount(vertexIDs[average], weights=inverse[average], minlength=V)
+        weights[average] = inverse[average] / totals[vertexIDs[average]]
+
+        return vertexIDs, cellIDs, weights, fitted
+
+    @staticmethod
+    def _simplexWeights(X, points):
+        """Barycentric weights of (P, D) `points` in the (P, D + 1, D) simplices `X`
+        """
+        P, D = points.shape
+        T = (X[:, 1:] - X[:, :1]).swapaxes(1, 2)
+        degenerate = abs(numerix.linalg.det(T)) <= 1e-12 * (abs(T).max(axis=(1, 2))**D)
+        T[degenerate] = numerix.identity(D)
+        b = numerix.linalg.solve(T, (points - X[:, 0])[..., numerix.newaxis])[..., 0]
+        weights = numerix.concatenate(((1. - b.sum(axis=1))[:, numerix.newaxis], b), axis=1)
+        weights[degenerate] = -1.
+
+        return weights
+
+    @staticmethod
+    def _bilinearWeights(X, points):
+        """Bilinear weights of (P, 2) `points` in the (P, 4, 2) quadrilaterals `X`
+
+        The local coordinates of each point are found with Newton's method.
+        """
+        a = X[:, 1] - X[:, 0]
+        b = X[:, 3] - X[:, 0]
+        c = X[:, 0] - X[:, 1] + X[:, 2] - X[:, 3]
+        s = numerix.ones(len(points)) / 2.
+        t = numerix.ones(len(points)) / 2.
+        for iteration in range(20):
+            r = (X[:, 0] + s[:, numerix.newaxis] * a + t[:, numerix.newaxis] * b
+                 + (s * t)[:, numerix.newaxis] * c - points)
+            ds = a + t[:, numerix.newaxis] * c
+            dt = b + s[:, numerix.newaxis] * c
+            det = ds[:, 0] * dt[:, 1] - ds[:, 1] * dt[:, 0]
+            det[det == 0] = numerix.finfo(float).tiny
+            s = s - (dt[:, 1] * r[:, 0] - dt[:, 0] * r[:, 1]) / det
+            t = t - (ds[:, 0] * r[:, 1] - ds[:, 1] * r[:, 0]) / det
+
+        return numerix.array(((1 - s) * (1 - t), s * (1 - t), s * t, (1 - s) * t)).T
+
+    def _locateInPieces(self, points, pointIDs, candidates):
+        """Find the first of the `candidates` pieces that holds each point
+
+        Returns
+        -------
+        inside : ndarray of int
+            The points found in one of their candidate pieces.
+        nodeIDs : ndarray of int
+            (P, 4) nodes of the piece holding each of these points.
+        weights : ndarray of float
+            (P, 4) weights of the nodes.
+        """
+        simplices, quads, tree, radii, nodes = self._cellPieces
+        D = self.dim
+        S = simplices.shape[-1]
+
+        nodeIDs = numerix.zeros((len(candidates), 4), dtype=int)
+        weights = -numerix.ones((len(candidates), 4))
+
+        isSimplex = candidates < S
+        if isSimplex.any():
+            IDs = simplices[:, candidates[isSimplex]].T
+            nodeIDs[isSimplex, :D + 1] = IDs
+            weights[isSimplex, :D + 1] = self._simplexWeights(nodes[:, IDs].transpose(1, 2, 0),
+                                                              points[:, pointIDs[isSimplex]].T)
+            weights[isSimplex, D + 1:] = 0.
+
+        isQuad = ~isSimplex
+        if isQuad.any():
+            IDs = quads[:, candidates[isQuad] - S].T
+            nodeIDs[isQuad] = IDs
+            weights[isQuad] = self._bilinearWeights(nodes[:, IDs].transpose(1, 2, 0),
+                                                    points[:, pointIDs[isQuad]].T)
+
+        holds = numerix.nonzero((weights >= -1e-9).all(axis=1))[0]
+        inside, first = numerix.unique(pointIDs[holds], return_index=True)
+        chosen = holds[first]
+
+        return inside, nodeIDs[chosen], weights[chosen]
+
+    def _calcInterpolationOperator(self, points):
+        """Linear interpolation from cell values to `points`
+
+        Each point is located in a cell of the mesh.  Triangles,
+        tetrahedra and segments interpolate their vertices with
+        barycentric weights and quadrilaterals interpolate theirs
+        bilinearly.  Other cells are divided into simplices that join
+        the cell center to their faces (see `_cellPieces`).  The values
+        at the vertices are fitted to the cells around them, so that
+        linear fields are interpolated exactly (see
+        `_vertexInterpolationOperator`).
+
+        Returns
+        -------
+        operator : ~scipy.sparse.csr_matrix
+            (M, N) sparse matrix that takes the N cell values to the M
+            points.  Rows for points outside the mesh are empty.
+        outside : ndarray of bool
+            Whether each point lies outside the cells of the mesh.
+        """
+        from scipy import sparse
+
+        D = self.dim
+        N = self.numberOfCells
+        points = numerix.reshape(numerix.asarray(points, dtype=float), (D, -1))
+        M = points.shape[-1]
+
+        if self.communicator.Nproc > 1 or N == 0 or M == 0:
+            # the cells of other processes are unknown, so every point is
+            # extrapolated from its nearest cell
+            return sparse.csr_matrix((M, N)), numerix.ones((M,), dtype=bool)
+
+        simplices, quads, tree, radii, nodes = self._cellPieces
+
+        # try the pieces whose centroids are nearest to each point, then
+        # every piece that could possibly hold the points not yet found
+        k = min(16, tree.n)
+        pointIDs = numerix.repeat(numerix.arange(M), k)
+        candidates = numerix.reshape(tree.query(points.T, k=k)[1], (M * k,))
+        inside, nodeIDs, weights = self._locateInPieces(points, pointIDs, candidates)
+
+        outside = numerix.ones((M,), dtype=bool)
+        outside[inside] = False
+        missing = numerix.nonzero(outside)[0]
+        if len(missing) > 0:
+            neighbors = tree.query_ball_point(points[:, missing].T, r=radii.max())
+            pointIDs = numerix.repeat(missing, [len(n) for n in neighbors])
+            candidates = numerix.array([c for n in neighbors for c in n], dtype=int)
+            near = (((points[:, pointIDs] - tree.data[candidates].T)**2).sum(axis=0)
+                    <= (radii[candidates] * (1. + 1e-9))**2)
+            found, foundNodeIDs, foundWeights = self._locateInPieces(points,
+                                                                     pointIDs[near],
+                                                                     candidates[near])
+            inside = numerix.concatenate((inside, found))
+            nodeIDs = numerix.concatenate((nodeIDs, foundNodeIDs))
+            weights = numerix.concatenate((weights, foundWeights))
+            outside[found] = False
+
+        W = sparse.csr_matrix((weights.ravel(),
+                               (numerix.repeat(inside, 4), nodeIDs.ravel())),
+                              shape=(M, nodes.shape[-1]))
+        operator = (W * self._vertexInterpolationOperator).tocsr()
+        operator.eliminate_zeros()
+
+        return operator, outside
+
+    def _getInterpolationOperator(self, points):
+        """Cached `_calcInterpolationOperator()`
+
+        The operators for the last few sets of points are kept, so that
+        repeatedly interpolating to the same probes is a sparse
+        matrix-vector product.
+
+           >>> from fipy import *
+           >>> m = Grid2D(nx=4, ny=4)
+           >>> points = ((1.5, 2.1, 2.5), (1.5, 2., 2.5))
+           >>> operator, outside = m._getInterpolationOperator(points)
+           >>> print(numerix.allclose(operator * (m.x.value + 2 * m.y.value), (4.5, 6.1, 7.5)))
+           True
+           >>> print(outside)
+           [False False False]
+           >>> m._getInterpolationOperator(points)[0] is operator
+           True
+           >>> print(m._getInterpolationOperator(((-1., 1.), (0., 1.)))[1])
+           [ True False]
+
+        Cells that are not simplices or quadrilaterals are divided into
+        simplices around their centers
+
+           >>> m = Grid3D(nx=4, ny=4, nz=4)
+           >>> x, y, z = m.cellCenters.value
+           >>> operator, outside = m._getInterpolationOperator(((1.5, 2.2), (2.5, 1.7), (1.2, 2.9)))
+           >>> print(numerix.allclose(operator * (x - 2 * y + 3 * z), (0.1, 7.5)))
+           True
+        """
+        points = numerix.asarray(points, dtype=float)
+
+        # the pieces are replaced whenever the mesh moves, invalidating
+        # all the operators
+        key = self._cellPieces
+        cache = getattr(self, "_interpolationOperators", None)
+        if cache is None or cache[0] is not key:
+            cache = (key, [])
+            self._interpolationOperators = cache
+
+        operators = cache[1]
+        for i, (cachedPoints, operator, outside) in enumerate(operators):
+            if (cachedPoints.shape == points.shape
+                and numerix.array_equal(cachedPoints, points)):
+                del operators[i]
+                operators.insert(0, (cachedPoints, operator, outside))
+                return operator, outside
+
+        operator, outside = self._calcInterpolationOperator(points)
+        operators.insert(0, (points.copy(), operator, outside))
+        del operators[4:]
+
+        return operator, outside
+
     def _getCellFaceIDsInternal(self):
         return self._cellFaceIDs
 
@@ -34,6 +34,7 @@ class CylindricalNonUniformGrid2D(NonUniformGrid2D):
         self._scaledFaceAreas = self._scale['area'] * self._faceAreas
         self._areaProjections = self.faceNormals * self._faceAreas
         self._orientedAreaProjections = self._calcOrientedAreaProjections()
+        self._setGeometryDtype(["_areaProjections", "_orientedAreaProjections"])
         self._faceAspectRatios = self._calcFaceAspectRatios()
 
         self._cellAreas = self._calcCellAreas()
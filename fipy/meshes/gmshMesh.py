@@ -8,7 +8,9 @@ from builtins import str
 __docformat__ = 'restructuredtext'
 
 import logging
+import mmap
 import os
+import re
 from subprocess import Popen, PIPE
 import sys
 import tempfile
@@ -24,6 +26,7 @@ from fipy.tools.version import Version, parse_version
 from fipy.tests.doctestPlus import register_skipper
 
 from fipy.meshes.mesh import Mesh
+from fipy.meshes.meshCache import _meshCacheKey, _readMeshCache, _writeMeshCache
 from fipy.meshes.mesh2D import Mesh2D
 from fipy.meshes.topologies.meshTopology import _MeshTopology
 
@@ -159,8 +162,9 @@ def openMSHFile(name, dimensions=None, coordDimensions=None, communicator=parall
         else:
             # Gmsh isn't picky about file extensions,
             # so we peek at the start of the file to deduce the type
-            f = open(name, 'r')
-            filetype = f.readline().strip()
+            # binary files must be read as bytes
+            f = open(name, 'rb')
+            filetype = f.readline().strip().decode('ascii', 'replace')
             f.close()
             if filetype == "$MeshFormat":
                 geoFile = None
@@ -270,6 +274,286 @@ def openPOSFile(name, communicator=parallelComm, mode='w'):
                    communicator=communicator,
                    mode=mode)
 
+def _faceOrderings(shapeType, facesPerCell, nodesPerCell):
+    """Local indices of the vertices of each face of a cell
+
+    Faces with fewer vertices than others of the same cell are padded
+    at the front with -1.
+
+    >>> print(_faceOrderings(shapeType=4, facesPerCell=4, nodesPerCell=4))
+    [[0 1 2]
+     [1 2 3]
+     [2 3 0]
+     [3 0 1]]
+    >>> print(_faceOrderings(shapeType=6, facesPerCell=5, nodesPerCell=6))
+    [[-1  0  1  2]
+     [-1  5  4  3]
+     [ 3  4  1  0]
+     [ 4  5  2  1]
+     [ 5  3  0  2]]
+    """
+    if shapeType in [5, 12, 17]: # hexahedron
+        faceOrderings = [[0, 1, 2, 3], # ordering of vertices gleaned from
+                         [4, 5, 6, 7], # a one-cube Grid3D example
+                         [0, 1, 5, 4],
+                         [3, 2, 6, 7],
+                         [0, 3, 7, 4],
+                         [1, 2, 6, 5]]
+    elif shapeType in [6, 13, 18]: # prism
+        faceOrderings = [[0, 1, 2],
+                         [5, 4, 3],
+                         [3, 4, 1, 0],
+                         [4, 5, 2, 1],
+                         [5, 3, 0, 2]]
+    elif shapeType in [7, 14, 19]: # pyramid
+        faceOrderings = [[0, 1, 2, 3],
+                         [0, 1, 4],
+                         [1, 2, 4],
+                         [2, 3, 4],
+                         [3, 0, 4]]
+    else:
+        if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
+            faceLength = 2 # triangle
+        elif shapeType in [3, 10, 16]:
+            faceLength = 2 # quadrangle
+        elif shapeType in [4, 11, 29, 30, 31]:
+            faceLength = 3 # tetrahedron
+
+        # faces of a regular poly(gon|hedron) run around the cell;
+        # we may wrap
+        faces = nx.arange(facesPerCell)[..., nx.newaxis]
+        faceOrderings = (faces + nx.arange(faceLength)) % nodesPerCell
+
+    faceLength = max([len(o) for o in faceOrderings])
+    return nx.array([[-1] * (faceLength - len(o)) + list(o) for o in faceOrderings],
+                    dtype=nx.INT_DTYPE)
+
+def _uniqueRows(rows):
+    """Identify the distinct rows of a 2D integer array
+
+    Equivalent to `numpy.unique(rows, axis=0, return_index=True,
+    return_inverse=True)`, but sorts with :func:`numpy.lexsort`, which
+    is much faster than the structured sort used by `numpy.unique`.
+
+    Returns
+    -------
+    first : ndarray of int
+        Index of the first occurrence of each distinct row, in order
+        of the sorted rows.
+    inverse : ndarray of int
+        Index into `first` of each row.
+
+    >>> first, inverse = _uniqueRows(nx.array([[1, 2], [0, 3], [1, 2], [0, 1]]))
+    >>> print(first)
+    [3 1 0]
+    >>> print(inverse)
+    [2 1 2 0]
+    """
+    order = nx.lexsort(rows.T[::-1])
+    sortedRows = rows[order]
+    distinct = nx.ones((len(rows),), dtype=bool)
+    distinct[1:] = (sortedRows[1:] != sortedRows[:-1]).any(axis=1)
+    inverse = nx.empty((len(rows),), dtype=nx.INT_DTYPE)
+    inverse[order] = nx.cumsum(distinct) - 1
+    # `lexsort` is stable, so the first of each run of equal rows
+    # is the first occurrence
+    return order[distinct], inverse
+
+def _matchFaces(faceKeys, faces, lengths):
+    """Index of the face with the same vertices as each of `faces`
+
+    Parameters
+    ----------
+    faceKeys : array_like of int
+        Sorted vertex IDs of each face, as returned by
+        `_deriveCellsAndFaces`.
+    faces : array_like of int
+        Vertex IDs of the faces to look for, padded at the end with -1.
+    lengths : array_like of int
+        Number of vertices of each of `faces`.  A face with an unknown
+        vertex, given as -1, is not found.
+
+    Returns
+    -------
+    ndarray of int
+        Index of each of `faces` in `faceKeys`, or -1 if not found.
+
+    >>> print(_matchFaces(nx.array([[-1, 0, 1], [0, 1, 2], [1, 2, 3]]),
+    ...                   nx.array([[2, 1, 0, -1],
+    ...                             [3, 2, -1, -1],
+    ...                             [1, 0, -1, -1],
+    ...                             [0, 1, 2, 3],
+    ...                             [1, -1, 2, -1]]),
+    ...                   nx.array([3, 2, 2, 4, 3])))
+    [ 1 -1  0 -1 -1]
+    """
+    if len(faces) == 0:
+        return nx.zeros((0,), dtype=nx.INT_DTYPE)
+
+    width = max(faceKeys.shape[1], faces.shape[1])
+
+    # padding sorts to the front, like that of `faceKeys`
+    keys = -nx.ones((len(faces), width), dtype=nx.INT_DTYPE)
+    keys[:, :faces.shape[1]] = faces
+    keys = nx.sort(keys, axis=1)
+    faceKeys = nx.concatenate((-nx.ones((len(faceKeys), width - faceKeys.shape[1]),
+                                        dtype=nx.INT_DTYPE),
+                               faceKeys), axis=1)
+
+    _, inverse = _uniqueRows(nx.concatenate((faceKeys, keys)))
+    match = -nx.ones((inverse.max() + 1,), dtype=nx.INT_DTYPE)
+    match[inverse[:len(faceKeys)]] = nx.arange(len(faceKeys))
+
+    known = (faces >= 0).sum(axis=1) == lengths
+
+    return nx.where(known, match[inverse[len(faceKeys):]], -1)
+
+# number of nodes of each Gmsh element type
+_nodesPerElement = {
+     1: 2,  2: 3,  3: 4,  4: 4,  5: 8,  6: 6,  7: 5,  8: 3,  9: 6, 10: 9,
+    11: 10, 12: 27, 13: 18, 14: 14, 15: 1, 16: 8, 17: 20, 18: 15, 19: 13,
+    20: 9, 21: 10, 22: 12, 23: 15, 24: 15, 25: 21, 26: 4, 27: 5, 28: 6,
+    29: 20, 30: 35, 31: 56, 92: 64, 93: 125
+}
+
+def _findSections(buf):
+    r"""Locate the data of each `$Section` ... `$EndSection` of a `MSH` file
+
+    Only the end of each section is searched for, so binary data is never
+    mistaken for a section header.
+
+    Parameters
+    ----------
+    buf : bytes or mmap.mmap
+        Contents of the file.
+
+    Returns
+    -------
+    dict
+        `(start, stop)` of the data of each section, which follows its
+        header line.  Only the first of repeated sections is kept.
+
+    >>> buf = b"$MeshFormat\n2.2 0 8\n$EndMeshFormat\n$Comments\nxyz\n$EndComments\n"
+    >>> sections = _findSections(buf)
+    >>> print(sorted(sections.keys()))
+    ['Comments', 'MeshFormat']
+    >>> start, stop = sections["Comments"]
+    >>> print(buf[start:stop].decode("ascii").strip())
+    xyz
+    >>> _findSections(b"$Nodes\n1\n1 0 0 0\n") #doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+        ...
+    GmshException: No `$EndNodes' found!
+    """
+    sections = {}
+    position = 0
+    while True:
+        start = buf.find(b"$", position)
+        if start < 0:
+            break
+        eol = buf.find(b"\n", start)
+        if eol < 0:
+            eol = len(buf)
+        title = bytes(buf[start + 1:eol]).strip().decode("ascii")
+        end = buf.find(("$End%s" % title).encode("ascii"), eol)
+        if end < 0:
+            raise GmshException("No `$End%s' found!" % title)
+        if title not in sections:
+            sections[title] = (eol + 1, end)
+        position = end + len("$End") + len(title)
+
+    return sections
+
+def _asciiValues(data, dtype=float):
+    """All of the whitespace separated numbers in `data`
+    """
+    return nx.fromstring(bytes(data), dtype=dtype, sep=" ")
+
+def _asciiLineLengths(data):
+    r"""Number of whitespace separated numbers on each line of `data`
+
+    Blank lines are skipped.
+
+    >>> print(_asciiLineLengths(b"3\n1 2 3\n\n 4 5 \n6"))
+    [1 3 2 1]
+    """
+    chars = nx.frombuffer(bytes(data), dtype=nx.uint8)
+    space = chars <= ord(" ")
+    starts = ~space
+    starts[1:] &= space[:-1]
+    # number of values that start before each character
+    before = nx.concatenate(([0], nx.cumsum(starts)))
+    ends = nx.concatenate((nx.nonzero(chars == ord("\n"))[0] + 1, [len(chars)]))
+    lengths = nx.diff(nx.concatenate(([0], before[ends])))
+
+    return lengths[lengths > 0]
+
+class _ASCIIReader(object):
+    r"""Sequential reads from the data of an ASCII `MSH` section
+
+    >>> reader = _ASCIIReader(b"2 1\n0.5 2e1\n")
+    >>> print(reader.read("size_t", 2))
+    [2 1]
+    >>> print(reader.read("double", 2))
+    [  0.5  20. ]
+    """
+    def __init__(self, data):
+        self.values = _asciiValues(data)
+        self.position = 0
+
+    def read(self, kind, count=1):
+        """Read `count` values of `kind` ("int", "size_t", or "double")
+        """
+        values = self.values[self.position:self.position + count]
+        if len(values) < count:
+            raise GmshException("Unexpected end of section")
+        self.position += count
+        if kind == "double":
+            return values
+        else:
+            return values.astype(nx.INT_DTYPE)
+
+class _BinaryReader(object):
+    r"""Sequential reads from the data of a binary `MSH` section
+
+    >>> reader = _BinaryReader(b"2\n" + nx.array([7], dtype="<i4").tobytes()
+    ...                        + nx.array([0.5], dtype="<f8").tobytes())
+    >>> print(reader.line())
+    b'2'
+    >>> print(reader.read("int"), reader.read("double"))
+    [7] [ 0.5]
+    """
+    def __init__(self, data, byteorder="<", sizeOfSizeT=8):
+        self.data = data
+        self.position = 0
+        self.byteorder = byteorder
+        self.dtypes = {
+            "int": nx.dtype(byteorder + "i4"),
+            "size_t": nx.dtype(byteorder + "u%d" % sizeOfSizeT),
+            "double": nx.dtype(byteorder + "f8")
+        }
+
+    def line(self):
+        """Read an ASCII line
+        """
+        end = self.data.find(b"\n", self.position)
+        line = self.data[self.position:end]
+        self.position = end + 1
+        return line
+
+    def read(self, kind, count=1):
+        """Read `count` values of `kind` ("int", "size_t", or "double"),
+        or of a `numpy.dtype`
+        """
+        dtype = self.dtypes.get(kind, kind)
+        try:
+            values = nx.frombuffer(self.data, dtype=dtype, count=count,
+                                   offset=self.position)
+        except ValueError:
+            raise GmshException("Unexpected end of section")
+        self.position += dtype.itemsize * count
+        return values
+
 class GmshFile(object):
     """Base class for Gmsh mesh storage files."""
 
@@ -545,337 +829,463 @@ class MSHFile(GmshFile):
 
         GmshFile.__init__(self, filename=filename, communicator=communicator, mode=mode, fileIsTemporary=fileIsTemporary)
 
-    def _getMetaData(self):
+    def _parseMeshFormat(self, data):
         """
-        Extracts `gmshVersion`, file-type, and data-size in that
-        order.
+        Extracts `gmshVersion`, file-type, data-size, and the byte order
+        of binary files, in that order.
         """
-        self._seekForHeader("MeshFormat")
-        metaData = self.fileobj.readline().split()
-        self.fileobj.seek(0)
-        return [float(x) for x in metaData]
+        header, _, rest = bytes(data).partition(b"\n")
+        version, fileType, dataSize = [float(x) for x in header.split()]
+        byteorder = "<"
+        if fileType == 1 and nx.frombuffer(rest[:4], dtype="<i4")[0] != 1:
+            byteorder = ">"
+        return version, fileType, dataSize, byteorder
+
+    def _reader(self, data):
+        if self.fileType == 0:
+            return _ASCIIReader(data)
+        else:
+            return _BinaryReader(data, byteorder=self.byteorder,
+                                 sizeOfSizeT=int(self.dataSize))
 
-    def _isolateData(self, title):
+    def _parseNodes(self, data):
         """
-        Gets all data between $[title] and $End[title], writes
-        it out to its own file.
+        Returns the Gmsh IDs and the coordinates of the nodes in the
+        `$Nodes` section.
         """
-        newF, newPath = tempfile.mkstemp(title, text=True)
-        newF = os.fdopen(newF, 'w')
-        try:
-            self._seekForHeader(title)
-        except Exception as e:
-            newF.close()
-            os.unlink(newPath)
-            raise
-
-        # extract the actual data within section
-        while True:
-            line = self.fileobj.readline()
-            if ("$End%s" % title) not in line:
-                newF.write(line)
-            else: break
+        if self.version < 4:
+            if self.fileType == 0:
+                values = _asciiValues(data)
+                numNodes = int(values[0])
+                values = values[1:1 + 4 * numNodes].reshape((numNodes, 4))
+                return values[..., 0].astype(nx.INT_DTYPE), values[..., 1:]
+            else:
+                reader = _BinaryReader(data, byteorder=self.byteorder)
+                numNodes = int(reader.line())
+                nodes = reader.read(nx.dtype([("id", self.byteorder + "i4"),
+                                              ("coords", self.byteorder + "f8", (3,))]),
+                                    numNodes)
+                return nodes["id"].astype(nx.INT_DTYPE), nodes["coords"].astype(float)
+        else:
+            reader = self._reader(data)
+            numBlocks, numNodes = reader.read("size_t", 4)[:2]
+            nodeIDs = nx.empty((numNodes,), dtype=nx.INT_DTYPE)
+            coords = nx.empty((numNodes, 3))
+            start = 0
+            for block in range(numBlocks):
+                entityDim, entityTag, parametric = reader.read("int", 3)
+                count = int(reader.read("size_t")[0])
+                nodeIDs[start:start + count] = reader.read("size_t", count)
+                # parametric coordinates follow x, y, z
+                width = 3 + parametric * entityDim
+                values = reader.read("double", count * width)
+                coords[start:start + count] = values.reshape((count, width))[..., :3]
+                start += count
+            return nodeIDs, coords
+
+    def _parseEntities(self, data):
+        """
+        Returns the Gmsh physical entity of each `(dimension, tag)`
+        geometrical entity in the `$Entities` section of a `MSH` 4 file,
+        or 0 if it has none.
+        """
+        reader = self._reader(data)
+        physicalEntities = {}
+        for dim, count in enumerate(reader.read("size_t", 4)):
+            for entity in range(count):
+                tag = int(reader.read("int")[0])
+                # points have coordinates, others have bounding boxes
+                reader.read("double", 3 if dim == 0 else 6)
+                physicalTags = reader.read("int", int(reader.read("size_t")[0]))
+                if dim > 0:
+                    # bounding entities
+                    reader.read("int", int(reader.read("size_t")[0]))
+                if len(physicalTags) > 0:
+                    physicalEntities[(dim, tag)] = int(physicalTags[0])
+                else:
+                    physicalEntities[(dim, tag)] = 0
 
-        self.fileobj.seek(0)
-        newF.close()
-        return newPath
+        return physicalEntities
 
-    def _seekForHeader(self, title):
+    def _parseElements(self, data, physicalEntities=None):
         """
-        Iterate through a file until we end up at the section header
-        for `title`. Function has obvious side-effects on `self.fileobj`.
+        Returns an `_ElementData` of all of the elements in the
+        `$Elements` section, in the order they appear.
+
+        Elements of the same type and number of tags are converted
+        together.
         """
-        while True:
-            line = self.fileobj.readline()
-            if len(line) == 0:
-                raise EOFError("No `%s' header found!" % title)
-                break
-            elif (("$%s" % title) not in line):
-                continue
+        blocks = []
+        if self.version < 4:
+            if self.fileType == 0:
+                lengths = _asciiLineLengths(data)
+                values = _asciiValues(data, dtype=nx.INT_DTYPE)
+                numElements = int(values[0])
+                lengths = lengths[1:1 + numElements]
+                starts = 1 + nx.cumsum(lengths) - lengths
+                kinds = nx.array((values[starts + 1], values[starts + 2], lengths)).swapaxes(0, 1)
+                first, inverse = _uniqueRows(kinds)
+                for kind, (elementType, numTags, length) in enumerate(kinds[first]):
+                    rows = nx.nonzero(inverse == kind)[0]
+                    block = values[starts[rows][..., nx.newaxis] + nx.arange(length)]
+                    blocks.append((rows, block[..., 0], elementType,
+                                   block[..., 3:3 + numTags], block[..., 3 + numTags:]))
             else:
-                break # found header
+                reader = _BinaryReader(data, byteorder=self.byteorder)
+                numElements = int(reader.line())
+                start = 0
+                while start < numElements:
+                    elementType, count, numTags = reader.read("int", 3)
+                    width = 1 + numTags + self._nodesPerElement(elementType)
+                    block = reader.read("int", count * width).reshape((count, width)).astype(nx.INT_DTYPE)
+                    blocks.append((nx.arange(start, start + count), block[..., 0], elementType,
+                                   block[..., 1:1 + numTags], block[..., 1 + numTags:]))
+                    start += count
+        else:
+            physicalEntities = physicalEntities or {}
+            reader = self._reader(data)
+            numBlocks, numElements = reader.read("size_t", 4)[:2]
+            start = 0
+            for block in range(numBlocks):
+                entityDim, entityTag, elementType = reader.read("int", 3)
+                count = int(reader.read("size_t")[0])
+                width = 1 + self._nodesPerElement(elementType)
+                block = reader.read("size_t", count * width).reshape((count, width)).astype(nx.INT_DTYPE)
+                tags = nx.empty((count, 2), dtype=nx.INT_DTYPE)
+                tags[..., 0] = physicalEntities.get((entityDim, entityTag), 0)
+                tags[..., 1] = entityTag
+                blocks.append((nx.arange(start, start + count), block[..., 0], elementType,
+                               tags, block[..., 1:]))
+                start += count
+
+        return _ElementData._fromBlocks(blocks, int(numElements))
+
+    def _nodesPerElement(self, elementType):
+        try:
+            return _nodesPerElement[elementType]
+        except KeyError:
+            raise GmshException("Gmsh element type %d is not supported" % elementType)
 
     def _deriveCellsAndFaces(self, cellsToVertIDs, shapeTypes, numCells):
         """
-        Uses element information obtained from `_parseElementFile` to deliver
-        `facesToVertices` and `cellsToFaces`.
+        Uses element information obtained from `_sortElements` to deliver
+        `facesToVertices`, `cellsToFaces` and the sorted vertex IDs of
+        each face.
+
+        The faces of all cells are gathered into one array, with shorter
+        faces padded at the front with -1.  A face shared by two cells
+        is identified by sorting its vertex IDs, and the faces are numbered
+        in the order they are first encountered.
         """
 
         allShapes  = nx.unique(shapeTypes).tolist()
         maxFaces   = max([self.numFacesPerCell[x] for x in allShapes])
 
-        # `cellsToFaces` must be padded with -1; see mesh.py
-        currNumFaces = 0
-        cellsToFaces = nx.ones((numCells, maxFaces), 'l') * -1
-        facesDict    = {}
-        uniqueFaces  = []
-
-        # we now build `cellsToFaces` and `uniqueFaces`,
-        # the latter will result in `facesToVertices`.
-        for cellIdx in range(numCells):
-            shapeType = shapeTypes[cellIdx]
-            cell = cellsToVertIDs[cellIdx]
-
-            if shapeType in [5, 12, 17]: # hexahedron
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3], # ordering of vertices gleaned from
-                                                                 [4, 5, 6, 7], # a one-cube Grid3D example
-                                                                 [0, 1, 5, 4],
-                                                                 [3, 2, 6, 7],
-                                                                 [0, 3, 7, 4],
-                                                                 [1, 2, 6, 5]])
-            elif shapeType in [6, 13, 18]: # prism
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2],
-                                                                 [5, 4, 3],
-                                                                 [3, 4, 1, 0],
-                                                                 [4, 5, 2, 1],
-                                                                 [5, 3, 0, 2]])
-            elif shapeType in [7, 14, 19]: # pyramid
-                faces = self._extractOrderedFaces(cell=cell,
-                                                  faceOrderings=[[0, 1, 2, 3],
-                                                                 [0, 1, 4],
-                                                                 [1, 2, 4],
-                                                                 [2, 3, 4],
-                                                                 [3, 0, 4]])
-            else:
-                if shapeType in [2, 9, 20, 21, 22, 23, 24, 25]:
-                    faceLength = 2 # triangle
-                elif shapeType in [3, 10, 16]:
-                    faceLength = 2 # quadrangle
-                elif shapeType in [4, 11, 29, 30, 31]:
-                    faceLength = 3 # tetrahedron
-
-                faces = self._extractRegularFaces(cell=cell,
-                                                  faceLength=faceLength,
-                                                  facesPerCell=self.numFacesPerCell[shapeType])
-
-            for faceIdx in range(len(faces)):
-                # NB: currFace is sorted for the key to spot duplicates
-                currFace = faces[faceIdx]
-                keyStr   = ' '.join([str(x) for x in sorted(currFace)])
-
-                if keyStr in facesDict:
-                    cellsToFaces[cellIdx][faceIdx] = facesDict[keyStr]
-                else: # new face
-                    facesDict[keyStr] = currNumFaces
-                    cellsToFaces[cellIdx][faceIdx] = currNumFaces
-                    uniqueFaces.append(currFace)
-                    currNumFaces += 1
-
-        # pad short faces with -1
-        maxFaceLen = max([len(f) for f in uniqueFaces])
-        uniqueFaces = [[-1] * (maxFaceLen - len(f)) + f for f in uniqueFaces]
-
-        facesToVertices = nx.array(uniqueFaces, dtype=nx.INT_DTYPE)
-
-        return facesToVertices.swapaxes(0, 1)[::-1], cellsToFaces.swapaxes(0, 1).copy('C'), facesDict
+        shapeIDs = dict((shapeType, nx.nonzero(shapeTypes == shapeType)[0])
+                        for shapeType in allShapes)
+        orderings = dict((shapeType,
+                          _faceOrderings(shapeType=shapeType,
+                                         facesPerCell=self.numFacesPerCell[shapeType],
+                                         nodesPerCell=(cellsToVertIDs[shapeIDs[shapeType][0]] >= 0).sum()))
+                         for shapeType in allShapes)
+        maxFaceLen = max([o.shape[1] for o in orderings.values()])
+
+        # candidate faces of every cell, in the order they are numbered
+        candidates = -nx.ones((numCells, maxFaces, maxFaceLen), dtype=nx.INT_DTYPE)
+        isFace = nx.zeros((numCells, maxFaces), dtype=bool)
+        for shapeType in allShapes:
+            ids = shapeIDs[shapeType]
+            ordering = orderings[shapeType]
+            facesPerCell, faceLength = ordering.shape
+            cells = cellsToVertIDs[ids]
+            faces = nx.where(ordering >= 0, cells[:, ordering], -1)
+            candidates[ids, :facesPerCell, maxFaceLen - faceLength:] = faces
+            isFace[ids, :facesPerCell] = True
+
+        faces = candidates.reshape((-1, maxFaceLen))[isFace.ravel()]
+        keys = nx.sort(faces, axis=1)
+
+        first, inverse = _uniqueRows(keys)
+        # number unique faces by their first appearance
+        order = nx.argsort(first)
+        faceIDs = nx.empty(len(order), dtype=nx.INT_DTYPE)
+        faceIDs[order] = nx.arange(len(order))
 
-    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
-        """Translates e`ntitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
-        """
-        entitiesVertices = []
+        # `cellsToFaces` must be padded with -1; see mesh.py
+        cellsToFaces = -nx.ones((numCells, maxFaces), dtype=nx.INT_DTYPE)
+        cellsToFaces[isFace] = faceIDs[inverse]
 
-        for entity in entitiesNodes:
-            try:
-                vertIndices = vertexMap[nx.array(entity)]
-            except IndexError:
-                vertIndices = nx.ones((len(entity),), 'l') * -1
-            entitiesVertices.append(vertIndices)
+        facesToVertices = faces[first[order]]
 
-        return entitiesVertices
+        return (facesToVertices.swapaxes(0, 1)[::-1],
+                cellsToFaces.swapaxes(0, 1).copy('C'),
+                keys[first[order]])
 
-    def _extractRegularFaces(self, cell, faceLength, facesPerCell):
-        """Return faces for a regular poly(gon|hedron)
+    def _translateNodesToVertices(self, entitiesNodes, vertexMap):
+        """Translates `entitiesNodes` from Gmsh node IDs to `vertexCoords` indices.
 
-        Given `cell`, defined by node IDs, returns an array of
-        `facesPerCell` faces of length `faceLength` in terms of nodes.
-        """
-        faces = []
-        for i in range(facesPerCell):
-            aFace = []
-            for j in range(faceLength):
-                aVertex = (i + j) % len(cell) # we may wrap
-                aFace.append(int(cell[aVertex]))
-            faces.append(aFace)
-        return faces
-
-    def _extractOrderedFaces(self, cell, faceOrderings):
-        """Return faces for a 8-node hexahedron cell.
+        Padding and nodes that are not vertices are translated to -1.
         """
-        def orderingToFace(vertList):
-            aFace = []
-            for i in vertList:
-                aFace.append(int(cell[i]))
-            return aFace
-
-        return [orderingToFace(o) for o in faceOrderings]
+        known = (entitiesNodes >= 0) & (entitiesNodes < len(vertexMap))
+        return nx.where(known, vertexMap[nx.where(known, entitiesNodes, 0)], -1)
 
     def read(self):
-        """
-        0. Build `cellsToVertices`
-        1. Recover needed `vertexCoords` and mapping from file using
+        r"""
+        0. Parse the `$Nodes`, `$Elements`, `$PhysicalNames`, and
+           (for `MSH` 4) `$Entities` sections
+        1. Build `cellsToVertices`
+        2. Recover needed `vertexCoords` and mapping from file using
            `cellsToVertices`
-        2. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
-        3. Build faces
-        4. Build `cellsToFaces`
+        3. Build `cellsToVertIDs` proper from `vertexCoords` and vertex map
+        4. Build faces
+        5. Build `cellsToFaces`
 
-        Isolate relevant data into three files, store in
-        `self.nodesPath` for `$Nodes`,
-        `self.elemsPath` for `$Elements`.
-        `self.namesFile` for `$PhysicalNames`.
+        The file is mapped into memory and each section is converted in
+        bulk, with `numpy.fromstring` for ASCII files and
+        `numpy.frombuffer` for binary files.  ASCII and binary files of
+        `MSH` versions 2 and 4.1 can be read.
 
         Returns `vertexCoords`, `facesToVertexID`, `cellsToFaceID`,
                 `cellGlobalIDMap`, `ghostCellGlobalIDMap`.
+
+        Files can be read without Gmsh.  A unit square of two triangles,
+        with its left side named, reads the same from `MSH` 2.2 ASCII,
+        `MSH` 4.1 ASCII, and `MSH` 4.1 binary files
+
+        >>> import os
+        >>> import tempfile
+        >>> from fipy.meshes.mesh2D import Mesh2D
+        >>> def readMSH(contents):
+        ...     f, name = tempfile.mkstemp(suffix=".msh")
+        ...     _ = os.write(f, contents)
+        ...     os.close(f)
+        ...     msh = MSHFile(name, dimensions=2, communicator=serialComm)
+        ...     vertexCoords, faceVertexIDs, cellFaceIDs = msh.read()[:3]
+        ...     msh.close()
+        ...     os.remove(name)
+        ...     mesh = Mesh2D(vertexCoords, faceVertexIDs, cellFaceIDs,
+        ...                   communicator=serialComm)
+        ...     physicalFaces = msh.makeMapVariables(mesh)[5]
+        ...     return vertexCoords, faceVertexIDs, cellFaceIDs, physicalFaces
+
+        >>> names = (b'$PhysicalNames\n2\n1 1 "Left"\n2 2 "Domain"\n'
+        ...          b'$EndPhysicalNames\n')
+
+        >>> vertexCoords, faceVertexIDs, cellFaceIDs, physicalFaces = readMSH(
+        ...     b"$MeshFormat\n2.2 0 8\n$EndMeshFormat\n" + names
+        ...     + b"$Nodes\n4\n1 0 0 0\n2 1 0 0\n3 1 1 0\n4 0 1 0\n$EndNodes\n"
+        ...     + b"$Elements\n3\n1 1 2 1 4 4 1\n"
+        ...     + b"2 2 2 2 1 1 2 3\n3 2 2 2 1 1 3 4\n$EndElements\n")
+        >>> print(vertexCoords)
+        [[ 0.  1.  1.  0.]
+         [ 0.  0.  1.  1.]]
+        >>> print(faceVertexIDs)
+        [[1 2 0 3 0]
+         [0 1 2 2 3]]
+        >>> print(cellFaceIDs)
+        [[0 2]
+         [1 3]
+         [2 4]]
+        >>> print(physicalFaces["Left"])
+        [False False False False  True]
+
+        >>> def same(contents):
+        ...     other = readMSH(contents)
+        ...     return (nx.array_equal(other[0], vertexCoords)
+        ...             and nx.array_equal(other[1], faceVertexIDs)
+        ...             and nx.array_equal(other[2], cellFaceIDs)
+        ...             and nx.array_equal(other[3]["Left"],
+        ...                                     physicalFaces["Left"]))
+
+        >>> print(same(b"$MeshFormat\n4.1 0 8\n$EndMeshFormat\n" + names
+        ...            + b"$Entities\n0 1 1 0\n"
+        ...            + b"4 0 0 0 0 1 0 1 1 0\n1 0 0 0 1 1 0 1 2 0\n$EndEntities\n"
+        ...            + b"$Nodes\n1 4 1 4\n2 1 0 4\n1\n2\n3\n4\n"
+        ...            + b"0 0 0\n1 0 0\n1 1 0\n0 1 0\n$EndNodes\n"
+        ...            + b"$Elements\n2 3 1 3\n1 4 1 1\n1 4 1\n"
+        ...            + b"2 1 2 2\n2 1 2 3\n3 1 3 4\n$EndElements\n"))
+        True
+
+        >>> def binary(kind, *values):
+        ...     dtype = {"int": "<i4", "size_t": "<u8", "double": "<f8"}[kind]
+        ...     return nx.array(values, dtype=dtype).tobytes()
+        >>> print(same(b"$MeshFormat\n4.1 1 8\n" + binary("int", 1)
+        ...            + b"\n$EndMeshFormat\n" + names
+        ...            + b"$Entities\n" + binary("size_t", 0, 1, 1, 0)
+        ...            + binary("int", 4) + binary("double", 0, 0, 0, 0, 1, 0)
+        ...            + binary("size_t", 1) + binary("int", 1) + binary("size_t", 0)
+        ...            + binary("int", 1) + binary("double", 0, 0, 0, 1, 1, 0)
+        ...            + binary("size_t", 1) + binary("int", 2) + binary("size_t", 0)
+        ...            + b"\n$EndEntities\n"
+        ...            + b"$Nodes\n" + binary("size_t", 1, 4, 1, 4)
+        ...            + binary("int", 2, 1, 0) + binary("size_t", 4)
+        ...            + binary("size_t", 1, 2, 3, 4)
+        ...            + binary("double", 0, 0, 0, 1, 0, 0, 1, 1, 0, 0, 1, 0)
+        ...            + b"\n$EndNodes\n"
+        ...            + b"$Elements\n" + binary("size_t", 2, 3, 1, 3)
+        ...            + binary("int", 1, 4, 1) + binary("size_t", 1, 1, 4, 1)
+        ...            + binary("int", 2, 1, 2)
+        ...            + binary("size_t", 2, 2, 1, 2, 3, 3, 1, 3, 4)
+        ...            + b"\n$EndElements\n"))
+        True
         """
-        self.version, self.fileType, self.dataSize = self._getMetaData()
-        self.nodesPath = self._isolateData("Nodes")
-        self.elemsPath = self._isolateData("Elements")
-        try:
-            self.namesPath = self._isolateData("PhysicalNames")
-        except EOFError as e:
-            self.namesPath = None
+        with open(self.filename, 'rb') as f:
+            buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
 
         try:
-            if self.dimensions is None:
-                nodesFile = open(self.nodesPath, 'r')
-                nodesFile.readline() # skip number of nodes
+            sections = _findSections(buf)
 
-                # We assume we have a 2D file unless we find a node
-                # with a non-zero Z coordinate
-                self.dimensions = 2
-                for node in nodesFile:
-                    line   = node.split()
+            def section(title):
+                if title not in sections:
+                    raise EOFError("No `%s' header found!" % title)
+                start, stop = sections[title]
+                return buf[start:stop]
 
-                    newVert = [float(x) for x in line]
+            (self.version,
+             self.fileType,
+             self.dataSize,
+             self.byteorder) = self._parseMeshFormat(section("MeshFormat"))
 
-                    if newVert[2] != 0.0:
-                        self.dimensions = 3
-                        break
+            if not (2 <= self.version < 3 or self.version >= 4.1):
+                raise GmshException("Gmsh MSH file format version %s is not supported" % self.version)
+            if self.version >= 4 and "PartitionedEntities" in sections:
+                raise GmshException("Partitioned Gmsh MSH 4 files are not supported. "
+                                    "Partition with `-format msh2`.")
 
-                nodesFile.close()
-
-            self.coordDimensions = self.coordDimensions or self.dimensions
-
-            # we need a conditional here so we don't pick up 2D shapes in 3D
-            if self.dimensions == 2:
-                self.numVertsPerFace = {1: 2, # 2-node line
-                                        8: 2} # 3-node line
-                self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 faces)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-            elif self.dimensions == 3:
-                self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
-                                         9: 3, # 6-node triangle (we only read 1st 3)
-                                        20: 3, # 9-node triangle (we only read 1st 3)
-                                        21: 3, # 10-node triangle (we only read 1st 3)
-                                        22: 3, # 12-node triangle (we only read 1st 3)
-                                        23: 3, # 15-node triangle (we only read 1st 3)
-                                        24: 3, # 15-node triangle (we only read 1st 3)
-                                        25: 3, # 21-node triangle (we only read 1st 3)
-                                         3: 4, # 4-node quadrangle (4 vertices)
-                                        10: 4, # 9-node quadrangle (we only read 1st 4)
-                                        16: 4} # 8-node quadrangle (we only read 1st 4)
-                self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
-                                        11: 4, # 10-node tetrahedron (we only read 1st 4)
-                                        29: 4, # 20-node tetrahedron (we only read 1st 4)
-                                        30: 4, # 35-node tetrahedron (we only read 1st 4)
-                                        31: 4, # 56-node tetrahedron (we only read 1st 4)
-                                         5: 6, # 8-node hexahedron (6 faces)
-                                        12: 6, # 27-node tetrahedron (we only read 1st 6)
-                                        17: 6, # 20-node tetrahedron (we only read 1st 6)
-                                         6: 5, # 6-node prism (5 faces)
-                                        13: 5, # 18-node prism (we only read 1st 6)
-                                        18: 5, # 15-node prism (we only read 1st 6)
-                                         7: 5, # 5-node pyramid (5 faces)
-                                        14: 5, # 14-node pyramid (we only read 1st 5)
-                                        19: 5} # 13-node pyramid (we only read 1st 5)
-            else:
-                raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+            _log.debug("Parsing nodes.")
+            nodeIDs, nodeCoords = self._parseNodes(section("Nodes"))
 
             _log.debug("Parsing elements.")
-            (cellsData,
-             ghostsData,
-             facesData) = self._parseElementFile()
-
-            cellsToGmshVerts = cellsData.nodes + ghostsData.nodes
-            numCellsTotal    = len(cellsData.nodes) + len(ghostsData.nodes)
-            allShapeTypes    = cellsData.shapes + ghostsData.shapes
-            allShapeTypes    = nx.array(allShapeTypes)
-            allShapeTypes    = nx.delete(allShapeTypes, nx.s_[numCellsTotal:])
-            self.physicalCellMap = nx.array(cellsData.physicalEntities
-                                            + ghostsData.physicalEntities)
-            self.geometricalCellMap = nx.array(cellsData.geometricalEntities
-                                               + ghostsData.geometricalEntities)
-
-            if numCellsTotal < 1:
-                errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
-                errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
-                raise GmshException(errStr)
-
-            _log.debug("Recovering coords.")
-            _log.debug("numcells %d" % numCellsTotal)
-            vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts)
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
-                                                            vertIDtoIdx)
-
-            _log.debug("Building cells and faces.")
-            (facesToV,
-             cellsToF,
-             facesDict) = self._deriveCellsAndFaces(cellsToVertIDs,
-                                                    allShapeTypes,
-                                                    numCellsTotal)
-
-            # cell entities were easy to record on parsing
-            # but we don't use Gmsh faces, so we need to correlate the nodes
-            # that make up the Gmsh faces with the vertex IDs of the FiPy faces
-            # so that we can check if any are named
-            faceEntitiesDict = dict()
-
-            # translate Gmsh IDs to `vertexCoord` indices
-            facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
-                                                            vertIDtoIdx)
-
-            for face, physicalEntity, geometricalEntity in zip(facesToVertIDs,
-                                                               facesData.physicalEntities,
-                                                               facesData.geometricalEntities):
-                faceEntitiesDict[' '.join([str(x) for x in sorted(face)])] = (physicalEntity, geometricalEntity)
-
-            self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
-            for face in list(facesDict.keys()):
-                # not all faces are necessarily tagged
-                if face in faceEntitiesDict:
-                    self.physicalFaceMap[facesDict[face]] = faceEntitiesDict[face][0]
-                    self.geometricalFaceMap[facesDict[face]] = faceEntitiesDict[face][1]
-
-            self.physicalNames = self._parseNamesFile()
-
+            physicalEntities = None
+            if self.version >= 4 and "Entities" in sections:
+                physicalEntities = self._parseEntities(section("Entities"))
+            elements = self._parseElements(section("Elements"),
+                                           physicalEntities=physicalEntities)
+
+            if "PhysicalNames" in sections:
+                names = section("PhysicalNames")
+            else:
+                names = None
         finally:
-            os.unlink(self.nodesPath)
-            os.unlink(self.elemsPath)
-            if self.namesPath is not None:
-                os.unlink(self.namesPath)
-
-        # convert lists of cell vertices to a properly oriented masked array
-        maxVerts = max([len(v) for v in cellsToVertIDs])
-        # ticket:539 - NumPy 1.7 casts to array before concatenation and empty array defaults to float
-        cellsToVertIDs = [nx.concatenate((v, nx.array([-1] * (maxVerts-len(v)), dtype=nx.INT_DTYPE))) for v in cellsToVertIDs]
+            buf.close()
+
+        if self.dimensions is None:
+            # We assume we have a 2D file unless we find a node
+            # with a non-zero Z coordinate
+            if (nodeCoords[..., 2] != 0.).any():
+                self.dimensions = 3
+            else:
+                self.dimensions = 2
+
+        self.coordDimensions = self.coordDimensions or self.dimensions
+
+        # we need a conditional here so we don't pick up 2D shapes in 3D
+        if self.dimensions == 2:
+            self.numVertsPerFace = {1: 2, # 2-node line
+                                    8: 2} # 3-node line
+            self.numFacesPerCell = { 2: 3, # 3-node triangle (3 faces)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 faces)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+        elif self.dimensions == 3:
+            self.numVertsPerFace = { 2: 3, # 3-node triangle (3 vertices)
+                                     9: 3, # 6-node triangle (we only read 1st 3)
+                                    20: 3, # 9-node triangle (we only read 1st 3)
+                                    21: 3, # 10-node triangle (we only read 1st 3)
+                                    22: 3, # 12-node triangle (we only read 1st 3)
+                                    23: 3, # 15-node triangle (we only read 1st 3)
+                                    24: 3, # 15-node triangle (we only read 1st 3)
+                                    25: 3, # 21-node triangle (we only read 1st 3)
+                                     3: 4, # 4-node quadrangle (4 vertices)
+                                    10: 4, # 9-node quadrangle (we only read 1st 4)
+                                    16: 4} # 8-node quadrangle (we only read 1st 4)
+            self.numFacesPerCell = { 4: 4, # 4-node tetrahedron (4 faces)
+                                    11: 4, # 10-node tetrahedron (we only read 1st 4)
+                                    29: 4, # 20-node tetrahedron (we only read 1st 4)
+                                    30: 4, # 35-node tetrahedron (we only read 1st 4)
+                                    31: 4, # 56-node tetrahedron (we only read 1st 4)
+                                     5: 6, # 8-node hexahedron (6 faces)
+                                    12: 6, # 27-node tetrahedron (we only read 1st 6)
+                                    17: 6, # 20-node tetrahedron (we only read 1st 6)
+                                     6: 5, # 6-node prism (5 faces)
+                                    13: 5, # 18-node prism (we only read 1st 6)
+                                    18: 5, # 15-node prism (we only read 1st 6)
+                                     7: 5, # 5-node pyramid (5 faces)
+                                    14: 5, # 14-node pyramid (we only read 1st 5)
+                                    19: 5} # 13-node pyramid (we only read 1st 5)
+        else:
+            raise GmshException("Mesh has fewer than 2 or more than 3 dimensions")
+
+        _log.debug("Sorting elements.")
+        (cellsData,
+         ghostsData,
+         facesData) = self._sortElements(elements)
+
+        numCellsTotal    = len(cellsData) + len(ghostsData)
+        maxVerts         = max(cellsData.nodes.shape[1], ghostsData.nodes.shape[1])
+        cellsToGmshVerts = -nx.ones((numCellsTotal, maxVerts), dtype=nx.INT_DTYPE)
+        cellsToGmshVerts[:len(cellsData), :cellsData.nodes.shape[1]] = cellsData.nodes
+        cellsToGmshVerts[len(cellsData):, :ghostsData.nodes.shape[1]] = ghostsData.nodes
+        allShapeTypes    = nx.concatenate((cellsData.shapes, ghostsData.shapes))
+        self.physicalCellMap = nx.concatenate((cellsData.physicalEntities,
+                                               ghostsData.physicalEntities))
+        self.geometricalCellMap = nx.concatenate((cellsData.geometricalEntities,
+                                                  ghostsData.geometricalEntities))
+
+        if numCellsTotal < 1:
+            errStr = "Gmsh hasn't produced any cells! Check your Gmsh code."
+            errStr += "\n\nGmsh output:\n%s" % "".join(self.gmshOutput).rstrip()
+            raise GmshException(errStr)
+
+        _log.debug("Recovering coords.")
+        _log.debug("numcells %d" % numCellsTotal)
+        vertexCoords, vertIDtoIdx = self._vertexCoordsAndMap(cellsToGmshVerts,
+                                                             nodeIDs, nodeCoords)
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        cellsToVertIDs = self._translateNodesToVertices(cellsToGmshVerts,
+                                                        vertIDtoIdx)
+
+        _log.debug("Building cells and faces.")
+        (facesToV,
+         cellsToF,
+         faceKeys) = self._deriveCellsAndFaces(cellsToVertIDs,
+                                               allShapeTypes,
+                                               numCellsTotal)
+
+        # cell entities were easy to record on parsing
+        # but we don't use Gmsh faces, so we need to correlate the nodes
+        # that make up the Gmsh faces with the vertex IDs of the FiPy faces
+        # so that we can check if any are named
+
+        # translate Gmsh IDs to `vertexCoord` indices
+        facesToVertIDs = self._translateNodesToVertices(facesData.nodes,
+                                                        vertIDtoIdx)
+
+        self.physicalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+        self.geometricalFaceMap = nx.zeros(facesToV.shape[-1:], 'l')
+
+        # not all faces are necessarily tagged
+        faceIDs = _matchFaces(faceKeys, facesToVertIDs, facesData.numNodes)
+        tagged = faceIDs >= 0
+        self.physicalFaceMap[faceIDs[tagged]] = facesData.physicalEntities[tagged]
+        self.geometricalFaceMap[faceIDs[tagged]] = facesData.geometricalEntities[tagged]
+
+        self.physicalNames = self._parseNames(names)
+
+        # convert cell vertices to a properly oriented masked array
         cellsToVertIDs = nx.MA.masked_equal(cellsToVertIDs, value=-1).swapaxes(0, 1)
 
         _log.debug("Done with cells and faces.")
         return (vertexCoords, facesToV, cellsToF,
-                cellsData.idmap, ghostsData.idmap,
+                cellsData.idmap.tolist(), ghostsData.idmap.tolist(),
                 cellsToVertIDs)
 
     def write(self, obj, time=0.0, timeindex=0):
@@ -1005,50 +1415,35 @@ class MSHFile(GmshFile):
 
         self.fileobj.write("$EndElementData\n")
 
-    def _vertexCoordsAndMap(self, cellsToGmshVerts):
+    def _vertexCoordsAndMap(self, cellsToGmshVerts, nodeIDs, nodeCoords):
         """
         Returns `vertexCoords` and mapping from Gmsh ID to `vertexCoords`
         indices (same as in `MSHFile`).
 
-        Unlike parent, doesn't use `genfromtxt`
-        because we want to avoid loading the entire `.msh` file into memory.
+        Only the nodes that are vertices of `cellsToGmshVerts` are kept,
+        in the order of their Gmsh IDs.
         """
-        allVerts     = [v for c in cellsToGmshVerts for v in c] # flatten
-        allVerts     = nx.unique(nx.array(allVerts, dtype=nx.INT_DTYPE)) # remove dups
-        allVerts     = nx.sort(allVerts)
+        allVerts     = nx.unique(cellsToGmshVerts[cellsToGmshVerts >= 0]) # sorted, without dups
         maxVertIdx   = allVerts[-1] + 1 # add one to offset zero
-        vertGIDtoIdx = nx.ones(maxVertIdx, 'l') * -1 # gmsh ID -> vertexCoords idx
-        vertexCoords = nx.empty((len(allVerts), self.coordDimensions))
-        nodeCount    = 0
+        vertGIDtoIdx = -nx.ones(maxVertIdx, 'l') # gmsh ID -> vertexCoords idx
 
         # establish map. This works because allVerts is a sorted set.
         vertGIDtoIdx[allVerts] = nx.arange(len(allVerts))
 
-        nodesFile = open(self.nodesPath, 'r')
-        nodesFile.readline() # skip number of nodes
-
-        # now we walk through node file with a sorted unique list of vertices
-        # in hand. When we encounter 0th element in `allVerts`, save it
-        # to `vertexCoords` then pop its ID off `allVerts`.
-        for node in nodesFile:
-            line   = node.split()
-            nodeID = int(line[0])
-
-            if nodeID == allVerts[nodeCount]:
-                newVert = [float(x) for x in line[1:self.coordDimensions+1]]
-                vertexCoords[nodeCount,:] = nx.array(newVert)
-                nodeCount += 1
-
-            if len(allVerts) == nodeCount:
-                break
-
-        nodesFile.close()
+        # Gmsh ID -> row of `nodeCoords`
+        nodeIdx = -nx.ones(max(maxVertIdx, nodeIDs.max() + 1), 'l')
+        nodeIdx[nodeIDs] = nx.arange(len(nodeIDs))
+        rows = nodeIdx[allVerts]
+        if (rows < 0).any():
+            raise GmshException("Nodes %s are not defined in `$Nodes'"
+                                % allVerts[rows < 0].tolist())
+        vertexCoords = nodeCoords[rows, :self.coordDimensions]
 
         # transpose for FiPy
         transCoords = vertexCoords.swapaxes(0, 1)
         return transCoords, vertGIDtoIdx
 
-    def _parseElementFile(self):
+    def _sortElements(self, elements):
         """
         Return three objects, the first for non-ghost cells, the second for
         ghost cells, and the third for faces.
@@ -1057,107 +1452,48 @@ class MSHFile(GmshFile):
         calculation is consolidated here: if we were ever to need to CALCULATE
         GHOST CELLS OURSELVES, the only code we'd have to change is in here.
         """
+        isCell = nx.in1d(elements.shapes, list(self.numFacesPerCell.keys()))
+        isFace = nx.in1d(elements.shapes, list(self.numVertsPerFace.keys()))
 
-        def _parseTags(offset, currLineInts):
-            if offset == -1:
-                # if first valid shape
-                offset = currLineInts[0]
-
-            numTags = currLineInts[2]
-            tags    = currLineInts[3:(3+numTags)]
+        # the Gmsh ID of the first cell (face) is subtracted from
+        # the Gmsh ID of each cell (face) to obtain its global ID
+        cellOffset = faceOffset = 0
+        if isCell.any():
+            cellOffset = elements.idmap[isCell][0]
+        if isFace.any():
+            faceOffset = elements.idmap[isFace][0]
 
+        if self.communicator.Nproc > 1:
             # the partition tags for don't seem to always be present
             # and don't always make much sense when they are
+            pid = self.communicator.procID + 1
+            partitions = elements.partitions
+            isGhost = isCell & (partitions == -pid).any(axis=1)
+            # el is in this processor's partition
+            isCell = isCell & (partitions == pid).any(axis=1)
+        else:
+            # we collect all cells
+            isGhost = nx.zeros(isCell.shape, dtype=bool)
 
-            if len(tags) >= 2:
-                physicalEntity = tags.pop(0)
-                geometricalEntity = tags.pop(0)
-            else:
-                physicalEntity = geometricalEntity = -1
-
-            return offset, tags, physicalEntity, geometricalEntity
-
-
-        cellsData = _ElementData()
-        ghostsData = _ElementData()
-        facesData = _ElementData()
-
-        cellOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        faceOffset = -1 # this will be subtracted from gmsh ID to obtain global ID
-        pid = self.communicator.procID + 1
-
-        elemsFile = open(self.elemsPath, 'r')
-
-        elemsFile.readline() # skip number of elements
-        for el in elemsFile:
-            currLineInts = [int(x) for x in el.split()]
-            elemType     = currLineInts[1]
-
-            if elemType in list(self.numFacesPerCell.keys()):
-                # element is a cell
-
-                (cellOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=cellOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= cellOffset
-
-                if len(tags) > 0:
-                    # next item is a count
-                    if tags[0] != len(tags) - 1:
-                        warnings.warn("Partition count %d does not agree with number of remaining tags %d." % (tags[0], len(tags) - 1),
-                                      SyntaxWarning, stacklevel=2)
-                    tags = tags[1:]
-
-                if self.communicator.Nproc > 1:
-                    for tag in tags:
-                        if -tag == pid:
-                            # if we're collecting ghost cells and this is our ghost cell
-                            ghostsData.add(currLine=currLineInts, elType=elemType,
-                                           physicalEntity=physicalEntity,
-                                           geometricalEntity=geometricalEntity)
-                        elif tag == pid:
-                            # el is in this processor's partition or we collect all cells
-                            cellsData.add(currLine=currLineInts, elType=elemType,
-                                          physicalEntity=physicalEntity,
-                                          geometricalEntity=geometricalEntity)
-                else:
-                    # we collect all cells
-                    cellsData.add(currLine=currLineInts, elType=elemType,
-                                  physicalEntity=physicalEntity,
-                                  geometricalEntity=geometricalEntity)
-            elif elemType in list(self.numVertsPerFace.keys()):
-                # element is a face
-
-                (faceOffset,
-                 tags,
-                 physicalEntity,
-                 geometricalEntity) = _parseTags(offset=faceOffset,
-                                                 currLineInts=currLineInts)
-                currLineInts[0] -= faceOffset
-
-                facesData.add(currLine=currLineInts, elType=elemType,
-                              physicalEntity=physicalEntity,
-                              geometricalEntity=geometricalEntity)
-
-        elemsFile.close()
-
-        return cellsData, ghostsData, facesData
-
+        return (elements._take(isCell, offset=cellOffset),
+                elements._take(isGhost, offset=cellOffset),
+                elements._take(isFace, offset=faceOffset))
 
-    def _parseNamesFile(self):
+    def _parseNames(self, data):
+        """
+        Returns the names of the physical entities of each dimension
+        in the `$PhysicalNames` section, if there is one.
+        """
         physicalNames = {
             0: dict(),
             1: dict(),
             2: dict(),
             3: dict()
         }
-        if self.namesPath is not None:
-            namesFile = open(self.namesPath, 'r')
-
-            namesFile.readline() # skip number of elements
-            for nm in namesFile:
+        if data is not None:
+            lines = bytes(data).decode("utf-8").splitlines()
+            numNames = int(lines[0])
+            for nm in lines[1:1 + numNames]:
                 nm = nm.split()
                 if self.version > 2.0:
                     dim = [int(nm.pop(0))]
@@ -1171,28 +1507,20 @@ class MSHFile(GmshFile):
                 for d in dim:
                     physicalNames[d][name] = int(num)
 
-            namesFile.close()
-
         return physicalNames
 
     def makeMapVariables(self, mesh):
         """Utility function to make `MeshVariables` that define different domains in the mesh
         """
-        from fipy.variables.cellVariable import CellVariable
-        from fipy.variables.faceVariable import FaceVariable
-
-        self.physicalCellMap = CellVariable(mesh=mesh, value=self.physicalCellMap)
-        self.geometricalCellMap = CellVariable(mesh=mesh, value=self.geometricalCellMap)
-        self.physicalFaceMap = FaceVariable(mesh=mesh, value=self.physicalFaceMap)
-        self.geometricalFaceMap = FaceVariable(mesh=mesh, value=self.geometricalFaceMap)
-
-        physicalCells = dict()
-        for name in list(self.physicalNames[self.dimensions].keys()):
-            physicalCells[name] = (self.physicalCellMap == self.physicalNames[self.dimensions][name])
-
-        physicalFaces = dict()
-        for name in list(self.physicalNames[self.dimensions-1].keys()):
-            physicalFaces[name] = (self.physicalFaceMap == self.physicalNames[self.dimensions-1][name])
+        (self.physicalCellMap,
+         self.geometricalCellMap,
+         physicalCells,
+         self.physicalFaceMap,
+         self.geometricalFaceMap,
+         physicalFaces) = _makeMapVariables(mesh=mesh,
+                                            maps=self._maps,
+                                            physicalNames=self.physicalNames,
+                                            dimensions=self.dimensions)
 
         return (self.physicalCellMap,
                 self.geometricalCellMap,
@@ -1201,6 +1529,16 @@ class MSHFile(GmshFile):
                 self.geometricalFaceMap,
                 physicalFaces)
 
+    @property
+    def _maps(self):
+        """Physical and geometrical entities of cells and faces, in the
+        order taken by `_makeMapVariables`
+        """
+        return (self.physicalCellMap,
+                self.geometricalCellMap,
+                self.physicalFaceMap,
+                self.geometricalFaceMap)
+
     def _test(self):
         """
         Test exporting
@@ -1277,31 +1615,241 @@ class MSHFile(GmshFile):
         """
         pass
 
+def _makeMapVariables(mesh, maps, physicalNames, dimensions):
+    """Make `MeshVariables` that define different domains in the mesh
+
+    Parameters
+    ----------
+    mesh : ~fipy.meshes.mesh.Mesh
+    maps : tuple of array_like
+        Physical and geometrical entities of each cell, followed by those
+        of each face.
+    physicalNames : dict
+        Physical entity of each name, for each dimension.
+    dimensions : int
+        Dimension of the cells.
+    """
+    from fipy.variables.cellVariable import CellVariable
+    from fipy.variables.faceVariable import FaceVariable
+
+    physicalCellMap, geometricalCellMap, physicalFaceMap, geometricalFaceMap = maps
+
+    physicalCellMap = CellVariable(mesh=mesh, value=physicalCellMap)
+    geometricalCellMap = CellVariable(mesh=mesh, value=geometricalCellMap)
+    physicalFaceMap = FaceVariable(mesh=mesh, value=physicalFaceMap)
+    geometricalFaceMap = FaceVariable(mesh=mesh, value=geometricalFaceMap)
+
+    physicalCells = dict()
+    for name in list(physicalNames[dimensions].keys()):
+        physicalCells[name] = (physicalCellMap == physicalNames[dimensions][name])
+
+    physicalFaces = dict()
+    for name in list(physicalNames[dimensions-1].keys()):
+        physicalFaces[name] = (physicalFaceMap == physicalNames[dimensions-1][name])
+
+    return (physicalCellMap,
+            geometricalCellMap,
+            physicalCells,
+            physicalFaceMap,
+            geometricalFaceMap,
+            physicalFaces)
+
+def _gmshCachePath(cache, arg, meshClass, dimensions, coordDimensions,
+                   communicator, background):
+    """Directory of the cached mesh made from `arg`, or `None` if it can't be cached
+
+    The cache entry is keyed by a hash of the contents of the `MSH` or
+    `.geo` file, or of the Gmsh script, along with the mesh class, its
+    storage types and, unless `arg` is an `MSH` file, the version of Gmsh
+    that meshes it.
+    Partitioned meshes and meshes generated for a `background` are not
+    cached.  Nor are meshes whose `.geo` file or script reads other files
+    with `Include` or `Merge`, as changes to those files would not change
+    the key.
+
+    >>> print(_gmshCachePath("cache", 'Include "square.geo";', Gmsh2D,
+    ...                      dimensions=2, coordDimensions=2,
+    ...                      communicator=serialComm, background=None))
+    None
+    """
+    if cache is None:
+        cache = os.environ.get("FIPY_MESH_CACHE")
+
+    if (not cache
+        or background is not None
+        or communicator.Nproc > 1):
+        return None
+
+    sources = [meshClass.__name__, str(dimensions), str(coordDimensions),
+               str(meshClass._indexDtype), str(meshClass._geometryDtype)]
+    if os.path.isfile(arg):
+        files = [arg]
+        with open(arg, 'rb') as f:
+            isMSH = (f.readline().strip() == b"$MeshFormat")
+    else:
+        files = []
+        sources.append(arg)
+        isMSH = False
+
+    if not isMSH:
+        if files:
+            with open(arg, 'rb') as f:
+                script = f.read().decode('utf-8', 'replace')
+        else:
+            script = arg
+        if _gmshReadsFiles(script):
+            return None
+        sources.append(str(_gmshVersion(communicator=communicator)))
+
+    return os.path.join(cache, _meshCacheKey(sources, files=files))
+
+def _gmshReadsFiles(script):
+    """Whether the Gmsh `script` reads other files
+
+    >>> print(_gmshReadsFiles('Merge "background.pos";'))
+    True
+    >>> print(_gmshReadsFiles('// Include "square.geo";\\nPoint(1) = {0, 0, 0};'))
+    False
+    """
+    script = re.sub(r"//[^\n]*|/\*.*?\*/", "", script, flags=re.DOTALL)
+    return re.search(r"\b(Include|Merge)\b", script) is not None
+
+def _readGmshCache(path):
+    """Open a mesh stored by `_writeGmshCache`
+
+    Returns `vertexCoords`, `faceVertexIDs`, `cellFaceIDs`,
+    `cellGlobalIDs`, `ghostCellGlobalIDs`, `orderedCellVertexIDs`,
+    the physical and geometrical entity maps, `physicalNames`, and
+    the derived topology and geometry.
+    """
+    arrays, info = _readMeshCache(path)
+    physicalNames = dict((int(dim), names)
+                         for dim, names in info["physicalNames"].items())
+
+    return (arrays.pop("vertexCoords"),
+            arrays.pop("faceVertexIDs"),
+            arrays.pop("cellFaceIDs"),
+            arrays.pop("cellGlobalIDs").tolist(),
+            arrays.pop("gCellGlobalIDs").tolist(),
+            arrays.pop("orderedCellVertexIDs"),
+            tuple(arrays.pop(name) for name in ("physicalCellMap",
+                                                "geometricalCellMap",
+                                                "physicalFaceMap",
+                                                "geometricalFaceMap")),
+            physicalNames,
+            arrays)
+
+def _writeGmshCache(path, mesh, maps, physicalNames):
+    """Store `mesh` and its entities for `_readGmshCache`
+    """
+    arrays = mesh._derived
+    arrays.update(vertexCoords=mesh.vertexCoords,
+                  faceVertexIDs=nx.MA.filled(mesh.faceVertexIDs, -1),
+                  cellFaceIDs=nx.MA.filled(mesh.cellFaceIDs, -1),
+                  cellGlobalIDs=nx.array(mesh.cellGlobalIDs, dtype=nx.INT_DTYPE),
+                  gCellGlobalIDs=nx.array(mesh.gCellGlobalIDs, dtype=nx.INT_DTYPE),
+                  orderedCellVertexIDs=mesh._orderedCellVertexIDs_data,
+                  physicalCellMap=nx.asarray(maps[0]),
+                  geometricalCellMap=nx.asarray(maps[1]),
+                  physicalFaceMap=nx.asarray(maps[2]),
+                  geometricalFaceMap=nx.asarray(maps[3]))
+
+    _writeMeshCache(path, arrays=arrays, info=dict(physicalNames=physicalNames))
+
 class _ElementData(object):
     """
     Bookkeeping for cells. Declared as own class for generality.
 
     :Properties:
-    - `nodes`: A Python list of the vertices that make up this element
-    - `shapes`: A `shapeTypes` Python list
-    - `idmap`: A Python list which maps `vertexCoords` index to global ID
-    - `physicalEntities`: A Python list of the Gmsh physical entities each element is in
-    - `geometricalEntities`: A Python list of the Gmsh geometrical entities each element is in
+    - `nodes`: An array of the vertices that make up each element, padded with -1
+    - `numNodes`: An array of the number of vertices of each element
+    - `shapes`: An array of the `shapeType` of each element
+    - `idmap`: An array which maps `vertexCoords` index to global ID
+    - `physicalEntities`: An array of the Gmsh physical entity each element is in
+    - `geometricalEntities`: An array of the Gmsh geometrical entity each element is in
+    - `partitions`: An array of the partitions each element is in, padded with 0
     """
-    def __init__(self):
-        self.nodes = []
-        self.shapes = []
-        self.idmap = [] # vertexCoords idx -> gmsh ID (global ID)
-        self.physicalEntities = []
-        self.geometricalEntities = []
-
-    def add(self, currLine, elType, physicalEntity, geometricalEntity):
-        numTags = currLine[2]
-        self.nodes.append(currLine[(numTags+3):])
-        self.shapes.append(elType)
-        self.idmap.append(currLine[0])
-        self.physicalEntities.append(physicalEntity)
-        self.geometricalEntities.append(geometricalEntity)
+    def __init__(self, nodes, numNodes, shapes, idmap,
+                 physicalEntities, geometricalEntities, partitions):
+        self.nodes = nodes
+        self.numNodes = numNodes
+        self.shapes = shapes
+        self.idmap = idmap # vertexCoords idx -> gmsh ID (global ID)
+        self.physicalEntities = physicalEntities
+        self.geometricalEntities = geometricalEntities
+        self.partitions = partitions
+
+    def __len__(self):
+        return len(self.shapes)
+
+    @classmethod
+    def _fromBlocks(cls, blocks, count):
+        """Assemble the elements of `blocks` of the same type and number of tags
+
+        Each block is `(rows, ids, elementType, tags, nodes)`, where `rows`
+        are the positions of its elements among all `count` elements.
+
+        >>> elements = _ElementData._fromBlocks([
+        ...     (nx.array([0, 2]), nx.array([1, 3]), 1,
+        ...      nx.array([[4, 5], [4, 6]]), nx.array([[1, 2], [3, 4]])),
+        ...     (nx.array([1]), nx.array([2]), 2,
+        ...      nx.array([[7, 8, 2, 1, -2]]), nx.array([[1, 2, 3]]))], 3)
+        >>> print(elements.nodes)
+        [[ 1  2 -1]
+         [ 1  2  3]
+         [ 3  4 -1]]
+        >>> print(elements.shapes, elements.physicalEntities, elements.partitions)
+        [1 2 1] [4 7 4] [[ 0  0]
+         [ 1 -2]
+         [ 0  0]]
+        """
+        maxNodes = max([0] + [block[4].shape[1] for block in blocks])
+        maxPartitions = max([0] + [block[3].shape[1] - 3 for block in blocks])
+
+        elements = cls(nodes=-nx.ones((count, maxNodes), dtype=nx.INT_DTYPE),
+                       numNodes=nx.zeros((count,), dtype=nx.INT_DTYPE),
+                       shapes=nx.zeros((count,), dtype=nx.INT_DTYPE),
+                       idmap=nx.zeros((count,), dtype=nx.INT_DTYPE),
+                       physicalEntities=-nx.ones((count,), dtype=nx.INT_DTYPE),
+                       geometricalEntities=-nx.ones((count,), dtype=nx.INT_DTYPE),
+                       partitions=nx.zeros((count, maxPartitions), dtype=nx.INT_DTYPE))
+
+        for rows, ids, elementType, tags, nodes in blocks:
+            numTags = tags.shape[1]
+            elements.nodes[rows, :nodes.shape[1]] = nodes
+            elements.numNodes[rows] = nodes.shape[1]
+            elements.shapes[rows] = elementType
+            elements.idmap[rows] = ids
+
+            # the partition tags for don't seem to always be present
+            # and don't always make much sense when they are
+            if numTags >= 2:
+                elements.physicalEntities[rows] = tags[..., 0]
+                elements.geometricalEntities[rows] = tags[..., 1]
+
+            if numTags > 2:
+                # next item is a count
+                counts = tags[..., 2]
+                if (counts != numTags - 3).any():
+                    warnings.warn("Partition count %d does not agree with number of remaining tags %d."
+                                  % (counts[counts != numTags - 3][0], numTags - 3),
+                                  SyntaxWarning, stacklevel=4)
+                elements.partitions[rows, :numTags - 3] = tags[..., 3:]
+
+        return elements
+
+    def _take(self, which, offset=0):
+        """The elements selected by `which`, with `offset` subtracted from their IDs
+        """
+        numNodes = self.numNodes[which]
+        width = max([0] + numNodes.tolist())
+        return _ElementData(nodes=self.nodes[which, :width],
+                            numNodes=numNodes,
+                            shapes=self.shapes[which],
+                            idmap=self.idmap[which] - offset,
+                            physicalEntities=self.physicalEntities[which],
+                            geometricalEntities=self.geometricalEntities[which],
+                            partitions=self.partitions[which])
 
 class _GmshTopology(_MeshTopology):
 
@@ -1604,6 +2152,22 @@ class Gmsh2D(Mesh2D):
     >>> print(std1 > std2) # doctest: +GMSH
     True
 
+    A mesh can be cached, so that making it again from the same file or
+    script skips Gmsh and loads its arrays from disk
+
+    >>> import shutil
+    >>> import tempfile
+    >>> cache = tempfile.mkdtemp()
+    >>> square = Gmsh2D(geo, cache=cache) # doctest: +GMSH
+    >>> cached = Gmsh2D(geo, cache=cache) # doctest: +GMSH
+    >>> print(len(os.listdir(cache))) # doctest: +GMSH, +SERIAL
+    1
+    >>> print(numerix.allclose(square.cellVolumes, cached.cellVolumes)) # doctest: +GMSH
+    True
+    >>> print(numerix.allequal(square.cellFaceIDs, cached.cellFaceIDs)) # doctest: +GMSH
+    True
+    >>> shutil.rmtree(cache)
+
     Parameters
     ----------
     arg : str
@@ -1619,6 +2183,13 @@ class Gmsh2D(Mesh2D):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to cache the mesh, so that making it again
+        from the same file or script only loads its arrays from disk.
+        Defaults to the value of :envvar:`FIPY_MESH_CACHE`, if set.
+        Meshes are not cached in parallel, with a `background`, or when
+        the `.geo` file or script reads other files with `Include` or
+        `Merge`.
     """
 
     def __init__(self,
@@ -1626,28 +2197,54 @@ class Gmsh2D(Mesh2D):
                  coordDimensions=2,
                  communicator=parallelComm,
                  overlap=1,
-                 background=None):
+                 background=None,
+                 cache=None):
 
-        self.mshFile = openMSHFile(arg,
+        cachePath = _gmshCachePath(cache, arg,
+                                   meshClass=self.__class__,
                                    dimensions=2,
                                    coordDimensions=coordDimensions,
                                    communicator=communicator,
-                                   overlap=overlap,
-                                   mode='r',
                                    background=background)
 
-        # openMSHFile may have "downgraded" the communicator
-        # if, e.g., too many overlaps were requested
-        communicator = self.mshFile.communicator
+        if cachePath is not None and os.path.isdir(cachePath):
+            _log.debug("Reading cached mesh %s" % cachePath)
+            (verts,
+             faces,
+             cells,
+             self.cellGlobalIDs,
+             self.gCellGlobalIDs,
+             self._orderedCellVertexIDs_data,
+             maps,
+             physicalNames,
+             derived) = _readGmshCache(cachePath)
+        else:
+            self.mshFile = openMSHFile(arg,
+                                       dimensions=2,
+                                       coordDimensions=coordDimensions,
+                                       communicator=communicator,
+                                       overlap=overlap,
+                                       mode='r',
+                                       background=background)
+
+            # openMSHFile may have "downgraded" the communicator
+            # if, e.g., too many overlaps were requested
+            communicator = self.mshFile.communicator
+
+            (verts,
+             faces,
+             cells,
+             self.cellGlobalIDs,
+             self.gCellGlobalIDs,
+             self._orderedCellVertexIDs_data) = self.mshFile.read()
 
-        (verts,
-         faces,
-         cells,
-         self.cellGlobalIDs,
-         self.gCellGlobalIDs,
-         self._orderedCellVertexIDs_data) = self.mshFile.read()
+            self.mshFile.close()
 
-        self.mshFile.close()
+            maps = self.mshFile._maps
+            physicalNames = self.mshFile.physicalNames
+            derived = None
+
+            del self.mshFile
 
         if communicator.Nproc > 1:
             self.globalNumberOfCells = communicator.sum(len(self.cellGlobalIDs))
@@ -1658,16 +2255,22 @@ class Gmsh2D(Mesh2D):
                               faceVertexIDs=faces,
                               cellFaceIDs=cells,
                               communicator=communicator,
-                              _TopologyClass=_GmshTopology)
+                              _TopologyClass=_GmshTopology,
+                              _derived=derived)
 
         (self.physicalCellMap,
          self.geometricalCellMap,
          self.physicalCells,
          self.physicalFaceMap,
          self.geometricalFaceMap,
-         self.physicalFaces) = self.mshFile.makeMapVariables(mesh=self)
+         self.physicalFaces) = _makeMapVariables(mesh=self,
+                                                 maps=maps,
+                                                 physicalNames=physicalNames,
+                                                 dimensions=2)
 
-        del self.mshFile
+        if cachePath is not None and derived is None:
+            _writeGmshCache(cachePath, mesh=self, maps=maps,
+                            physicalNames=physicalNames)
 
         _log.debug("Exiting Gmsh2D")
 
@@ -1931,14 +2534,22 @@ class Gmsh2DIn3DSpace(Gmsh2D):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to cache the mesh, so that making it again
+        from the same file or script only loads its arrays from disk.
+        Defaults to the value of :envvar:`FIPY_MESH_CACHE`, if set.
+        Meshes are not cached in parallel, with a `background`, or when
+        the `.geo` file or script reads other files with `Include` or
+        `Merge`.
     """
-    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None):
+    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None, cache=None):
         Gmsh2D.__init__(self,
                         arg,
                         coordDimensions=3,
                         communicator=communicator,
                         overlap=overlap,
-                        background=background)
+                        background=background,
+                        cache=cache)
 
     def _test(self):
         """
@@ -2018,33 +2629,66 @@ class Gmsh3D(Mesh):
         of ghost cells.
     background : ~fipy.variables.cellVariable.CellVariable
         Specifies the desired characteristic lengths of the mesh cells
+    cache : str
+        Directory in which to cache the mesh, so that making it again
+        from the same file or script only loads its arrays from disk.
+        Defaults to the value of :envvar:`FIPY_MESH_CACHE`, if set.
+        Meshes are not cached in parallel, with a `background`, or when
+        the `.geo` file or script reads other files with `Include` or
+        `Merge`.
     """
-    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None):
-        self.mshFile  = openMSHFile(arg,
-                                    dimensions=3,
-                                    communicator=communicator,
-                                    overlap=overlap,
-                                    mode='r',
-                                    background=background)
-
-        # openMSHFile may have "downgraded" the communicator
-        # if, e.g., too many overlaps were requested
-        communicator = self.mshFile.communicator
-
-        (verts,
-         faces,
-         cells,
-         self.cellGlobalIDs,
-         self.gCellGlobalIDs,
-         self._orderedCellVertexIDs_data) = self.mshFile.read()
-
-        self.mshFile.close()
+    def __init__(self, arg, communicator=parallelComm, overlap=1, background=None, cache=None):
+        cachePath = _gmshCachePath(cache, arg,
+                                   meshClass=self.__class__,
+                                   dimensions=3,
+                                   coordDimensions=None,
+                                   communicator=communicator,
+                                   background=background)
+
+        if cachePath is not None and os.path.isdir(cachePath):
+            _log.debug("Reading cached mesh %s" % cachePath)
+            (verts,
+             faces,
+             cells,
+             self.cellGlobalIDs,
+             self.gCellGlobalIDs,
+             self._orderedCellVertexIDs_data,
+             maps,
+             physicalNames,
+             derived) = _readGmshCache(cachePath)
+        else:
+            self.mshFile  = openMSHFile(arg,
+                                        dimensions=3,
+                                        communicator=communicator,
+                                        overlap=overlap,
+                                        mode='r',
+                                        background=background)
+
+            # openMSHFile may have "downgraded" the communicator
+            # if, e.g., too many overlaps were requested
+            communicator = self.mshFile.communicator
+
+            (verts,
+             faces,
+             cells,
+             self.cellGlobalIDs,
+             self.gCellGlobalIDs,
+             self._orderedCellVertexIDs_data) = self.mshFile.read()
+
+            self.mshFile.close()
+
+            maps = self.mshFile._maps
+            physicalNames = self.mshFile.physicalNames
+            derived = None
+
+            del self.mshFile
 
         Mesh.__init__(self, vertexCoords=verts,
                             faceVertexIDs=faces,
                             cellFaceIDs=cells,
                             communicator=communicator,
-                            _TopologyClass=_GmshTopology)
+                            _TopologyClass=_GmshTopology,
+                            _derived=derived)
 
         if self.communicator.Nproc > 1:
             self.globalNumberOfCells = self.communicator.sum(len(self.cellGlobalIDs))
@@ -2054,9 +2698,14 @@ class Gmsh3D(Mesh):
          self.physicalCells,
          self.physicalFaceMap,
          self.geometricalFaceMap,
-         self.physicalFaces) = self.mshFile.makeMapVariables(mesh=self)
-
-        del self.mshFile
+         self.physicalFaces) = _makeMapVariables(mesh=self,
+                                                 maps=maps,
+                                                 physicalNames=physicalNames,
+                                                 dimensions=3)
+
+        if cachePath is not None and derived is None:
+            _writeGmshCache(cachePath, mesh=self, maps=maps,
+                            physicalNames=physicalNames)
 
     def __setstate__(self, state):
         super(Gmsh3D, self).__setstate__(state)
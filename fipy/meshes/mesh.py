@@ -3,6 +3,8 @@ from __future__ import unicode_literals
 from builtins import range
 __docformat__ = 'restructuredtext'
 
+import os
+
 from fipy.meshes.abstractMesh import AbstractMesh
 from fipy.meshes.representations.meshRepresentation import _MeshRepresentation
 from fipy.meshes.topologies.meshTopology import _MeshTopology
@@ -27,7 +29,7 @@ class Mesh(AbstractMesh):
         This is built for a non-mixed element mesh.
     """
 
-    def __init__(self, vertexCoords, faceVertexIDs, cellFaceIDs, communicator=serialComm, _RepresentationClass=_MeshRepresentation, _TopologyClass=_MeshTopology):
+    def __init__(self, vertexCoords, faceVertexIDs, cellFaceIDs, communicator=serialComm, _RepresentationClass=_MeshRepresentation, _TopologyClass=_MeshTopology, _derived=None):
         super(Mesh, self).__init__(communicator=communicator,
                                    _RepresentationClass=_RepresentationClass,
                                    _TopologyClass=_TopologyClass)
@@ -49,16 +51,180 @@ class Mesh(AbstractMesh):
         if not hasattr(self, "globalNumberOfFaces"):
             self.globalNumberOfFaces = self.numberOfFaces
 
-        self.faceCellIDs = self._calcFaceCellIDs()
+        if _derived is None:
+            self.faceCellIDs = self._calcFaceCellIDs()
+
+            self._setTopology()
+            self._setGeometry(scaleLength = 1.)
+        else:
+            self._setDerived(_derived)
+
+    """
+    Derived arrays, which can be stored to skip calculating them
+    """
+
+    _derivedNames = ("faceCellIDs",
+                     "_cellToFaceOrientations",
+                     "_adjacentCellIDs",
+                     "_cellToCellIDs",
+                     "_cellToCellIDsFilled",
+                     "_faceCenters",
+                     "_faceAreas",
+                     "_cellCenters",
+                     "_internalFaceToCellDistances",
+                     "_cellToFaceDistanceVectors",
+                     "_internalCellDistances",
+                     "_cellDistanceVectors",
+                     "faceNormals",
+                     "_orientedFaceNormals",
+                     "_cellVolumes",
+                     "_faceCellToCellNormals",
+                     "_faceTangents1",
+                     "_faceTangents2",
+                     "_cellToCellDistances",
+                     "_cellAreas",
+                     "_cellNormals")
+
+    @property
+    def _derived(self):
+        """The topology and geometry calculated from the vertices, faces,
+        and cells, to be passed back to `__init__`
+
+        >>> from fipy.meshes.mesh2D import Mesh2D
+        >>> from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
+        >>> mesh = NonUniformGrid2D(dx=(1., 2., 3.), dy=(1., 2.))
+        >>> restored = Mesh2D(vertexCoords=mesh.vertexCoords,
+        ...                 faceVertexIDs=mesh.faceVertexIDs,
+        ...                 cellFaceIDs=mesh.cellFaceIDs,
+        ...                 _derived=mesh._derived)
+        >>> print(numerix.allclose(restored.cellVolumes, mesh.cellVolumes))
+        True
+        >>> print(numerix.allequal(restored.cellFaceIDs, mesh.cellFaceIDs))
+        True
+        >>> print(numerix.allequal(restored.exteriorFaces, mesh.exteriorFaces))
+        True
+        >>> print(numerix.allclose(restored._cellDistances, mesh._cellDistances))
+        True
+        >>> print(numerix.allclose(restored.faceNormals, mesh.faceNormals))
+        True
+        """
+        return dict((name, getattr(self, name)) for name in self._derivedNames)
+
+    def _setDerived(self, derived):
+        for name in self._derivedNames:
+            setattr(self, name, derived[name])
+
+        self.topology._setCellFaceArrays()
+        (self._interiorFaces,
+         self._exteriorFaces) = self._calcInteriorAndExteriorFaceIDs()
+        (self._interiorCellIDs,
+         self._exteriorCellIDs) = self._calcInteriorAndExteriorCellIDs()
+        self._setIndexDtype()
+
+        self._setScaledGeometry(self.scale['length'])
+
+    """
+    Storage types
+    """
+
+    ## narrower types to store connectivity and cached geometry in, or
+    ## `None` for the defaults; see `setDtypes`
+    _indexDtype = os.environ.get("FIPY_MESH_INDEX_DTYPE")
+    _geometryDtype = os.environ.get("FIPY_MESH_GEOMETRY_DTYPE")
+
+    def setDtypes(self, index=None, geometry=None):
+        """Store connectivity and cached geometry in narrower types
 
-        self._setTopology()
-        self._setGeometry(scaleLength = 1.)
+        Gathering and scattering by cell and face IDs, and the geometry
+        coefficients of the terms, are limited by memory bandwidth on
+        large meshes.  Storing them in 32 bits halves the memory they
+        take and move.  The defaults for all meshes are taken from
+        :envvar:`FIPY_MESH_INDEX_DTYPE` and
+        :envvar:`FIPY_MESH_GEOMETRY_DTYPE`.
+
+        Parameters
+        ----------
+        index : str or dtype, optional
+            Type of `cellFaceIDs`, `faceVertexIDs`, `faceCellIDs`, and
+            the other cell and face IDs derived from them.  Ignored if the
+            mesh has more cells, faces, or vertices than it can count.
+            Defaults to 64 bit integers.
+        geometry : str or dtype, optional
+            Type of the cell distances, the face to cell distance
+            ratios, and the face area projections.  Narrowing
+            them loses precision that widening them again doesn't
+            restore.  Defaults to 64 bit floats.
+
+        >>> from fipy.meshes.nonUniformGrid2D import NonUniformGrid2D
+        >>> mesh = NonUniformGrid2D(nx=3, ny=2)
+        >>> mesh.setDtypes(index="int32", geometry="float32")
+        >>> print(mesh.cellFaceIDs.dtype, mesh.faceCellIDs.dtype, mesh._adjacentCellIDs[0].dtype)
+        int32 int32 int32
+        >>> print(mesh._cellDistances.dtype, mesh._faceToCellDistanceRatio.dtype)
+        float32 float32
+        >>> print(mesh._orientedAreaProjections.dtype)
+        float32
+
+        Solutions don't change beyond the precision of the geometry
+
+        >>> from fipy import CellVariable, DiffusionTerm
+        >>> var = CellVariable(mesh=mesh)
+        >>> var.constrain(0., where=mesh.facesLeft)
+        >>> var.constrain(1., where=mesh.facesRight)
+        >>> DiffusionTerm().solve(var=var)
+        >>> print(numerix.allclose(var, mesh.cellCenters[0] / 3., atol=1e-6))
+        True
+
+        >>> mesh.setDtypes()
+        >>> print(mesh.cellFaceIDs.dtype == numerix.INT_DTYPE)
+        True
+        >>> print(mesh._cellDistances.dtype)
+        float64
+        """
+        self._indexDtype = index
+        self._geometryDtype = geometry
+        self._setIndexDtype()
+        self._setScaledValues()
+
+    def _setIndexDtype(self):
+        dtype = numerix.dtype(self._indexDtype or numerix.INT_DTYPE)
+        count = max(self.vertexCoords.shape[-1],
+                    self.globalNumberOfFaces, self.numberOfFaces,
+                    self.globalNumberOfCells, self.numberOfCells)
+        if count > numerix.iinfo(dtype).max:
+            dtype = numerix.dtype(numerix.INT_DTYPE)
+
+        def astype(IDs):
+            if isinstance(IDs, tuple):
+                return tuple(astype(a) for a in IDs)
+            return IDs.astype(dtype, copy=False)
+
+        self.faceVertexIDs = astype(self.faceVertexIDs)
+        self.cellFaceIDs = astype(self.cellFaceIDs)
+        self.faceCellIDs = astype(self.faceCellIDs)
+        self._interiorCellIDs = astype(self._interiorCellIDs)
+        self._exteriorCellIDs = astype(self._exteriorCellIDs)
+        self._adjacentCellIDs = astype(self._adjacentCellIDs)
+        self._cellToCellIDs = astype(self._cellToCellIDs)
+        self._cellToCellIDsFilled = astype(self._cellToCellIDsFilled)
+        for name in ("_paddedCellFaceIDs", "_paddedFaceCellIDs",
+                     "_cellFaceIndices", "_cellFaceCellIDs"):
+            setattr(self.topology, name, astype(getattr(self.topology, name)))
+
+    def _setGeometryDtype(self, names):
+        dtype = numerix.dtype(self._geometryDtype or float)
+        for name in names:
+            value = getattr(self, name)
+            # geometry with units is left alone
+            if isinstance(value, numerix.ndarray):
+                setattr(self, name, value.astype(dtype, copy=False))
 
     """
     Topology set and calculate
     """
 
     def _setTopology(self):
+        self.topology._setCellFaceArrays()
         (self._interiorFaces,
          self._exteriorFaces) = self._calcInteriorAndExteriorFaceIDs()
         (self._interiorCellIDs,
@@ -67,6 +233,7 @@ class Mesh(AbstractMesh):
         self._adjacentCellIDs = self._calcAdjacentCellIDs()
         self._cellToCellIDs = self._calcCellToCellIDs()
         self._cellToCellIDsFilled = self._calcCellToCellIDsFilled()
+        self._setIndexDtype()
 
     def _calcInteriorAndExteriorFaceIDs(self):
         from fipy.variables.faceVariable import FaceVariable
@@ -78,36 +245,35 @@ class Mesh(AbstractMesh):
         return interiorFaces, exteriorFaces
 
     def _calcInteriorAndExteriorCellIDs(self):
-        try:
-            import sys
-            if sys.version_info < (2, 6):
-                from sets import Set as set
-            exteriorCellIDs = set(self.faceCellIDs[0, self._exteriorFaces.value])
-            interiorCellIDs = list(set(range(self.numberOfCells)) - self._exteriorCellIDs)
-            exteriorCellIDs = list(self._exteriorCellIDs)
-        except:
-            exteriorCellIDs = self.faceCellIDs[0, self._exteriorFaces.value]
-            tmp = numerix.zeros(self.numberOfCells, 'l')
-            numerix.put(tmp, exteriorCellIDs, numerix.ones(len(exteriorCellIDs), 'l'))
-            exteriorCellIDs = numerix.nonzero(tmp)
-            interiorCellIDs = numerix.nonzero(numerix.logical_not(tmp))
-        return interiorCellIDs, exteriorCellIDs
+        exterior = numerix.zeros(self.numberOfCells, dtype=bool)
+        faceCellIDs = self.topology._paddedFaceCellIDs
+        exterior[faceCellIDs[0, numerix.asarray(self._exteriorFaces.value, dtype=bool)]] = True
+        return numerix.nonzero(numerix.logical_not(exterior)), numerix.nonzero(exterior)
+
+    ## The topology is derived from plain arrays, padded with -1, and only
+    ## masked at the end.  Masked array arithmetic is several times slower
+    ## and allocates a mask alongside every intermediate.
 
     def _calcCellToFaceOrientations(self):
-        tmp = numerix.take(self.faceCellIDs[0], self.cellFaceIDs)
-        return (tmp == MA.indices(tmp.shape)[-1]) * 2 - 1
+        cellFaceIDs = self.topology._paddedCellFaceIDs
+        tmp = self.topology._paddedFaceCellIDs[0, cellFaceIDs]
+        tmp = (tmp == numerix.arange(self.numberOfCells)) * 2 - 1
+        return MA.array(tmp, mask=MA.getmask(self.cellFaceIDs))
 
     def _calcAdjacentCellIDs(self):
-        return (MA.filled(self.faceCellIDs[0]),
-                          MA.filled(MA.where(MA.getmaskarray(self.faceCellIDs[1]),
-                              self.faceCellIDs[0],
-                                             self.faceCellIDs[1])))
+        faceCellIDs = self.topology._paddedFaceCellIDs
+        return (faceCellIDs[0],
+                numerix.where(faceCellIDs[1] == -1, faceCellIDs[0], faceCellIDs[1]))
 
     def _calcCellToCellIDs(self):
-        cellToCellIDs = numerix.take(self.faceCellIDs, self.cellFaceIDs, axis=1)
-        cellToCellIDs = MA.where(self._cellToFaceOrientations == 1,
-                                 cellToCellIDs[1], cellToCellIDs[0])
-        return cellToCellIDs
+        cellFaceIDs = self.topology._paddedCellFaceIDs
+        cellToCellIDs = self.topology._paddedFaceCellIDs[:, cellFaceIDs]
+        cellToCellIDs = numerix.where(MA.filled(self._cellToFaceOrientations, 0) == 1,
+                                      cellToCellIDs[1], cellToCellIDs[0])
+        mask = (cellFaceIDs == -1) | (cellToCellIDs == -1)
+        if not mask.any():
+            mask = MA.nomask
+        return MA.array(cellToCellIDs, mask=mask)
 
     def _calcCellToCellIDsFilled(self):
         N = self.numberOfCells
@@ -143,41 +309,36 @@ class Mesh(AbstractMesh):
 
     def _calcFaceAreas(self):
         faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
-        substitute = numerix.repeat(faceVertexIDs[numerix.newaxis, 0],
-                                    faceVertexIDs.shape[0], axis=0)
-        faceVertexIDs = numerix.where(MA.getmaskarray(self.faceVertexIDs),
-                                      substitute, faceVertexIDs)
-        faceVertexCoords = numerix.take(self.vertexCoords, faceVertexIDs, axis=1)
-        faceOrigins = numerix.repeat(faceVertexCoords[:, 0], faceVertexIDs.shape[0], axis=0)
-        faceOrigins = numerix.reshape(faceOrigins, MA.shape(faceVertexCoords))
-        faceVertexCoords = faceVertexCoords - faceOrigins
-        left = list(range(faceVertexIDs.shape[0]))
-        right = left[1:] + [left[0]]
-        cross = numerix.sum(numerix.cross(faceVertexCoords,
-                                          numerix.take(faceVertexCoords, right, 1),
-                                          axis=0),
-                            1)
+        faceVertexIDs = numerix.where(faceVertexIDs == -1,
+                                      faceVertexIDs[0], faceVertexIDs)
+        faceOrigins = numerix.take(self.vertexCoords, faceVertexIDs[0], axis=1)
+
+        ## accumulate one vertex of every face at a time, rather than
+        ## taking the coordinates of all of them at once
+        N = faceVertexIDs.shape[0]
+        right = numerix.take(self.vertexCoords, faceVertexIDs[0], axis=1) - faceOrigins
+        cross = 0.
+        for vertex in range(N):
+            left = right
+            right = (numerix.take(self.vertexCoords, faceVertexIDs[(vertex + 1) % N], axis=1)
+                     - faceOrigins)
+            cross = cross + numerix.cross(left, right, axis=0)
         return numerix.sqrtDot(cross, cross) / 2.
 
     def _calcFaceCenters(self):
-        maskedFaceVertexIDs = MA.filled(self.faceVertexIDs, 0)
-
-        faceVertexCoords = numerix.take(self.vertexCoords, maskedFaceVertexIDs, axis=1)
-
-        if MA.getmask(self.faceVertexIDs) is False:
-            faceVertexCoordsMask = numerix.zeros(numerix.shape(faceVertexCoords), 'l')
-        else:
-            faceVertexCoordsMask = \
-              numerix.repeat(MA.getmaskarray(self.faceVertexIDs)[numerix.newaxis, ...],
-                             self.dim, axis=0)
+        faceVertexIDs = MA.filled(self.faceVertexIDs, -1)
 
-        faceVertexCoords = MA.array(data=faceVertexCoords, mask=faceVertexCoordsMask)
+        faceVertexSums = 0.
+        for IDs in faceVertexIDs:
+            faceVertexSums = faceVertexSums + numerix.where(IDs == -1, 0.,
+                                                            numerix.take(self.vertexCoords,
+                                                                         IDs, axis=1))
 
-        return MA.filled(MA.average(faceVertexCoords, axis=1))
+        return faceVertexSums / (faceVertexIDs != -1).sum(axis=0)
 
     @property
     def _rightHandOrientation(self):
-        faceVertexIDs = MA.filled(self.faceVertexIDs, 0)
+        faceVertexIDs = MA.filled(self.faceVertexIDs[:3], 0)
         faceVertexCoords = numerix.take(self.vertexCoords, faceVertexIDs, axis=1)
         t1 = faceVertexCoords[:, 1,:] - faceVertexCoords[:, 0,:]
         t2 = faceVertexCoords[:, 2,:] - faceVertexCoords[:, 1,:]
@@ -191,7 +352,7 @@ class Mesh(AbstractMesh):
         return 1 - 2 * (numerix.dot(faceNormals, self.cellDistanceVectors) < 0)
 
     def _calcFaceNormals(self):
-        faceVertexIDs = MA.filled(self.faceVertexIDs, 0)
+        faceVertexIDs = MA.filled(self.faceVertexIDs[:3], 0)
         faceVertexCoords = numerix.take(self.vertexCoords, faceVertexIDs, axis=1)
         t1 = faceVertexCoords[:, 1,:] - faceVertexCoords[:, 0,:]
         t2 = faceVertexCoords[:, 2,:] - faceVertexCoords[:, 1,:]
@@ -206,46 +367,66 @@ class Mesh(AbstractMesh):
         return faceNormals * orientation
 
     def _calcFaceCellToCellNormals(self):
-        faceCellCentersUp = numerix.take(self._cellCenters, self.faceCellIDs[1], axis=1)
-        faceCellCentersDown = numerix.take(self._cellCenters, self.faceCellIDs[0], axis=1)
-        faceCellCentersUp = numerix.where(MA.getmaskarray(faceCellCentersUp),
+        faceCellIDs = self.topology._paddedFaceCellIDs
+        faceCellCentersUp = numerix.take(self._cellCenters, faceCellIDs[1], axis=1)
+        faceCellCentersDown = numerix.take(self._cellCenters, faceCellIDs[0], axis=1)
+        faceCellCentersUp = numerix.where(faceCellIDs[1] == -1,
                                           self._faceCenters,
                                           faceCellCentersUp)
 
         diff = faceCellCentersDown - faceCellCentersUp
         mag = numerix.sqrt(numerix.sum(diff**2))
-        faceCellToCellNormals = diff / numerix.resize(mag, (self.dim, len(mag)))
+        degenerate = (mag == 0)
+        faceCellToCellNormals = diff / numerix.where(degenerate, 1., mag)
 
         orientation = 1 - 2 * (numerix.dot(self.faceNormals, faceCellToCellNormals) < 0)
-        return faceCellToCellNormals * orientation
+        faceCellToCellNormals = faceCellToCellNormals * orientation
+
+        if degenerate.any():
+            # e.g., the face that joins the only cell of a periodic grid
+            # to itself has no direction
+            faceCellToCellNormals = MA.array(faceCellToCellNormals,
+                                             mask=numerix.resize(degenerate, faceCellToCellNormals.shape))
+
+        return faceCellToCellNormals
 
     def _calcOrientedFaceNormals(self):
         return self.faceNormals
 
     def _calcCellVolumes(self):
+        faceIDs = self.topology._cellFaceIndices
+        cellIDs = self.topology._cellFaceCellIDs
+        orientations = (self.topology._paddedFaceCellIDs[0, faceIDs] == cellIDs) * 2 - 1
         tmp = self._faceCenters[0] * self._faceAreas * self.faceNormals[0]
-        tmp = numerix.take(tmp, self.cellFaceIDs) * self._cellToFaceOrientations
-        return MA.filled(MA.sum(tmp, 0))
+        return self.topology._sumCellFaces(tmp[faceIDs] * orientations)
 
     def _calcCellCenters(self):
-        tmp = numerix.take(self._faceCenters, self.cellFaceIDs, axis=1)
-        return MA.filled(MA.average(tmp, 1))
+        tmp = numerix.take(self._faceCenters, self.topology._cellFaceIndices, axis=1)
+        return (self.topology._sumCellFaces(tmp)
+                / numerix.diff(self.topology._cellFaceOffsets))
 
     def _calcFaceToCellDistAndVec(self):
-        tmp = MA.repeat(self._faceCenters[..., numerix.NewAxis,:], 2, 1)
-        # array -= masked_array screws up masking for on numpy 1.1
+        faceCellIDs = self.topology._paddedFaceCellIDs
+        mask = (faceCellIDs == -1)
+
+        tmp = (self._faceCenters[..., numerix.newaxis, :]
+               - numerix.take(self._cellCenters, faceCellIDs, axis=1))
+        faceToCellDistances = numerix.sqrt(numerix.sum(tmp * tmp, 0))
 
-        tmp = tmp - numerix.take(self._cellCenters, self.faceCellIDs, axis=1)
-        cellToFaceDistanceVectors = tmp
-        faceToCellDistances = MA.sqrt(MA.sum(tmp * tmp, 0))
+        cellToFaceDistanceVectors = MA.array(tmp,
+                                             mask=numerix.repeat(mask[numerix.newaxis],
+                                                                 self.dim, axis=0))
+        faceToCellDistances = MA.array(faceToCellDistances, mask=mask)
         return faceToCellDistances, cellToFaceDistanceVectors
 
     def _calcCellDistAndVec(self):
-        tmp = numerix.take(self._cellCenters, self.faceCellIDs, axis=1)
-        tmp = tmp[..., 1,:] - tmp[..., 0,:]
-        tmp = MA.filled(MA.where(MA.getmaskarray(tmp), self._cellToFaceDistanceVectors[:, 0], tmp))
+        faceCellIDs = self.topology._paddedFaceCellIDs
+        tmp = numerix.take(self._cellCenters, faceCellIDs, axis=1)
+        tmp = numerix.where(faceCellIDs[1] == -1,
+                            MA.getdata(self._cellToFaceDistanceVectors[:, 0]),
+                            tmp[..., 1, :] - tmp[..., 0, :])
         cellDistanceVectors = tmp
-        cellDistances = MA.filled(MA.sqrt(MA.sum(tmp * tmp, 0)))
+        cellDistances = numerix.sqrt(numerix.sum(tmp * tmp, 0))
         return cellDistances, cellDistanceVectors
 
     def _calcFaceTangents(self):
@@ -327,6 +508,7 @@ class Mesh(AbstractMesh):
         self._setScaledValues()
 
     def _setScaledValues(self):
+        self._setGeometryDtype(["_internalCellDistances"])
         self._scaledFaceAreas = self._scale['area'] * self._faceAreas
         self._scaledCellVolumes = self._scale['volume'] * self._cellVolumes
         self._scaledCellCenters = self._scale['length'] * self._cellCenters
@@ -337,9 +519,12 @@ class Mesh(AbstractMesh):
     def _setFaceDependentScaledValues(self):
         self._scaledCellToCellDistances = self._scale['length'] * self._cellToCellDistances
         self._areaProjections = self._calcAreaProjections()
+        self._setGeometryDtype(["_areaProjections"])
         self._orientedAreaProjections = self._calcOrientedAreaProjections()
         self._faceToCellDistanceRatio = self._calcFaceToCellDistanceRatio()
         self._faceAspectRatios = self._calcFaceAspectRatios()
+        self._setGeometryDtype(["_orientedAreaProjections",
+                                "_faceToCellDistanceRatio"])
 
     def _calcAreaScale(self):
         return self.scale['length']**2
@@ -427,29 +612,11 @@ class Mesh(AbstractMesh):
     """calculate Topology methods"""
 
     def _calcFaceCellIDs(self):
-        array = MA.array(MA.indices(self.cellFaceIDs.shape, 'l')[1],
-                         mask=MA.getmask(self.cellFaceIDs))
-        faceCellIDs = MA.zeros((2, self.numberOfFaces), 'l')
-
-        ## Nasty bug: MA.put(arr, ids, values) fills its ids and
-        ## values arguments when masked!  This was not the behavior
-        ## that was assumed when used below.  It was only working
-        ## because the old fill value was 0 and the first element of
-        ## the array needed to be 0 since the cell's face was
-        ## 0. numerix.put() has been changed to deal with this
-        ## properly.
-
-##         MA.put(firstRow, cellFaceIDsFlat[::-1], array[::-1])
-##         MA.put(secondRow, cellFaceIDsFlat, array)
-        firstRow = faceCellIDs[0]
-        secondRow = faceCellIDs[1]
-
-        numerix.put(firstRow, self.cellFaceIDs[::-1, ::-1], array[::-1, ::-1])
-        numerix.put(secondRow, self.cellFaceIDs, array)
-
-        mask = ((False,) * self.numberOfFaces, (firstRow == secondRow))
-        return MA.sort(MA.array(faceCellIDs, mask = mask),
-                                   axis=0)
+        faceCellIDs = self.topology._calcPaddedFaceCellIDs()
+        mask = (faceCellIDs == -1)
+        # the masked second cell of an exterior face holds its first cell
+        faceCellIDs[1] = numerix.where(mask[1], faceCellIDs[0], faceCellIDs[1])
+        return MA.array(faceCellIDs, mask=mask)
 
     """get Topology methods"""
 
@@ -544,7 +711,29 @@ class Mesh(AbstractMesh):
            [4 5 7 8]
 
         """
-        return numerix.nearest(data=self.cellCenters.globalValue, points=points)
+        return numerix.nearest(data=None, points=points, tree=self._cellCenterTree)
+
+    @property
+    def _cellCenterTree(self):
+        """Spatial index of the (global) cell centers
+
+        Built on first use and kept until the cell centers move.
+
+           >>> from fipy import *
+           >>> m = Grid2D(dx=(.1, 1., 10.), dy=(.1, 1., 10.))
+           >>> m._cellCenterTree is m._cellCenterTree
+           True
+           >>> print(m._getNearestCellID(((0.1, 2., 15.), (0.1, 0.1, 15.))))
+           [0 1 8]
+        """
+        centers = self.cellCenters.globalValue
+        cached = getattr(self, "_nearestCellCenters", None)
+        if (cached is None
+            or cached[0].shape != centers.shape
+            or not numerix.array_equal(cached[0], centers)):
+            self._nearestCellCenters = (centers, numerix._nearestTree(centers))
+
+        return self._nearestCellCenters[1]
 
     def _test(self):
         """
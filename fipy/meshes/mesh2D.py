@@ -36,9 +36,9 @@ from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
 class Mesh2D(Mesh):
-    def __init__(self, vertexCoords, faceVertexIDs, cellFaceIDs, communicator=serialComm, _RepresentationClass=_MeshRepresentation, _TopologyClass=_Mesh2DTopology):
+    def __init__(self, vertexCoords, faceVertexIDs, cellFaceIDs, communicator=serialComm, _RepresentationClass=_MeshRepresentation, _TopologyClass=_Mesh2DTopology, _derived=None):
         super(Mesh2D, self).__init__(vertexCoords=vertexCoords, faceVertexIDs=faceVertexIDs, cellFaceIDs=cellFaceIDs, communicator=communicator,
-                                     _RepresentationClass=_RepresentationClass, _TopologyClass=_TopologyClass)
+                                     _RepresentationClass=_RepresentationClass, _TopologyClass=_TopologyClass, _derived=_derived)
 
     def _calcScaleArea(self):
         return self.scale['length']
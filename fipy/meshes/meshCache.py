@@ -0,0 +1,169 @@
+"""On-disk storage of the arrays of a mesh
+
+A cached mesh is a directory holding one raw `.npy` file per array, so
+that each can be opened with `numpy.load(..., mmap_mode=...)` and only the
+parts that are used are ever read from disk, and an `info.json` file with
+any other (small) data needed to reconstruct the mesh.
+"""
+from __future__ import unicode_literals
+__docformat__ = 'restructuredtext'
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+from fipy.tools import numerix
+from fipy.tools.numerix import MA
+
+__all__ = []
+
+# change whenever the layout of a cache entry changes
+_MESH_CACHE_FORMAT = 1
+
+def _meshCacheKey(sources, files=()):
+    """Content hash identifying a cached mesh
+
+    Parameters
+    ----------
+    sources : list of str
+        Everything the mesh depends on, other than files.
+    files : list of str
+        Names of files the mesh depends on the contents of.
+
+    >>> key = _meshCacheKey(["Point(1) = {0, 0, 0};", "Gmsh2D"])
+    >>> key == _meshCacheKey(["Point(1) = {0, 0, 0};", "Gmsh2D"])
+    True
+    >>> key == _meshCacheKey(["Point(1) = {0, 0, 0};", "Gmsh3D"])
+    False
+    """
+    from fipy import __version__
+
+    digest = hashlib.sha256()
+    for source in [str(_MESH_CACHE_FORMAT), __version__] + list(sources):
+        digest.update(source.encode('utf-8'))
+        # separate the sources so their boundaries matter
+        digest.update(b"\0")
+    for fname in files:
+        with open(fname, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        digest.update(b"\0")
+
+    return digest.hexdigest()
+
+def _writeMeshCache(path, arrays, info):
+    """Store `arrays` and `info` in the directory `path`
+
+    The entry is assembled in a temporary directory next to `path` and
+    then renamed, so a partially written entry is never read.  If another
+    process stores the same entry first, theirs is kept.
+
+    Parameters
+    ----------
+    path : str
+        Directory of the entry.
+    arrays : dict
+        Arrays to store.  Masks of masked arrays are stored alongside
+        them and tuples of arrays are stored element by element.
+    info : dict
+        JSON serializable data to store.
+    """
+    parent = os.path.dirname(os.path.abspath(path))
+    if not os.path.isdir(parent):
+        os.makedirs(parent)
+
+    tmp = tempfile.mkdtemp(dir=parent, prefix=".tmp")
+    try:
+        info = dict(info)
+        info["tuples"] = {}
+        for name, value in arrays.items():
+            if isinstance(value, tuple):
+                info["tuples"][name] = len(value)
+                values = [("%s.%d" % (name, i), v) for i, v in enumerate(value)]
+            else:
+                values = [(name, value)]
+            for name, value in values:
+                numerix.save(os.path.join(tmp, name + ".npy"), MA.getdata(value))
+                if MA.getmask(value) is not MA.nomask:
+                    numerix.save(os.path.join(tmp, name + ".mask.npy"),
+                                 MA.getmaskarray(value))
+
+        with open(os.path.join(tmp, "info.json"), 'w') as f:
+            json.dump(info, f)
+
+        os.rename(tmp, path)
+    except OSError:
+        if not os.path.isdir(path):
+            raise
+    finally:
+        if os.path.isdir(tmp):
+            shutil.rmtree(tmp)
+
+def _readMeshCache(path):
+    """Open the arrays and info stored by `_writeMeshCache`
+
+    The arrays are memory mapped copy-on-write, so they are read lazily,
+    can be modified, and never change the entry.  They are returned as
+    views of type `numpy.ndarray`, rather than `numpy.memmap`, so that
+    they are treated like any other array.
+
+    >>> cache = tempfile.mkdtemp()
+    >>> entry = os.path.join(cache, _meshCacheKey(["test"]))
+    >>> _writeMeshCache(entry,
+    ...                 arrays=dict(ids=MA.masked_values([[0, 1], [2, -1]], -1),
+    ...                             coords=numerix.array([0.5, 1.5]),
+    ...                             pair=(numerix.arange(2), numerix.arange(3))),
+    ...                 info=dict(names={"left": 1}))
+    >>> arrays, info = _readMeshCache(entry)
+    >>> print(arrays["ids"])
+    [[0 1]
+     [2 --]]
+    >>> print(arrays["coords"], type(arrays["coords"]).__name__)
+    [ 0.5  1.5] ndarray
+    >>> print(isinstance(arrays["coords"].base, numerix.memmap))
+    True
+    >>> print(arrays["pair"])
+    (array([0, 1]), array([0, 1, 2]))
+    >>> print(info["names"])
+    {'left': 1}
+
+    Storing an entry that already exists leaves it alone
+
+    >>> _writeMeshCache(entry, arrays=dict(coords=numerix.zeros(3)), info={})
+    >>> print(_readMeshCache(entry)[0]["coords"])
+    [ 0.5  1.5]
+
+    >>> shutil.rmtree(cache)
+    """
+    with open(os.path.join(path, "info.json"), 'r') as f:
+        info = json.load(f)
+    tuples = info.pop("tuples")
+
+    def load(name):
+        value = numerix.load(os.path.join(path, name + ".npy"), mmap_mode='c')
+        value = value.view(numerix.ndarray)
+        mask = os.path.join(path, name + ".mask.npy")
+        if os.path.exists(mask):
+            mask = numerix.load(mask, mmap_mode='c').view(numerix.ndarray)
+            value = MA.array(value, mask=mask)
+        return value
+
+    arrays = {}
+    for fname in os.listdir(path):
+        if fname.endswith(".npy") and not fname.endswith(".mask.npy"):
+            name = fname[:-len(".npy")]
+            if name.rpartition(".")[0] not in tuples:
+                arrays[name] = load(name)
+    for name, count in tuples.items():
+        arrays[name] = tuple(load("%s.%d" % (name, i)) for i in range(count))
+
+    return arrays, info
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -47,6 +47,13 @@ class PeriodicGrid1D(NonUniformGrid1D):
         ...                        [[1, 2, 2],
         ...                        [0, 1, 0]])) # doctest: +PROCESSOR_0
         True
+
+    The face that joins a single cell to itself has no cell to cell
+    normal
+
+        >>> mesh = PeriodicGrid1D(nx=1)
+        >>> print(mesh._faceCellToCellNormals) # doctest: +SERIAL
+        [[-- 1.0]]
     """
     def __init__(self, dx = 1., nx = None, overlap=2, *args, **kwargs):
 
@@ -16,9 +16,11 @@ def _suite():
         'fipy.meshes.nonUniformGrid3D',
         'fipy.meshes.tri2D',
         'fipy.meshes.gmshMesh',
+        'fipy.meshes.meshCache',
         'fipy.meshes.periodicGrid1D',
         'fipy.meshes.periodicGrid2D',
         'fipy.meshes.periodicGrid3D',
+        'fipy.meshes.batchGrid1D',
         'fipy.meshes.uniformGrid1D',
         'fipy.meshes.uniformGrid2D',
         'fipy.meshes.uniformGrid3D',
@@ -30,7 +32,8 @@ def _suite():
         'fipy.meshes.sphericalNonUniformGrid1D',
         'fipy.meshes.factoryMeshes',
         'fipy.meshes.abstractMesh',
-        'fipy.meshes.representations.gridRepresentation'))
+        'fipy.meshes.representations.gridRepresentation',
+        'fipy.meshes.topologies.abstractTopology'))
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
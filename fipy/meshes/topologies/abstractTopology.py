@@ -326,6 +326,114 @@ class _AbstractTopology(object):
         """
         return numerix._invert_indices(self.mesh.faceVertexIDs)
 
+    def _setCellFaceArrays(self):
+        """Store the cell and face connectivity in the forms the geometry
+        calculations use
+
+        Mixed element meshes have fewer faces for some cells than for
+        others.  Working with -1 sentinels, rather than masked arrays,
+        is several times faster and takes half the memory, so
+        `_paddedCellFaceIDs` and `_paddedFaceCellIDs` hold `cellFaceIDs`
+        and `faceCellIDs` as plain integers, with -1 for absent faces
+        and for the second cell of exterior faces.
+
+        The faces of all cells are also stored one cell after another
+        in `_cellFaceIndices`.  Like the `indptr` of a CSR matrix, the
+        faces of cell `i` are
+        `_cellFaceIndices[_cellFaceOffsets[i]:_cellFaceOffsets[i+1]]`,
+        so cells of mixed element meshes are stored without padding.
+        `_cellFaceCellIDs` holds the cell of each of these entries.
+
+        These arrays must be stored again whenever the `cellFaceIDs` or
+        `faceCellIDs` of the mesh change.  See `_calcPaddedFaceCellIDs`
+        for an example.
+        """
+        self._paddedCellFaceIDs = numerix.MA.filled(self.mesh.cellFaceIDs, -1)
+        self._paddedFaceCellIDs = numerix.MA.filled(self.mesh.faceCellIDs, -1)
+
+        facesPerCell = (self._paddedCellFaceIDs >= 0).sum(axis=0)
+        self._cellFaceOffsets = numerix.zeros((len(facesPerCell) + 1,), dtype=numerix.INT_DTYPE)
+        numerix.cumsum(facesPerCell, out=self._cellFaceOffsets[1:])
+
+        cellFaceIDs = self._paddedCellFaceIDs.swapaxes(0, 1)
+        self._cellFaceIndices = cellFaceIDs[cellFaceIDs >= 0]
+        self._cellFaceCellIDs = numerix.repeat(numerix.arange(len(facesPerCell),
+                                                              dtype=self._cellFaceIndices.dtype),
+                                               facesPerCell)
+
+    def _sumCellFaces(self, values):
+        """Sum `values` over the faces of each cell
+
+        Parameters
+        ----------
+        values : array_like
+            Values for each entry of `_cellFaceIndices`, in the last axis.
+
+        Returns
+        -------
+        ndarray
+            Sums with the same leading axes as `values` and a last axis
+            of length `numberOfCells`.
+        """
+        values = numerix.asarray(values)
+        cellIDs = self._cellFaceCellIDs
+        N = self.mesh.numberOfCells
+        sums = [numerix.bincount(cellIDs, weights=v, minlength=N)
+                for v in values.reshape((-1, values.shape[-1]))]
+        return numerix.reshape(sums, values.shape[:-1] + (N,))
+
+    def _calcPaddedFaceCellIDs(self):
+        """Calculate the cells on either side of each face from `cellFaceIDs`
+
+        The lower numbered cell comes first and the second cell of an
+        exterior face is -1.
+
+        >>> from fipy.meshes.mesh2D import Mesh2D
+        >>> mesh = Mesh2D(vertexCoords=numerix.array(((0., 1., 0., 1.),
+        ...                                           (0., 0., 1., 1.))),
+        ...               faceVertexIDs=numerix.array(((0, 0, 1, 1, 2),
+        ...                                            (1, 2, 2, 3, 3))),
+        ...               cellFaceIDs=numerix.array(((0, 2),
+        ...                                          (2, 3),
+        ...                                          (1, 4),
+        ...                                          (-1, -1))))
+        >>> print(mesh.topology._calcPaddedFaceCellIDs())
+        [[ 0  0  0  1  1]
+         [-1 -1  1 -1 -1]]
+        >>> print(mesh.topology._cellFaceOffsets)
+        [0 3 6]
+        >>> print(mesh.topology._cellFaceIndices)
+        [0 2 1 2 3 4]
+        >>> print(mesh.topology._cellFaceCellIDs)
+        [0 0 0 1 1 1]
+        >>> print(mesh.topology._sumCellFaces(numerix.ones((2, 6))))
+        [[ 3.  3.]
+         [ 3.  3.]]
+        """
+        cellFaceIDs = numerix.MA.filled(self.mesh.cellFaceIDs, -1)
+        cellIDs = numerix.indices(cellFaceIDs.shape, dtype=numerix.INT_DTYPE)[1]
+        present = cellFaceIDs >= 0
+        faceIDs = cellFaceIDs[present]
+        cellIDs = cellIDs[present]
+
+        # the first and the last appearance of each face
+        order = numerix.argsort(faceIDs, kind='stable')
+        faceIDs = faceIDs[order]
+        starts = numerix.ones(faceIDs.shape, dtype=bool)
+        starts[1:] = faceIDs[1:] != faceIDs[:-1]
+        ends = numerix.roll(starts, -1)
+
+        first = numerix.zeros((self.mesh.numberOfFaces,), dtype=numerix.INT_DTYPE)
+        last = numerix.zeros((self.mesh.numberOfFaces,), dtype=numerix.INT_DTYPE)
+        first[faceIDs[starts]] = cellIDs[order[starts]]
+        last[faceIDs[ends]] = cellIDs[order[ends]]
+
+        faceCellIDs = numerix.array((numerix.minimum(first, last),
+                                     numerix.maximum(first, last)))
+        faceCellIDs[1, first == last] = -1
+
+        return faceCellIDs
+
     # abstract element types mutually understood by FiPy and other meshing systems
     # (VTK, Gmsh, etc.)
     _elementTopology = dict([(k, v) for (v, k) in enumerate(("vertex",
@@ -345,3 +453,10 @@ class _AbstractTopology(object):
     def _cellTopology(self):
         """return a map of the topology of each cell of grid"""
         raise NotImplementedError
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -15,6 +15,7 @@ from importlib import import_module
 from fipy.tools.parser import _parseSolver
 
 from fipy.solvers.solver import *
+from fipy.solvers.newtonSolver import *
 
 _desired_solver = _parseSolver()
 
@@ -186,6 +187,11 @@ register_skipper(flag='PYSPARSE_SOLVER',
                  why="the Pysparse solvers are not being used.",
                  skipWarning=True)
 
+register_skipper(flag='PETSC_SOLVER',
+                 test=lambda: solver_suite == 'petsc',
+                 why="the PETSc solvers are not being used.",
+                 skipWarning=True)
+
 register_skipper(flag='NOT_PYAMGX_SOLVER',
                  test=lambda: solver_suite != 'pyamgx',
                  why="the PyAMGX solver is being used.",
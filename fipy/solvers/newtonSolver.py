@@ -0,0 +1,269 @@
+"""Jacobian-free Newton-Krylov solution of nonlinear equations
+"""
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import logging
+
+from scipy.sparse.linalg import LinearOperator, gmres
+
+from fipy.tools import numerix
+
+__all__ = ["NewtonSolver"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class NewtonSolver(object):
+    r"""Solve a nonlinear `Term` with Newton's method
+
+    Rather than repeatedly sweeping the linear system with coefficients
+    evaluated at the previous solution (Picard iteration), Newton's
+    method solves
+
+    .. math::
+
+       \mathsf{J}(\vec{x}_k) \delta\vec{x} = -\vec{r}(\vec{x}_k)
+
+    for each update, where :math:`\vec{r} = \mathsf{L}\vec{x} - \vec{b}` is
+    the residual returned by
+    :meth:`~fipy.terms.term.Term.justResidualVector` and
+    :math:`\mathsf{J}` is its Jacobian.  The Jacobian is never formed;
+    its product with a vector is approximated by a finite difference of
+    residuals and the update is found with GMRES, preconditioned by the
+    linear `solver` applied to the Picard matrix :math:`\mathsf{L}`.  The
+    accuracy of each update is chosen by the Eisenstat-Walker forcing
+    terms and the update is damped by a backtracking line search if it
+    does not reduce the residual.
+
+    A nonlinear diffusion problem
+
+    >>> from fipy import CellVariable, Grid1D, DiffusionTerm, LinearLUSolver
+    >>> mesh = Grid1D(nx=50, dx=1. / 50)
+    >>> def problem():
+    ...     phi = CellVariable(mesh=mesh, value=0.)
+    ...     phi.constrain(0., where=mesh.facesLeft)
+    ...     phi.constrain(4., where=mesh.facesRight)
+    ...     eq = DiffusionTerm(coeff=1. + phi**2) == 0
+    ...     return phi, eq
+
+    >>> phi, eq = problem()
+    >>> newton = NewtonSolver(equation=eq, solver=LinearLUSolver())
+    >>> res = newton.solve(var=phi)
+    >>> print(res < 1e-8 * newton.residuals[0])
+    True
+
+    converges in far fewer updates
+
+    >>> print(len(newton.residuals) - 1)
+    7
+
+    than sweeping does
+
+    >>> psi, eq = problem()
+    >>> for sweep in range(100):
+    ...     res = eq.sweep(var=psi, solver=LinearLUSolver())
+    ...     res = numerix.L2norm(eq.justResidualVector(var=psi, solver=LinearLUSolver()))
+    ...     if res < 1e-8 * newton.residuals[0]:
+    ...         break
+    >>> print(sweep + 1)
+    25
+    >>> print(numerix.allclose(phi, psi))
+    True
+
+    Coupled equations are solved for all of their variables at once
+
+    >>> from fipy import TransientTerm, ImplicitSourceTerm
+    >>> u = CellVariable(mesh=mesh, value=1., hasOld=True)
+    >>> v = CellVariable(mesh=mesh, value=0., hasOld=True)
+    >>> u.constrain(1., where=mesh.facesLeft)
+    >>> eq = ((TransientTerm(var=u) == DiffusionTerm(coeff=1. + v**2, var=u)
+    ...                                - ImplicitSourceTerm(coeff=u * v, var=u))
+    ...       & (TransientTerm(var=v) == DiffusionTerm(coeff=.1, var=v)
+    ...                                  + u**2 - ImplicitSourceTerm(coeff=1., var=v)))
+    >>> newton = NewtonSolver(equation=eq, solver=LinearLUSolver())
+    >>> res = newton.solve(dt=1.)
+    >>> print(res < 1e-8 * newton.residuals[0])
+    True
+    >>> print(numerix.allclose(eq.justResidualVector(dt=1.), 0., atol=1e-8))
+    True
+
+    Updates whose GMRES iterations do not reach the forcing tolerance
+    are counted
+
+    >>> phi, eq = problem()
+    >>> newton = NewtonSolver(equation=eq, solver=LinearLUSolver(),
+    ...                       krylovIterations=1, forcing=1e-6, iterations=3)
+    >>> res = newton.solve(var=phi)
+    >>> print(newton.krylovFailures > 0)
+    True
+    """
+
+    def __init__(self, equation, solver=None, tolerance=1e-8, iterations=20,
+                 krylovIterations=50, forcing=0.9, lineSearch=True):
+        """
+        Parameters
+        ----------
+        equation : ~fipy.terms.term.Term
+            The nonlinear equation to solve.
+        solver : ~fipy.solvers.solver.Solver
+            Linear solver applied to the Picard matrix to precondition
+            each Newton update.  The default solver depends on the
+            solver package selected.
+        tolerance : float
+            Required reduction of the :math:`L^2` norm of the residual.
+        iterations : int
+            Maximum number of Newton updates.
+        krylovIterations : int
+            Maximum number of GMRES iterations for each update.
+        forcing : float
+            The largest relative tolerance for the GMRES solution of an
+            update.  Tighter tolerances are chosen, following
+            Eisenstat and Walker, as the Newton iteration converges.
+        lineSearch : bool
+            Whether to backtrack along updates that do not reduce the
+            residual enough.
+        """
+        self.equation = equation
+        self.solver = solver
+        self.tolerance = tolerance
+        self.iterations = iterations
+        self.krylovIterations = krylovIterations
+        self.forcing = forcing
+        self.lineSearch = lineSearch
+        self.residuals = []
+        self.krylovFailures = 0
+
+        self._log = logging.getLogger(self.__class__.__module__
+                                      + "." + self.__class__.__name__)
+
+    def _residual(self, unknown, var, solver, boundaryConditions, dt, x):
+        unknown.value = x
+        return numerix.array(self.equation.justResidualVector(var=var,
+                                                              solver=solver,
+                                                              boundaryConditions=boundaryConditions,
+                                                              dt=dt), dtype=float).ravel()
+
+    def _preconditioner(self, solver, L):
+        """Approximate inverse of the Jacobian from the Picard matrix `L`
+        """
+        var = solver.var
+        correction = var.copy()
+        N = len(numerix.ravel(numerix.array(var)))
+
+        def matvec(r):
+            correction[:] = 0.
+            solver._storeMatrix(var=correction, matrix=L, RHSvector=numerix.ravel(r))
+            solver._solve()
+            return numerix.array(correction, dtype=float).ravel()
+
+        return LinearOperator((N, N), matvec=matvec, dtype=float)
+
+    def _forcingTerm(self, eta, norm, oldNorm):
+        """Eisenstat-Walker choice 2 of the relative tolerance of an update
+        """
+        gamma, alpha = 0.9, 2.
+        newEta = gamma * (norm / oldNorm)**alpha
+        safeguard = gamma * eta**alpha
+        if safeguard > 0.1:
+            newEta = max(newEta, safeguard)
+        return min(newEta, self.forcing)
+
+    def solve(self, var=None, boundaryConditions=(), dt=None):
+        """Newton iterate `var` to the solution of `equation`
+
+        Parameters
+        ----------
+        var : ~fipy.variables.cellVariable.CellVariable
+            `Variable` to be solved for.  Provides the initial guess,
+            the old value and holds the solution on completion.  Not
+            specified for coupled equations.
+        boundaryConditions : :obj:`tuple` of :obj:`~fipy.boundaryConditions.boundaryCondition.BoundaryCondition`
+        dt : float
+            Timestep size.
+
+        Returns
+        -------
+        float
+            The :math:`L^2` norm of the final residual.  The norm after
+            each update is recorded in `residuals` and the number of
+            updates whose GMRES solution did not reach its tolerance in
+            `krylovFailures`.
+        """
+        solver = self.equation._prepareLinearSystem(var, self.solver,
+                                                    boundaryConditions, dt)
+        self.solver = solver
+        unknown = solver.var
+
+        if unknown.mesh.communicator.Nproc > 1:
+            raise Exception("NewtonSolver cannot be used with multiple processors")
+
+        def residual(x):
+            return self._residual(unknown, var, solver, boundaryConditions, dt, x)
+
+        x = numerix.array(unknown, dtype=float).ravel()
+        N = len(x)
+        r = residual(x)
+        L = solver.matrix
+        norm = numerix.L2norm(r)
+        self.residuals = [norm]
+        self.krylovFailures = 0
+        eta = self.forcing
+        epsilon = numerix.sqrt(numerix.finfo(float).eps)
+
+        for iteration in range(self.iterations):
+            if norm <= self.tolerance * self.residuals[0] or norm == 0:
+                break
+
+            def jacobianProduct(v, x=x, r=r):
+                vnorm = numerix.L2norm(v)
+                if vnorm == 0:
+                    return numerix.zeros_like(r)
+                h = epsilon * (1. + numerix.L2norm(x)) / vnorm
+                return (residual(x + h * v) - r) / h
+
+            # precondition on the right, so GMRES minimizes the
+            # residual of the linearized equation itself
+            M = self._preconditioner(solver, L)
+            JM = LinearOperator((N, N), dtype=float,
+                                matvec=lambda y: jacobianProduct(M.matvec(y)))
+            y, info = gmres(JM, -r, rtol=eta, atol=0.,
+                            restart=self.krylovIterations, maxiter=1)
+            dx = M.matvec(y)
+            if info != 0:
+                # the update is still used, but is less accurate than
+                # the forcing term asked for
+                self.krylovFailures += 1
+
+            step = 1.
+            while True:
+                newR = residual(x + step * dx)
+                newNorm = numerix.L2norm(newR)
+                if (not self.lineSearch
+                    or newNorm <= (1. - 1e-4 * step) * norm
+                    or step < 1. / 64):
+                    break
+                step /= 2.
+
+            x = x + step * dx
+            r = newR
+            L = solver.matrix
+            eta = self._forcingTerm(eta, newNorm, norm)
+            norm = newNorm
+            self.residuals.append(norm)
+
+            self._log.debug("Newton iteration %d: residual %g, step %g, forcing %g, GMRES info %d",
+                            iteration, norm, step, eta, info)
+
+        unknown.value = x
+
+        return norm
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
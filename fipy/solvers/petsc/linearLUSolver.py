@@ -3,7 +3,6 @@ from builtins import range
 from past.utils import old_div
 __docformat__ = 'restructuredtext'
 
-from petsc4py import PETSc
 
 from fipy.solvers.petsc.petscSolver import PETScSolver
 from fipy.tools.timer import Timer
@@ -29,18 +28,22 @@ class LinearLUSolver(PETScSolver):
         PETScSolver.__init__(self, tolerance=tolerance,
                              iterations=iterations, precon="lu")
 
-    def _solve_(self, L, x, b):
-        ksp = PETSc.KSP()
-        ksp.create(PETSc.COMM_WORLD)
+    def _createKSP(self, comm):
+        ksp = PETScSolver._createKSP(self, comm)
         ksp.setType("preonly")
         ksp.getPC().setType(self.preconditioner)
         # TODO: SuperLU invoked with PCFactorSetMatSolverType(pc, MATSOLVERSUPERLU)
         #       see: http://www.mcs.anl.gov/petsc/petsc-dev/src/ksp/ksp/examples/tutorials/ex52.c.html
         # PETSc.PC().setFactorSolverType("superlu")
 
-        L.assemble()
-        ksp.setOperators(L)
-        ksp.setFromOptions()
+        return ksp
+
+    def _solve_(self, L, x, b):
+        ksp, new = self._getKSP(L)
+
+        self._setOperators(ksp, L)
+        if new:
+            ksp.setFromOptions()
 
         self._log.debug("BEGIN solve")
 
@@ -36,13 +36,22 @@ class PETScKrylovSolver(PETScSolver):
 
     """
       
-    def __init__(self, tolerance=1e-10, iterations=1000, precon=None):
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None,
+                 reusePreconditioner=False):
         """
         :Parameters:
           - `tolerance`: The required error tolerance.
           - `iterations`: The maximum number of iterative steps to perform.
-          - `precon`: Preconditioner to use (string). 
-
+          - `precon`: Preconditioner to use (string).  With
+            `"fieldsplit"`, each equation of a coupled system is a
+            field of its own.
+          - `reusePreconditioner`: Whether to keep the preconditioner
+            built for a previous matrix, as long as the sparsity pattern
+            is unchanged. Otherwise, the preconditioner is set up
+            numerically for each new matrix, reusing only its symbolic
+            set up.
+
+        The `PETSc.KSP` and `PETSc.PC` objects persist between solves.
         """
         if self.__class__ is PETScKrylovSolver:
             raise NotImplementedError("can't instantiate abstract base class")
@@ -50,9 +59,10 @@ class PETScKrylovSolver(PETScSolver):
         PETScSolver.__init__(self, tolerance=tolerance,
                              iterations=iterations, precon=precon)
 
-    def _solve_(self, L, x, b):
-        ksp = PETSc.KSP()
-        ksp.create(L.comm)
+        self.reusePreconditioner = reusePreconditioner
+
+    def _createKSP(self, comm):
+        ksp = PETScSolver._createKSP(self, comm)
         ksp.setType(self.solver)
 
         self._log.debug("BEGIN precondition")
@@ -63,10 +73,85 @@ class PETScKrylovSolver(PETScSolver):
 
         self._log.debug("END precondition - {} ns".format(t.elapsed))
 
+        return ksp
+
+    def _setFieldSplits(self, ksp):
+        r"""Give `PCFIELDSPLIT` the rows that belong to each equation
+
+        The rows are found from the FiPy matrix being solved, as the
+        `PETSc.Mat` knows nothing of the equations.  The type of split
+        (additive, multiplicative, Schur, ...) is chosen with the usual
+        PETSc options, e.g., ``-pc_fieldsplit_type schur``.
+
+        For a pair of coupled equations whose sum is :math:`\nabla^2
+        (u + v) = 0`
+
+        >>> from fipy import Grid1D, CellVariable # doctest: +PETSC_SOLVER
+        >>> from fipy import DiffusionTerm, ImplicitSourceTerm # doctest: +PETSC_SOLVER
+        >>> from fipy.solvers.petsc import LinearGMRESSolver # doctest: +PETSC_SOLVER
+        >>> from fipy.tools import numerix # doctest: +PETSC_SOLVER
+        >>> mesh = Grid1D(nx=20, dx=0.05) # doctest: +PETSC_SOLVER
+        >>> u = CellVariable(mesh=mesh) # doctest: +PETSC_SOLVER
+        >>> v = CellVariable(mesh=mesh) # doctest: +PETSC_SOLVER
+        >>> u.constrain(0., where=mesh.facesLeft) # doctest: +PETSC_SOLVER
+        >>> u.constrain(1., where=mesh.facesRight) # doctest: +PETSC_SOLVER
+        >>> v.constrain(1., where=mesh.facesLeft) # doctest: +PETSC_SOLVER
+        >>> v.constrain(0., where=mesh.facesRight) # doctest: +PETSC_SOLVER
+        >>> eq = ((DiffusionTerm(var=u) - ImplicitSourceTerm(coeff=10., var=u)
+        ...        + ImplicitSourceTerm(coeff=10., var=v) == 0)
+        ...       & (DiffusionTerm(var=v) + ImplicitSourceTerm(coeff=10., var=u)
+        ...          - ImplicitSourceTerm(coeff=10., var=v) == 0)) # doctest: +PETSC_SOLVER
+
+        each equation is a field of the preconditioner
+
+        >>> solver = LinearGMRESSolver(tolerance=1e-12, precon="fieldsplit") # doctest: +PETSC_SOLVER
+        >>> eq.solve(solver=solver) # doctest: +PETSC_SOLVER
+        >>> print(len(solver._ksp.getPC().getFieldSplitSubKSP())) # doctest: +PETSC_SOLVER
+        2
+        >>> print(numerix.allclose(u + v, 1., atol=1e-8)) # doctest: +PETSC_SOLVER
+        True
+        >>> print(numerix.allclose(u, 1. - v[::-1], atol=1e-8)) # doctest: +PETSC_SOLVER
+        True
+
+        and the fields can be combined by their Schur complement
+
+        >>> from petsc4py import PETSc # doctest: +PETSC_SOLVER
+        >>> PETSc.Options().setValue("pc_fieldsplit_type", "schur") # doctest: +PETSC_SOLVER
+        >>> u.value = 0. # doctest: +PETSC_SOLVER
+        >>> v.value = 0. # doctest: +PETSC_SOLVER
+        >>> solver = LinearGMRESSolver(tolerance=1e-12, precon="fieldsplit") # doctest: +PETSC_SOLVER
+        >>> eq.solve(solver=solver) # doctest: +PETSC_SOLVER
+        >>> PETSc.Options().delValue("pc_fieldsplit_type") # doctest: +PETSC_SOLVER
+        >>> print(solver._ksp.getPC().getFieldSplitType() == PETSc.PC.CompositeType.SCHUR) # doctest: +PETSC_SOLVER
+        True
+        >>> print(numerix.allclose(u + v, 1., atol=1e-8)) # doctest: +PETSC_SOLVER
+        True
+        """
+        m2m = self.matrix._m2m
+        rows = m2m.globalNonOverlappingRowIDs.reshape((m2m.numberOfEquations, -1))
+        splits = []
+        for equation, IDs in enumerate(rows):
+            IS = PETSc.IS().createGeneral(self.matrix._mesh2matrix(IDs), comm=ksp.comm)
+            splits.append((str(equation), IS))
+        ksp.getPC().setFieldSplitIS(*splits)
+
+    def _solve_(self, L, x, b):
+        ksp, new = self._getKSP(L)
+        samePattern = self._setOperators(ksp, L)
+
+        if self.preconditioner == "fieldsplit" and not (new or samePattern):
+            # the splits of a `PCFIELDSPLIT` can't be redefined once it
+            # is set up, so start afresh with the new operator
+            self._destroyKSP()
+            ksp, new = self._getKSP(L)
+            samePattern = self._setOperators(ksp, L)
+
         ksp.setTolerances(rtol=self.tolerance, max_it=self.iterations)
-        L.assemble()
-        ksp.setOperators(L)
-        ksp.setFromOptions()
+        ksp.setReusePreconditioner(self.reusePreconditioner and samePattern)
+        if new:
+            if self.preconditioner == "fieldsplit":
+                self._setFieldSplits(ksp)
+            ksp.setFromOptions()
 
         self._log.debug("BEGIN solve")
 
@@ -82,4 +167,9 @@ class PETScKrylovSolver(PETScSolver):
         self._log.debug('norm: %s', ksp.norm)
         self._log.debug('norm_type: %s', ksp.norm_type)
 
-        ksp.destroy()
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
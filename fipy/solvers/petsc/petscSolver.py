@@ -18,12 +18,32 @@ class PETScSolver(Solver):
         else:
             Solver.__init__(self, *args, **kwargs)
 
+        self._ksp = None
+        self._operator = None
+        self._operatorMatrix = None
+        self._operatorPattern = None
+        self._ghostVectors = None
+        self._ghostLayout = None
+
     @property
     def _globalMatrixAndVectors(self):
         if not hasattr(self, 'globalVectors'):
             globalMatrix = self.matrix
 
-            overlappingVector = self.matrix._fipy2petscGhost(var=self.var)
+            # the ghosted vectors are kept between solves and refilled
+            # as long as the ghost layout and the size of the matrix are
+            # the same
+            layout = (self.matrix.mesh, self.matrix._m2m.numberOfEquations,
+                      self.matrix.matrix.getSizes())
+            if (self._ghostLayout is not None
+                and self._ghostLayout[0] is layout[0]
+                and self._ghostLayout[1:] == layout[1:]):
+                vec, RHSvec = self._ghostVectors
+            else:
+                self._destroyGhostVectors()
+                vec, RHSvec = None, None
+
+            overlappingVector = self.matrix._fipy2petscGhost(var=self.var, vec=vec)
 
             from fipy.variables.coupledCellVariable import _CoupledCellVariable
             if isinstance(self.RHSvector, _CoupledCellVariable):
@@ -31,7 +51,10 @@ class PETScSolver(Solver):
             else:
                 RHSvector = numerix.reshape(numerix.asarray(self.RHSvector), self.var.shape)
                 
-            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector)
+            overlappingRHSvector = self.matrix._fipy2petscGhost(var=RHSvector, vec=RHSvec)
+
+            self._ghostVectors = (overlappingVector, overlappingRHSvector)
+            self._ghostLayout = layout
 
             self.globalVectors = (globalMatrix, overlappingVector, overlappingRHSvector)
 
@@ -40,11 +63,129 @@ class PETScSolver(Solver):
     def _deleteGlobalMatrixAndVectors(self):
         del self.matrix
         if hasattr(self, "globalVectors"):
-            globalMatrix, overlappingVector, overlappingRHSvector = self._globalMatrixAndVectors
-            overlappingVector.destroy()
-            overlappingRHSvector.destroy()
-        del self.globalVectors
-        
+            del self.globalVectors
+
+    def _destroyGhostVectors(self):
+        if self._ghostVectors is not None:
+            for vec in self._ghostVectors:
+                vec.destroy()
+        self._ghostVectors = None
+        self._ghostLayout = None
+
+    def _createKSP(self, comm):
+        """Create the persistent `PETSc.KSP` for this solver
+
+        Subclasses set the Krylov and preconditioner types.
+        """
+        ksp = PETSc.KSP()
+        ksp.create(comm)
+        return ksp
+
+    def _destroyKSP(self):
+        """Destroy the persistent `PETSc.KSP` and release its operator
+        """
+        if self._ksp is not None:
+            self._ksp.destroy()
+        self._ksp = None
+        # the operator is destroyed along with the matrix that holds it
+        self._operator = None
+        self._operatorMatrix = None
+        self._operatorPattern = None
+
+    def _getKSP(self, L):
+        """Obtain the `PETSc.KSP`, creating it on first use
+
+        PETSc can't change the size of the operators of a `PETSc.KSP`
+        that is set up, so the `PETSc.KSP` is created afresh whenever the
+        size of `L` changes, e.g., when a solver is shared by equations
+        on different meshes.
+
+        >>> from fipy import Grid1D, CellVariable, DiffusionTerm # doctest: +PETSC_SOLVER
+        >>> from fipy.solvers.petsc import LinearGMRESSolver # doctest: +PETSC_SOLVER
+        >>> solver = LinearGMRESSolver(tolerance=1e-12) # doctest: +PETSC_SOLVER
+        >>> for nx in (10, 20, 10): # doctest: +PETSC_SOLVER
+        ...     mesh = Grid1D(nx=nx, dx=1. / nx)
+        ...     var = CellVariable(mesh=mesh)
+        ...     var.constrain(0., where=mesh.facesLeft)
+        ...     var.constrain(1., where=mesh.facesRight)
+        ...     DiffusionTerm().solve(var=var, solver=solver)
+        ...     print(numerix.allclose(var, mesh.x, atol=1e-8))
+        True
+        True
+        True
+
+        Returns
+        -------
+        ksp : PETSc.KSP
+            The persistent Krylov solver.
+        new : bool
+            Whether `ksp` was just created and still needs
+            `setFromOptions()` once its operators are set.
+        """
+        if (self._operator is not None
+            and self._operator.getSizes() != L.getSizes()):
+            self._destroyKSP()
+
+        new = self._ksp is None
+        if new:
+            self._ksp = self._createKSP(L.comm)
+
+        return self._ksp, new
+
+    def _setOperators(self, ksp, L):
+        """Set `L` as the operator of `ksp`
+
+        The nonzero structure of `L` is told from the digests of the
+        `_SparsityPattern` objects it was assembled from, rather than by
+        extracting it.  If these are the same as those of the last
+        operator on every process, the values of `L` are copied into that
+        operator with `SAME_NONZERO_PATTERN`, so the preconditioner only
+        needs a numeric, rather than a full, set up.  Otherwise, `L`
+        itself becomes the operator.
+
+        >>> from fipy import Grid2D, CellVariable, DiffusionTerm, TransientTerm # doctest: +PETSC_SOLVER
+        >>> from fipy.solvers.petsc import LinearPCGSolver # doctest: +PETSC_SOLVER
+        >>> mesh = Grid2D(nx=10, ny=10) # doctest: +PETSC_SOLVER
+        >>> var = CellVariable(mesh=mesh) # doctest: +PETSC_SOLVER
+        >>> var.constrain(1., where=mesh.facesLeft) # doctest: +PETSC_SOLVER
+        >>> eq = TransientTerm() == DiffusionTerm() # doctest: +PETSC_SOLVER
+        >>> solver = LinearPCGSolver(tolerance=1e-10) # doctest: +PETSC_SOLVER
+        >>> eq.solve(var=var, dt=1., solver=solver) # doctest: +PETSC_SOLVER
+        >>> operator = solver._operator # doctest: +PETSC_SOLVER
+        >>> for step in range(100): # doctest: +PETSC_SOLVER
+        ...     eq.solve(var=var, dt=1., solver=solver)
+        >>> print(solver._operator is operator) # doctest: +PETSC_SOLVER
+        True
+        >>> print(numerix.allclose(var, 1., atol=1e-3)) # doctest: +PETSC_SOLVER
+        True
+
+        Returns
+        -------
+        bool
+            Whether the sparsity pattern was unchanged.
+        """
+        L.assemble()
+        digests = self.matrix._patternDigests
+
+        samePattern = (digests is not None
+                       and self._operatorPattern is not None
+                       and self._operator.getSizes() == L.getSizes()
+                       and digests == self._operatorPattern)
+        samePattern = self.var.mesh.communicator.all(numerix.array(samePattern))
+
+        if samePattern:
+            L.copy(self._operator, structure=PETSc.Mat.Structure.SAME_NONZERO_PATTERN)
+        else:
+            # `self.matrix` destroys `L` when it is collected
+            self._operatorMatrix = self.matrix
+            self._operator = L
+            self._operatorPattern = digests
+
+        ksp.setOperators(self._operator)
+
+        return samePattern
+
+    
     def _solve(self):
         from fipy.terms import SolutionVariableNumberError
         
@@ -105,7 +246,15 @@ class PETScSolver(Solver):
 
     def __del__(self):
         if hasattr(self, "globalVectors"):
-            globalMatrix, overlappingVector, overlappingRHSvector = self._globalMatrixAndVectors
-            del globalMatrix
-            overlappingVector.destroy()
-            overlappingRHSvector.destroy()
+            del self.globalVectors
+        if getattr(self, "_ghostVectors", None) is not None:
+            self._destroyGhostVectors()
+        if getattr(self, "_ksp", None) is not None:
+            self._destroyKSP()
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -12,7 +12,8 @@ class LinearPCGSolver(ScipyLinearPCGSolver):
     using the PyAMG `SmoothedAggregationPreconditioner` by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=SmoothedAggregationPreconditioner()):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=SmoothedAggregationPreconditioner(),
+                 reusePreconditioner=False, reuseIterations=None):
         """
         Parameters
         ----------
@@ -21,6 +22,14 @@ class LinearPCGSolver(ScipyLinearPCGSolver):
         iterations : int
             Maximum number of iterative steps to perform.
         precon : ~fipy.solvers.pyAMG.preconditioners.smoothedAggregationPreconditioner.SmoothedAggregationPreconditioner, optional
+        reusePreconditioner : bool
+            Whether to keep the preconditioner built for an earlier
+            matrix with the same sparsity pattern.
+        reuseIterations : int, optional
+            With `reusePreconditioner`, rebuild the preconditioner after
+            a solve that takes more than this many iterations (default:
+            twice the iterations of its first solve).
         """
 
-        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon,
+                                              reusePreconditioner=reusePreconditioner, reuseIterations=reuseIterations)
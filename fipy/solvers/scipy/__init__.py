@@ -9,6 +9,7 @@ from fipy.solvers.scipy.linearGMRESSolver import *
 from fipy.solvers.scipy.linearBicgstabSolver import *
 from fipy.solvers.scipy.linearLUSolver import *
 from fipy.solvers.scipy.linearPCGSolver import *
+from fipy.solvers.scipy.linearMultigridSolver import *
 
 DefaultSolver = LinearLUSolver
 DefaultAsymmetricSolver = LinearLUSolver
@@ -18,8 +18,140 @@ class LinearLUSolver(_ScipySolver):
     The `LinearLUSolver` solves a linear system of equations using
     LU-factorization.  The `LinearLUSolver` is a wrapper class for the
     the Scipy `scipy.sparse.linalg.splu` module.
+
+    The factorization is kept between solves and reused as long as the
+    matrix is unchanged.
+
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, DiffusionTerm
+    >>> mesh = Grid1D(nx=10)
+    >>> var = CellVariable(mesh=mesh, hasOld=True)
+    >>> var.constrain(1., where=mesh.facesLeft)
+    >>> eq = TransientTerm() == DiffusionTerm()
+    >>> solver = LinearLUSolver()
+    >>> eq.solve(var, dt=1., solver=solver)
+    >>> LU = solver._LU
+    >>> var.updateOld()
+    >>> eq.solve(var, dt=1., solver=solver)
+    >>> solver._LU is LU
+    True
+
+    A different time step changes the matrix, so it must be refactored
+
+    >>> var.updateOld()
+    >>> eq.solve(var, dt=2., solver=solver)
+    >>> solver._LU is LU
+    False
+
+    With a `refactorInterval`, the factorization of a previous matrix is
+    reused to precondition the iterative refinement of the solution
+
+    >>> var.updateOld()
+    >>> staleSolver = LinearLUSolver(refactorInterval=3)
+    >>> eq.solve(var, dt=1., solver=staleSolver)
+    >>> LU = staleSolver._LU
+    >>> var.updateOld()
+    >>> eq.solve(var, dt=1.1, solver=staleSolver)
+    >>> staleSolver._LU is LU
+    True
+    >>> stale = var.copy()
+    >>> eq.solve(var, dt=1.1, solver=LinearLUSolver())
+    >>> print(numerix.allclose(var, stale, rtol=1e-8))
+    True
     """
 
+    def __init__(self, tolerance=1e-10, iterations=1000, precon=None, refactorInterval=None):
+        """
+        Create a `LinearLUSolver`.
+
+        Parameters
+        ----------
+        tolerance : float
+            Required error tolerance.
+        iterations : int
+            Maximum number of iterative refinement steps to perform
+            (at most 10).
+        precon
+            *ignored*
+        refactorInterval : int, optional
+            By default, the LU factorization is only reused for a matrix
+            identical to the one that was factored.  If an `int`, the
+            factorization of a previous matrix of the same shape is also
+            reused and the iterative refinement corrects for the
+            difference. The matrix is refactored after this many solves
+            with the same factorization, or sooner if the refinement
+            stalls.
+        """
+        super(LinearLUSolver, self).__init__(tolerance=tolerance,
+                                             iterations=iterations,
+                                             precon=precon)
+        self.refactorInterval = refactorInterval
+        self._LU = None
+        self._factoredMatrix = None
+        self._solvesSinceFactorization = 0
+
+    def _factorize(self, A):
+        self._log.debug("BEGIN factorize")
+
+        with Timer() as t:
+            self._LU = splu(A, diag_pivot_thresh=1.,
+                               relax=1,
+                               panel_size=10,
+                               permc_spec=3)
+            self._factoredMatrix = A
+            self._solvesSinceFactorization = 0
+
+        self._log.debug("END factorize - {} ns".format(t.elapsed))
+
+    def _isFactored(self, A):
+        """Whether `A` is identical to the matrix that was last factored
+        """
+        F = self._factoredMatrix
+        return (F is not None
+                and F.shape == A.shape
+                and numerix.array_equal(F.indptr, A.indptr)
+                and numerix.array_equal(F.indices, A.indices)
+                and numerix.array_equal(F.data, A.data))
+
+    def _canReuseFactorization(self, A):
+        if self._LU is None:
+            return False
+        elif self._isFactored(A):
+            return True
+        else:
+            return (self.refactorInterval is not None
+                    and self._factoredMatrix.shape == A.shape
+                    and self._solvesSinceFactorization < self.refactorInterval)
+
+    def _refine(self, L, x, b, error0):
+        """Iteratively refine `x` with the current factorization
+
+        Returns
+        -------
+        iteration : int
+            Number of refinement steps taken.
+        errorVector : ndarray
+            Residual of the last step.
+        converged : bool
+            Whether the residual fell below the tolerance without ever
+            growing.
+        """
+        previousError = None
+        for iteration in range(min(self.iterations, 10)):
+            errorVector = L * x - b
+            error = numerix.sqrt(numerix.sum(errorVector**2))
+
+            if error <= self.tolerance * error0:
+                return iteration, errorVector, True
+            elif previousError is not None and error >= previousError:
+                return iteration, errorVector, False
+
+            previousError = error
+
+            xError = self._LU.solve(errorVector)
+            x[:] = x - xError
+
+        return iteration, errorVector, False
+
     def _solve_(self, L, x, b):
         diag = L.takeDiagonal()
         maxdiag = max(numerix.absolute(diag))
@@ -35,21 +167,23 @@ class LinearLUSolver(_ScipySolver):
         self._log.debug("BEGIN solve")
 
         with Timer() as t:
-            LU = splu(L.matrix.asformat("csc"), diag_pivot_thresh=1.,
-                                                relax=1,
-                                                panel_size=10,
-                                                permc_spec=3)
+            A = L.matrix.asformat("csc")
 
-            error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
+            fresh = not self._canReuseFactorization(A)
+            if fresh:
+                self._factorize(A)
+            exact = fresh or self._isFactored(A)
+            self._solvesSinceFactorization += 1
 
-            for iteration in range(min(self.iterations, 10)):
-                errorVector = L * x - b
+            error0 = numerix.sqrt(numerix.sum((L * x - b)**2))
 
-                if numerix.sqrt(numerix.sum(errorVector**2))  <= self.tolerance * error0:
-                    break
+            iteration, errorVector, converged = self._refine(L, x, b, error0)
 
-                xError = LU.solve(errorVector)
-                x[:] = x - xError
+            if not converged and not exact:
+                self._log.debug("refinement with previous factorization stalled")
+                self._factorize(A)
+                self._solvesSinceFactorization += 1
+                iteration, errorVector, converged = self._refine(L, x, b, error0)
 
         self._log.debug("END solve - {} ns".format(t.elapsed))
 
@@ -57,3 +191,10 @@ class LinearLUSolver(_ScipySolver):
         self._log.debug('residual: %s', numerix.sqrt(numerix.sum(errorVector**2)))
 
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,129 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.solvers.scipy.preconditioners.multigridPreconditioner import MultigridPreconditioner
+from fipy.tools import numerix
+from fipy.tools.timer import Timer
+
+__all__ = ["LinearMultigridSolver"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class LinearMultigridSolver(_ScipySolver):
+    """
+    The `LinearMultigridSolver` repeats geometric multigrid cycles on a
+    :class:`~fipy.meshes.factoryMeshes.Grid1D`,
+    :class:`~fipy.meshes.factoryMeshes.Grid2D` or
+    :class:`~fipy.meshes.factoryMeshes.Grid3D` until the residual has
+    been reduced by `tolerance`.  The cost of each cycle is proportional
+    to the number of cells, so Poisson-like problems are solved in
+    :math:`O(N)` operations.  The cycles are set by a
+    :class:`~fipy.solvers.scipy.preconditioners.multigridPreconditioner.MultigridPreconditioner`.
+
+    >>> from fipy import CellVariable, Grid2D, DiffusionTerm
+    >>> def problem(n):
+    ...     mesh = Grid2D(nx=n, ny=n, dx=1. / n, dy=1. / n)
+    ...     var = CellVariable(mesh=mesh)
+    ...     var.constrain(0., where=mesh.facesLeft | mesh.facesRight)
+    ...     var.constrain(1., where=mesh.facesTop)
+    ...     return var, DiffusionTerm() == -mesh.x * mesh.y
+
+    >>> var, eq = problem(64)
+    >>> solver = LinearMultigridSolver(tolerance=1e-10)
+    >>> eq.solve(var=var, solver=solver)
+    >>> from fipy.solvers.scipy import LinearLUSolver
+    >>> psi, eq = problem(64)
+    >>> eq.solve(var=psi, solver=LinearLUSolver())
+    >>> print(numerix.allclose(var, psi))
+    True
+
+    The number of cycles does not grow as the grid is refined (see
+    `examples/benchmarking/multigrid.py` for larger grids)
+
+    >>> for n in (16, 32, 64):
+    ...     var, eq = problem(n)
+    ...     solver = LinearMultigridSolver(tolerance=1e-8)
+    ...     eq.solve(var=var, solver=solver)
+    ...     print(solver._cycles < 20)
+    True
+    True
+    True
+
+    W and F cycles do more work on the coarse grids and need fewer cycles
+
+    >>> cycles = {}
+    >>> for cycle in ("V", "W", "F"):
+    ...     var, eq = problem(64)
+    ...     solver = LinearMultigridSolver(tolerance=1e-8,
+    ...                                    precon=MultigridPreconditioner(cycle=cycle))
+    ...     eq.solve(var=var, solver=solver)
+    ...     cycles[cycle] = solver._cycles
+    >>> print(cycles["W"] <= cycles["V"], cycles["F"] <= cycles["V"])
+    True True
+    """
+
+    def __init__(self, tolerance=1e-10, iterations=100, precon=None):
+        """
+        Parameters
+        ----------
+        tolerance : float
+            Required reduction of the residual.
+        iterations : int
+            Maximum number of cycles to perform.
+        precon : ~fipy.solvers.scipy.preconditioners.multigridPreconditioner.MultigridPreconditioner, optional
+            The kind of cycle and smoothing to use (default: V cycles
+            with two damped Jacobi sweeps before and after each coarse
+            grid correction).
+        """
+        if precon is None:
+            precon = MultigridPreconditioner()
+        super(LinearMultigridSolver, self).__init__(tolerance=tolerance,
+                                                    iterations=iterations,
+                                                    precon=precon)
+        self._cycles = 0
+
+    def _solve_(self, L, x, b):
+        self._log.debug("BEGIN precondition")
+
+        with Timer() as t:
+            A = L.matrix
+            hierarchy = self.preconditioner._hierarchy(self, A)
+
+        self._log.debug("END precondition - {} ns".format(t.elapsed))
+
+        self._log.debug("BEGIN solve")
+
+        with Timer() as t:
+            b = numerix.asarray(b, dtype=float)
+            x = numerix.array(x, dtype=float)
+            error0 = numerix.L2norm(b)
+            if error0 == 0:
+                error0 = 1.
+
+            error = numerix.L2norm(b - A * x)
+            for cycle in range(self.iterations):
+                if error <= self.tolerance * error0:
+                    break
+                x = hierarchy.cycle(b, x)
+                error = numerix.L2norm(b - A * x)
+            else:
+                cycle = self.iterations
+
+        self._log.debug("END solve - {} ns".format(t.elapsed))
+
+        self._log.debug('iterations: %d / %d', cycle, self.iterations)
+        self._log.debug('residual: %s', error)
+
+        self._cycles = cycle
+
+        return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
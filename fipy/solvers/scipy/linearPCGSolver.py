@@ -15,7 +15,9 @@ class LinearPCGSolver(_ScipyKrylovSolver):
     with no preconditioning by default.
     """
 
-    def __init__(self, tolerance=1e-15, iterations=2000, precon=None):
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None,
+                 reusePreconditioner=False, reuseIterations=None,
+                 matrixFree=False, stencil=False):
         """
         Parameters
         ----------
@@ -25,9 +27,25 @@ class LinearPCGSolver(_ScipyKrylovSolver):
             Maximum number of iterative steps to perform.
         precon
             Preconditioner to use.
+        reusePreconditioner : bool
+            Whether to keep the preconditioner built for an earlier
+            matrix with the same sparsity pattern.
+        reuseIterations : int, optional
+            With `reusePreconditioner`, rebuild the preconditioner after
+            a solve that takes more than this many iterations (default:
+            twice the iterations of its first solve).
+        matrixFree : bool
+            Whether to apply the operator without assembling a sparse
+            matrix (single scalar equations only).
+        stencil : bool
+            Whether to store the matrix as one array for each offset
+            from the diagonal (`UniformGrid1D`, `UniformGrid2D` and
+            `UniformGrid3D` meshes only).
         """
 
-        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon)
+        super(LinearPCGSolver, self).__init__(tolerance=tolerance, iterations=iterations, precon=precon,
+                                              reusePreconditioner=reusePreconditioner, reuseIterations=reuseIterations,
+                                              matrixFree=matrixFree, stencil=stencil)
         self.solveFnc = cg
 
     def _canSolveAsymmetric(self):
@@ -0,0 +1,4 @@
+from __future__ import unicode_literals
+from fipy.solvers.scipy.preconditioners.blockJacobiPreconditioner import *
+from fipy.solvers.scipy.preconditioners.fieldSplitPreconditioner import *
+from fipy.solvers.scipy.preconditioners.multigridPreconditioner import *
@@ -0,0 +1,81 @@
+from __future__ import unicode_literals
+from builtins import object
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+
+from fipy.tools import numerix
+
+__all__ = ["BlockJacobiPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class BlockJacobiPreconditioner(object):
+    """Preconditioner that inverts the diagonal block of each cell
+
+    The SciPy Krylov solvers store coupled equations as a block sparse
+    matrix, with a block for each cell that couples the equations to
+    the variables in that cell.  Inverting these blocks accounts for the
+    local coupling between fields, which point Jacobi ignores.  For a
+    single equation, this is point Jacobi.
+
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, DiffusionTerm
+    >>> from fipy.solvers.scipy import LinearGMRESSolver
+
+    >>> mesh = Grid1D(nx=20)
+    >>> v0 = CellVariable(mesh=mesh, hasOld=True, value=mesh.x)
+    >>> v1 = CellVariable(mesh=mesh, hasOld=True, value=1.)
+    >>> v0.constrain(0., where=mesh.facesLeft)
+    >>> v1.constrain(1., where=mesh.facesRight)
+    >>> eq = ((TransientTerm(var=v0) == DiffusionTerm(coeff=1., var=v0)
+    ...                                 - DiffusionTerm(coeff=.5, var=v1))
+    ...       & (TransientTerm(var=v1) == DiffusionTerm(coeff=.1, var=v1)
+    ...                                   + DiffusionTerm(coeff=.2, var=v0)))
+    >>> solver = LinearGMRESSolver(tolerance=1e-10,
+    ...                            precon=BlockJacobiPreconditioner())
+    >>> eq.solve(dt=1., solver=solver)
+    >>> print(solver.matrix.BSR.blocksize)
+    (2, 2)
+
+    >>> w0 = CellVariable(mesh=mesh, hasOld=True, value=mesh.x)
+    >>> w1 = CellVariable(mesh=mesh, hasOld=True, value=1.)
+    >>> w0.constrain(0., where=mesh.facesLeft)
+    >>> w1.constrain(1., where=mesh.facesRight)
+    >>> eqw = ((TransientTerm(var=w0) == DiffusionTerm(coeff=1., var=w0)
+    ...                                  - DiffusionTerm(coeff=.5, var=w1))
+    ...        & (TransientTerm(var=w1) == DiffusionTerm(coeff=.1, var=w1)
+    ...                                    + DiffusionTerm(coeff=.2, var=w0)))
+    >>> from fipy.solvers.scipy import LinearLUSolver
+    >>> eqw.solve(dt=1., solver=LinearLUSolver())
+    >>> print(numerix.allclose(v0, w0) and numerix.allclose(v1, w1))
+    True
+    """
+
+    def _applyToMatrix(self, A):
+        R, C = getattr(A, "blocksize", (1, 1))
+        if R != C:
+            raise ValueError("diagonal blocks must be square")
+
+        A = sp.bsr_matrix(A, blocksize=(R, C))
+        N = A.shape[0] // R
+
+        blockRows = numerix.repeat(numerix.arange(N), numerix.diff(A.indptr))
+        onDiagonal = A.indices == blockRows
+
+        blocks = numerix.zeros((N, R, C), dtype=A.dtype)
+        blocks[blockRows[onDiagonal]] = A.data[onDiagonal]
+
+        try:
+            inverses = numerix.linalg.inv(blocks)
+        except numerix.linalg.LinAlgError:
+            inverses = numerix.linalg.pinv(blocks)
+
+        return sp.bsr_matrix((inverses, numerix.arange(N), numerix.arange(N + 1)),
+                             shape=A.shape)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
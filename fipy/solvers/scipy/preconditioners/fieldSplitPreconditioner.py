@@ -0,0 +1,167 @@
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.tools import numerix
+
+__all__ = ["FieldSplitPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class FieldSplitPreconditioner(object):
+    """Preconditioner that solves for the fields of a coupled system separately
+
+    The unknowns of coupled equations are split into fields, and the
+    diagonal block of the matrix that couples each field to itself is
+    factored.  The fields are combined in the manner of PETSc's
+    `PCFIELDSPLIT`:
+
+    ``"additive"``
+        block Jacobi; the fields are solved for independently.
+
+    ``"multiplicative"``
+        block Gauss-Seidel; each field is solved for with the residual
+        updated by the fields before it.
+
+    ``"schur"``
+        block factorization of a two-field system, with the Schur
+        complement of the first field approximated from the diagonal of
+        its block, i.e., :math:`S \\approx A_{11} - A_{10}
+        \\operatorname{diag}(A_{00})^{-1} A_{01}`.  This is suited to
+        saddle-point systems, where :math:`A_{11}` is zero, as long as
+        the first field is the one with a nonsingular block.
+
+    >>> from fipy import CellVariable, Grid2D, TransientTerm, DiffusionTerm
+    >>> from fipy import ImplicitSourceTerm
+    >>> from fipy.solvers.scipy import LinearGMRESSolver, LinearLUSolver
+
+    >>> mesh = Grid2D(nx=10, ny=10)
+    >>> def coupled():
+    ...     v0 = CellVariable(mesh=mesh, hasOld=True, value=mesh.x)
+    ...     v1 = CellVariable(mesh=mesh, hasOld=True, value=1.)
+    ...     v0.constrain(0., where=mesh.facesLeft)
+    ...     v1.constrain(1., where=mesh.facesRight)
+    ...     eq = ((TransientTerm(var=v0) == DiffusionTerm(coeff=1., var=v0)
+    ...                                     - DiffusionTerm(coeff=.5, var=v1))
+    ...           & (TransientTerm(var=v1) == DiffusionTerm(coeff=.1, var=v1)
+    ...                                       + ImplicitSourceTerm(coeff=.2, var=v0)))
+    ...     return v0, v1, eq
+
+    >>> v0, v1, eq = coupled()
+    >>> eq.solve(dt=1., solver=LinearLUSolver())
+    >>> for splitType in ("additive", "multiplicative", "schur"):
+    ...     w0, w1, eq = coupled()
+    ...     precon = FieldSplitPreconditioner(splitType=splitType)
+    ...     eq.solve(dt=1., solver=LinearGMRESSolver(tolerance=1e-12,
+    ...                                              precon=precon))
+    ...     print(splitType, numerix.allclose(w0, v0) and numerix.allclose(w1, v1))
+    additive True
+    multiplicative True
+    schur True
+
+    Fields can group several equations, identified by the order in which
+    they are coupled with ``&``
+
+    >>> FieldSplitPreconditioner(splitType="schur", fields=[[0], [1, 2], [3]]) # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+        ...
+    ValueError: a Schur complement split needs exactly two fields
+    """
+
+    _splitTypes = ("additive", "multiplicative", "schur")
+
+    def __init__(self, splitType="additive", fields=None):
+        """
+        Parameters
+        ----------
+        splitType : {"additive", "multiplicative", "schur"}
+            How the solutions for the fields are combined.
+        fields : list of list of int, optional
+            The equations in each field.  By default, each equation of a
+            coupled system is a field of its own.
+        """
+        if splitType not in self._splitTypes:
+            raise ValueError("splitType must be one of %s" % ", ".join(self._splitTypes))
+        if (splitType == "schur"
+            and fields is not None
+            and len(fields) != 2):
+            raise ValueError("a Schur complement split needs exactly two fields")
+
+        self.splitType = splitType
+        self.fields = fields
+
+    def _indexSets(self, A):
+        """Rows (and columns) of `A` that belong to each field
+
+        The coupled unknowns of each cell are interleaved in blocks of
+        `A.blocksize`.
+        """
+        R = getattr(A, "blocksize", (1, 1))[0]
+        fields = self.fields
+        if fields is None:
+            fields = [[k] for k in range(R)]
+
+        equations = numerix.arange(A.shape[0]) % R
+        sets = [numerix.nonzero(numerix.isin(equations, field))[0] for field in fields]
+
+        if sum(len(IDs) for IDs in sets) != A.shape[0]:
+            raise ValueError("every equation must belong to exactly one field")
+
+        if self.splitType == "schur" and len(sets) != 2:
+            raise ValueError("a Schur complement split needs exactly two fields")
+
+        return sets
+
+    def _applyToMatrix(self, A):
+        sets = self._indexSets(A)
+        A = sp.csr_matrix(A)
+        blocks = [[A[I][:, J] for J in sets] for I in sets]
+
+        if self.splitType == "schur":
+            return self._schur(A, sets, blocks)
+
+        solves = [splu(blocks[i][i].tocsc()).solve for i in range(len(sets))]
+        multiplicative = (self.splitType == "multiplicative")
+
+        def matvec(r):
+            r = numerix.ravel(r)
+            y = numerix.zeros(r.shape, dtype=A.dtype)
+            for i, I in enumerate(sets):
+                ri = r[I]
+                if multiplicative:
+                    for j in range(i):
+                        ri = ri - blocks[i][j] * y[sets[j]]
+                y[I] = solves[i](ri)
+            return y
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+    @staticmethod
+    def _schur(A, sets, blocks):
+        (A00, A01), (A10, A11) = blocks
+        I0, I1 = sets
+
+        S = A11 - A10 * sp.diags(1. / A00.diagonal()) * A01
+        solve0 = splu(A00.tocsc()).solve
+        solveS = splu(sp.csc_matrix(S)).solve
+
+        def matvec(r):
+            r = numerix.ravel(r)
+            y = numerix.zeros(r.shape, dtype=A.dtype)
+            y1 = solveS(r[I1] - A10 * solve0(r[I0]))
+            y[I0] = solve0(r[I0] - A01 * y1)
+            y[I1] = y1
+            return y
+
+        return LinearOperator(A.shape, matvec=matvec, dtype=A.dtype)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -0,0 +1,267 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+import scipy.sparse as sp
+from scipy.sparse.linalg import LinearOperator, splu
+
+from fipy.tools import numerix
+
+__all__ = ["MultigridPreconditioner"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+def _gridShape(mesh):
+    """Number of cells of a structured `Grid` in each direction
+
+    >>> from fipy import Grid1D, Grid2D, Grid3D, Tri2D
+    >>> print(_gridShape(Grid1D(nx=3)))
+    (3,)
+    >>> print(_gridShape(Grid3D(nx=2, ny=3, nz=4)))
+    (2, 3, 4)
+    >>> print(_gridShape(Grid2D(dx=(1., 2.), dy=(1., 1., 3.))))
+    (2, 3)
+    >>> _gridShape(Tri2D())
+    Traceback (most recent call last):
+        ...
+    TypeError: geometric multigrid requires a structured Grid, not a Tri2D
+    """
+    shape = tuple(getattr(mesh, n, None) for n in ("nx", "ny", "nz")[:mesh.dim])
+    if (None in shape
+        or int(numerix.prod(shape)) != mesh.numberOfCells):
+        raise TypeError("geometric multigrid requires a structured Grid, not a %s"
+                        % mesh.__class__.__name__)
+    return tuple(int(n) for n in shape)
+
+def _prolongation1D(n):
+    """Linear interpolation from the `(n + 1) // 2` coarse cells of a
+    row of `n` fine cells
+
+    Each pair of fine cells shares a coarse cell.  A fine cell takes
+    3/4 of the value of its own coarse cell and 1/4 of the value of the
+    next coarse cell on its side, or all of the value of its own coarse
+    cell at the ends of the row.
+
+    >>> print(_prolongation1D(4).toarray())
+    [[ 1.    0.  ]
+     [ 0.75  0.25]
+     [ 0.25  0.75]
+     [ 0.    1.  ]]
+    >>> print(_prolongation1D(3).toarray())
+    [[ 1.    0.  ]
+     [ 0.75  0.25]
+     [ 0.25  0.75]]
+    """
+    nc = (n + 1) // 2
+    fine = numerix.arange(n)
+    coarse = fine // 2
+    neighbor = coarse + numerix.where(fine % 2 == 0, -1, 1)
+    inside = (neighbor >= 0) & (neighbor < nc)
+
+    rows = numerix.concatenate((fine, fine[inside]))
+    cols = numerix.concatenate((coarse, neighbor[inside]))
+    weights = numerix.concatenate((numerix.where(inside, 0.75, 1.),
+                                   numerix.zeros(inside.sum()) + 0.25))
+
+    return sp.csr_matrix((weights, (rows, cols)), shape=(n, nc))
+
+class _MultigridLevel(object):
+    def __init__(self, A, shape):
+        self.A = A.tocsr()
+        self.shape = shape
+        diagonal = self.A.diagonal()
+        self.inverseDiagonal = 1. / numerix.where(diagonal == 0, 1., diagonal)
+        self.P = None
+        self.R = None
+
+class _MultigridHierarchy(object):
+    """Galerkin coarsened operators of a structured grid
+
+    Each coarser grid merges pairs of cells in every direction that
+    has more than one cell.  The operator of each level is
+    :math:`\\mathsf{R} \\mathsf{A} \\mathsf{P}`, where the prolongation
+    :math:`\\mathsf{P}` interpolates linearly between coarse cell
+    centers and the restriction is :math:`\\mathsf{R} = \\mathsf{P}^T`.
+    The coarsest operator is factored.
+    """
+    def __init__(self, A, shape, preconditioner):
+        self.preconditioner = preconditioner
+        self.levels = [_MultigridLevel(A, shape)]
+
+        while (numerix.prod(shape) > preconditioner.coarsest
+               and max(shape) > 1):
+            # cells are numbered with x varying fastest
+            P = sp.identity(1, format="csr")
+            for n in shape:
+                P = sp.kron(_prolongation1D(n), P, format="csr")
+            level = self.levels[-1]
+            level.P = P
+            level.R = P.T.tocsr()
+            shape = tuple((n + 1) // 2 for n in shape)
+            self.levels.append(_MultigridLevel(level.R * level.A * P, shape))
+
+        coarsest = self.levels[-1].A
+        try:
+            self._coarseLU = splu(coarsest.tocsc())
+            self._coarsePinv = None
+        except RuntimeError:
+            # e.g., a pure Neumann problem
+            self._coarseLU = None
+            self._coarsePinv = numerix.linalg.pinv(coarsest.toarray())
+
+    def _coarseSolve(self, b):
+        if self._coarseLU is not None:
+            return self._coarseLU.solve(b)
+        else:
+            return numerix.dot(self._coarsePinv, b)
+
+    def _smooth(self, level, x, b, sweeps):
+        """Damped Jacobi sweeps"""
+        weight = self.preconditioner.weight
+        for sweep in range(sweeps):
+            x = x + weight * level.inverseDiagonal * (b - level.A * x)
+        return x
+
+    def cycle(self, b, x=None, index=0, cycle=None):
+        """Improve the solution `x` of the `index`-th level with one cycle
+        """
+        cycle = cycle or self.preconditioner.cycle
+        level = self.levels[index]
+
+        if index == len(self.levels) - 1:
+            return self._coarseSolve(b)
+
+        if x is None:
+            x = numerix.zeros(b.shape, dtype=float)
+        x = self._smooth(level, x, b, self.preconditioner.preSweeps)
+
+        r = level.R * (b - level.A * x)
+        if cycle == "V":
+            e = self.cycle(r, index=index + 1, cycle="V")
+        elif cycle == "W":
+            e = self.cycle(r, index=index + 1, cycle="W")
+            e = self.cycle(r, e, index=index + 1, cycle="W")
+        else:
+            e = self.cycle(r, index=index + 1, cycle="F")
+            e = self.cycle(r, e, index=index + 1, cycle="V")
+        x = x + level.P * e
+
+        return self._smooth(level, x, b, self.preconditioner.postSweeps)
+
+class MultigridPreconditioner(object):
+    """Geometric multigrid for structured grids
+
+    The grid hierarchy of a :class:`~fipy.meshes.factoryMeshes.Grid1D`,
+    :class:`~fipy.meshes.factoryMeshes.Grid2D` or
+    :class:`~fipy.meshes.factoryMeshes.Grid3D` is built by merging pairs
+    of cells in each direction.  The operator of each coarser grid is
+    obtained by Galerkin coarsening, so any equation can be
+    preconditioned without rediscretizing it.  Each application is a
+    single cycle with damped Jacobi smoothing, which only uses sparse
+    matrix-vector products.
+
+    >>> from fipy import CellVariable, Grid2D, DiffusionTerm
+    >>> from fipy.solvers.scipy import LinearPCGSolver
+    >>> mesh = Grid2D(nx=64, ny=64, dx=1. / 64, dy=1. / 64)
+    >>> def problem():
+    ...     var = CellVariable(mesh=mesh)
+    ...     var.constrain(0., where=mesh.facesLeft | mesh.facesRight)
+    ...     var.constrain(1., where=mesh.facesTop)
+    ...     return var, DiffusionTerm() == -mesh.x * mesh.y
+
+    >>> var, eq = problem()
+    >>> solver = LinearPCGSolver(tolerance=1e-10, precon=MultigridPreconditioner())
+    >>> eq.solve(var=var, solver=solver)
+    >>> print(len(solver._M._hierarchy.levels))
+    4
+
+    The preconditioned iterations do not grow as the grid is refined (see
+    `examples/benchmarking/multigrid.py` for larger grids)
+
+    >>> from scipy.sparse.linalg import cg
+    >>> for n in (16, 32, 64):
+    ...     m = Grid2D(nx=n, ny=n, dx=1. / n, dy=1. / n)
+    ...     solver = LinearPCGSolver(precon=MultigridPreconditioner())
+    ...     v = CellVariable(mesh=m)
+    ...     v.constrain(1., where=m.facesTop)
+    ...     eq = DiffusionTerm()
+    ...     solver = eq._prepareLinearSystem(v, solver, (), None)
+    ...     A = solver.matrix.matrix
+    ...     M = solver.preconditioner._applyToSolver(solver=solver, matrix=A)
+    ...     iterations = []
+    ...     x, info = cg(A, solver.RHSvector, M=M, rtol=1e-8, callback=iterations.append)
+    ...     print(info, len(iterations) < 12)
+    0 True
+    0 True
+    0 True
+
+    and agree with a direct solution
+
+    >>> var, eq = problem()
+    >>> eq.solve(var=var, solver=LinearPCGSolver(tolerance=1e-10,
+    ...                                          precon=MultigridPreconditioner(cycle="W")))
+    >>> from fipy.solvers.scipy import LinearLUSolver
+    >>> psi, eq = problem()
+    >>> eq.solve(var=psi, solver=LinearLUSolver())
+    >>> print(numerix.allclose(var, psi))
+    True
+
+    Other meshes have no grid hierarchy
+
+    >>> from fipy import Tri2D
+    >>> mesh = Tri2D()
+    >>> var, eq = problem()
+    >>> eq.solve(var=var, solver=LinearPCGSolver(precon=MultigridPreconditioner()))
+    Traceback (most recent call last):
+        ...
+    TypeError: geometric multigrid requires a structured Grid, not a Tri2D
+    """
+
+    def __init__(self, cycle="V", preSweeps=2, postSweeps=2, weight=2. / 3,
+                 coarsest=64):
+        """
+        Parameters
+        ----------
+        cycle : {"V", "W", "F"}
+            How often each coarser grid is visited in a cycle.
+        preSweeps, postSweeps : int
+            Number of smoothing sweeps before and after correcting from
+            the coarser grid.
+        weight : float
+            Damping of the Jacobi smoother.
+        coarsest : int
+            Grids with no more cells than this are solved directly.
+        """
+        if cycle not in ("V", "W", "F"):
+            raise ValueError("cycle must be 'V', 'W' or 'F'")
+        self.cycle = cycle
+        self.preSweeps = preSweeps
+        self.postSweeps = postSweeps
+        self.weight = weight
+        self.coarsest = coarsest
+
+    def _hierarchy(self, solver, matrix):
+        if not sp.issparse(matrix):
+            raise TypeError("geometric multigrid requires an assembled sparse matrix")
+        shape = _gridShape(solver.var.mesh)
+        if matrix.shape[0] != numerix.prod(shape):
+            raise TypeError("geometric multigrid is only available for a single scalar equation")
+        return _MultigridHierarchy(matrix, shape, self)
+
+    def _applyToSolver(self, solver, matrix):
+        hierarchy = self._hierarchy(solver, matrix)
+
+        M = LinearOperator(matrix.shape, dtype=float,
+                           matvec=lambda b: hierarchy.cycle(numerix.ravel(b)))
+        M._hierarchy = hierarchy
+
+        return M
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -4,6 +4,7 @@ __docformat__ = 'restructuredtext'
 __all__ = []
 
 from fipy.solvers.scipy.scipySolver import _ScipySolver
+from fipy.tools import numerix
 from fipy.tools.timer import Timer
 
 class _ScipyKrylovSolver(_ScipySolver):
@@ -11,33 +12,240 @@ class _ScipyKrylovSolver(_ScipySolver):
     The base `ScipyKrylovSolver` class.
 
     .. attention:: This class is abstract. Always create one of its subclasses.
+
+    With `reusePreconditioner`, the preconditioner is only rebuilt when
+    the sparsity pattern of the matrix changes or when solves start to
+    take too many iterations.
+
+    >>> from scipy.sparse.linalg import LinearOperator
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, DiffusionTerm
+    >>> from fipy.solvers.scipy.linearPCGSolver import LinearPCGSolver
+
+    >>> class JacobiPreconditioner(object):
+    ...     builds = 0
+    ...     def _applyToMatrix(self, A):
+    ...         self.builds += 1
+    ...         diag = A.diagonal()
+    ...         return LinearOperator(A.shape, matvec=lambda x: x / diag)
+
+    >>> mesh = Grid1D(nx=50)
+    >>> var = CellVariable(mesh=mesh, hasOld=True)
+    >>> var.constrain(1., where=mesh.facesLeft)
+    >>> eq = TransientTerm() == DiffusionTerm()
+    >>> precon = JacobiPreconditioner()
+    >>> solver = LinearPCGSolver(tolerance=1e-10, precon=precon,
+    ...                          reusePreconditioner=True)
+    >>> for dt in (1., 1.1, 1.2):
+    ...     var.updateOld()
+    ...     eq.solve(var, dt=dt, solver=solver)
+    >>> print(precon.builds)
+    1
+
+    A solve that needs more than `reuseIterations` iterations causes the
+    preconditioner to be rebuilt for the next one
+
+    >>> solver.reuseIterations = 1
+    >>> var.updateOld()
+    >>> eq.solve(var, dt=1., solver=solver)
+    >>> var.updateOld()
+    >>> eq.solve(var, dt=1., solver=solver)
+    >>> print(precon.builds)
+    2
+
+    With `matrixFree`, the same equation is solved without assembling
+    a sparse matrix
+
+    >>> free = CellVariable(mesh=mesh, hasOld=True)
+    >>> free.constrain(1., where=mesh.facesLeft)
+    >>> assembled = CellVariable(mesh=mesh, hasOld=True)
+    >>> assembled.constrain(1., where=mesh.facesLeft)
+    >>> freeSolver = LinearPCGSolver(tolerance=1e-10, precon=JacobiPreconditioner(),
+    ...                              matrixFree=True)
+    >>> eq.solve(free, dt=1., solver=freeSolver)
+    >>> eq.solve(assembled, dt=1., solver=LinearPCGSolver(tolerance=1e-10))
+    >>> print(numerix.allclose(free, assembled))
+    True
+
+    With `stencil`, the matrix is stored by its offsets from the diagonal
+
+    >>> stencil = CellVariable(mesh=mesh, hasOld=True)
+    >>> stencil.constrain(1., where=mesh.facesLeft)
+    >>> stencilSolver = LinearPCGSolver(tolerance=1e-10, stencil=True)
+    >>> eq.solve(stencil, dt=1., solver=stencilSolver)
+    >>> print(stencilSolver.matrix.matrix.format)
+    dia
+    >>> print(numerix.allclose(stencil, assembled))
+    True
     """
 
+    _callbackArgs = {}
+
+    def __init__(self, tolerance=1e-15, iterations=2000, precon=None,
+                 reusePreconditioner=False, reuseIterations=None,
+                 matrixFree=False, stencil=False):
+        """
+        Parameters
+        ----------
+        tolerance : float
+            Required error tolerance.
+        iterations : int
+            Maximum number of iterative steps to perform.
+        precon
+            Preconditioner to use.
+        reusePreconditioner : bool
+            Whether to keep the preconditioner built for an earlier
+            matrix with the same sparsity pattern.
+        reuseIterations : int, optional
+            With `reusePreconditioner`, the preconditioner is rebuilt
+            after a solve that takes more than this many iterations.  By
+            default, twice the iterations of the first solve with the
+            current preconditioner.
+        matrixFree : bool
+            Whether to apply the operator directly from the face
+            coefficients of each term, rather than assembling a sparse
+            matrix.  Only available for a single scalar equation and
+            for preconditioners that only need the diagonal of the
+            matrix.
+        stencil : bool
+            Whether to store the matrix as one array for each offset
+            from the diagonal, rather than as CSR.  Uses less memory and
+            gives faster products for the 3, 5 and 7 point stencils of
+            uniform `Grid1D`, `Grid2D` and `Grid3D` meshes.  Only
+            available for `UniformGrid1D`, `UniformGrid2D` and
+            `UniformGrid3D`, as other meshes can couple their cells at
+            arbitrarily many offsets; solving on any other mesh raises
+            a `TypeError`.
+        """
+        super(_ScipyKrylovSolver, self).__init__(tolerance=tolerance,
+                                                 iterations=iterations,
+                                                 precon=precon)
+        self.reusePreconditioner = reusePreconditioner
+        self.reuseIterations = reuseIterations
+        self.matrixFree = matrixFree
+        self.stencil = stencil
+        self._M = None
+        self._bsr = None
+        self._preconditionedPattern = None
+        self._preconditionedIterations = None
+        self._rebuildPreconditioner = True
+
+    @property
+    def _matrixClass(self):
+        if self.matrixFree:
+            from fipy.matrices.scipyMatrixFree import _ScipyMatrixFreeMeshMatrix
+            return _ScipyMatrixFreeMeshMatrix
+        elif self.stencil:
+            from fipy.matrices.scipyStencilMatrix import _ScipyStencilMeshMatrix
+            return _ScipyStencilMeshMatrix
+        else:
+            return super(_ScipyKrylovSolver, self)._matrixClass
+
+    @staticmethod
+    def _pattern(A):
+        # a matrix-free operator always has the pattern of the mesh
+        return (A.shape,
+                getattr(A, "indptr", None),
+                getattr(A, "indices", None))
+
+    def _samePattern(self, A):
+        pattern = self._preconditionedPattern
+        return (pattern is not None
+                and pattern[0] == A.shape
+                and numerix.array_equal(pattern[1], getattr(A, "indptr", None))
+                and numerix.array_equal(pattern[2], getattr(A, "indices", None)))
+
+    def _getPreconditioner(self, A):
+        if self.preconditioner is None:
+            return None
+
+        if (not self.reusePreconditioner
+            or self._rebuildPreconditioner
+            or not self._samePattern(A)):
+
+            if hasattr(self.preconditioner, "_applyToSolver"):
+                # e.g., preconditioners that need the mesh
+                self._M = self.preconditioner._applyToSolver(solver=self, matrix=A)
+            else:
+                self._M = self.preconditioner._applyToMatrix(A)
+            shape, indptr, indices = self._pattern(A)
+            self._preconditionedPattern = (shape,
+                                           None if indptr is None else indptr.copy(),
+                                           None if indices is None else indices.copy())
+            self._preconditionedIterations = None
+            self._rebuildPreconditioner = False
+
+        return self._M
+
+    def _updateReuse(self, iterations):
+        """Decide whether the preconditioner needs rebuilding for the next solve
+        """
+        if self._preconditionedIterations is None:
+            self._preconditionedIterations = iterations
+
+        if self.reuseIterations is None:
+            threshold = 2 * max(self._preconditionedIterations, 1)
+        else:
+            threshold = self.reuseIterations
+
+        self._rebuildPreconditioner = iterations > threshold
+
     def _solve_(self, L, x, b):
-        A = L.matrix
+        blocks = getattr(L, "numberOfEquations", 1)
+        if (blocks > 1 and getattr(L, "numberOfVariables", 1) == blocks
+            and self.preconditioner is not None):
+            # coupled unknowns of each cell are preconditioned together.
+            # Without a preconditioner, the reordering would not change
+            # the iterations and the block products are slower than CSR.
+            A = L._CSR
+            if self._bsr is None or not self._bsr.matches(A):
+                self._bsr = L._BSRStructure()
+            order = self._bsr.rowOrder
+            xx = numerix.empty_like(x)
+            xx[order] = x
+            bb = numerix.empty_like(b)
+            bb[order] = b
+            return self._solveKrylov(self._bsr.convert(A), xx, bb)[order]
+        else:
+            return self._solveKrylov(L.matrix, x, b)
 
+    def _solveKrylov(self, A, x, b):
         self._log.debug("BEGIN precondition")
 
         with Timer() as t:
-            if self.preconditioner is None:
-                M = None
-            else:
-                M = self.preconditioner._applyToMatrix(A)
+            M = self._getPreconditioner(A)
 
         self._log.debug("END precondition - {} ns".format(t.elapsed))
 
         self._log.debug("BEGIN solve")
 
+        iterations = [0]
+        def callback(*args):
+            iterations[0] += 1
+
         with Timer() as t:
             x, info = self.solveFnc(A, b, x,
                                     rtol=self.tolerance,
                                     maxiter=self.iterations,
                                     M=M,
-                                    atol=0.0)
+                                    atol=0.0,
+                                    callback=callback,
+                                    **self._callbackArgs)
 
         self._log.debug("END solve - {} ns".format(t.elapsed))
 
+        self._log.debug('iterations: %d / %d', iterations[0], self.iterations)
+
         if info < 0:
             self._log.debug('failure: %s', self._warningList[info].__class__.__name__)
 
+        if M is not None:
+            self._updateReuse(iterations[0])
+
         return x
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -1,12 +1,26 @@
 from __future__ import unicode_literals
 __all__ = []
 
-from fipy.tests.lateImportTest import _LateImportTestSuite
+from fipy.tests.doctestPlus import _LateImportDocTestSuite
 import fipy.tests.testProgram
+from fipy.solvers import solver_suite
+
+docTestModuleNames = ('newtonSolver',)
+
+if solver_suite == 'scipy':
+    docTestModuleNames += ('scipy.linearLUSolver',
+                           'scipy.scipyKrylovSolver',
+                           'scipy.linearMultigridSolver',
+                           'scipy.preconditioners.blockJacobiPreconditioner',
+                           'scipy.preconditioners.fieldSplitPreconditioner',
+                           'scipy.preconditioners.multigridPreconditioner')
+elif solver_suite == 'petsc':
+    docTestModuleNames += ('petsc.petscSolver',
+                           'petsc.petscKrylovSolver')
 
 def _suite():
-    return _LateImportTestSuite(testModuleNames = (),
-                                base = __name__)
+    return _LateImportDocTestSuite(docTestModuleNames=docTestModuleNames,
+                                   base=__name__)
 
 if __name__ == '__main__':
     fipy.tests.testProgram.main(defaultTest='_suite')
@@ -1,6 +1,11 @@
-"""(Obsolete) utilities for iterating time steps
-
-Use `steppyngstounes <https://pages.nist.gov/steppyngstounes/en/latest>`_
+"""Utilities for iterating time steps
+
+:class:`~fipy.steppers.adaptiveStepper.AdaptiveStepper` chooses the size
+of each time step from an estimate of its error.
+:class:`~fipy.steppers.explicitStepper.ExplicitStepper` advances explicit
+equations with SSP Runge-Kutta stages.  The other steppers are
+obsolete; use :class:`~fipy.steppers.adaptiveStepper.AdaptiveStepper` or
+`steppyngstounes <https://pages.nist.gov/steppyngstounes/en/latest>`_
 instead.
 """
 from __future__ import division
@@ -10,10 +15,12 @@ __docformat__ = 'restructuredtext'
 from fipy.steppers.stepper import Stepper
 from fipy.steppers.pseudoRKQSStepper import PseudoRKQSStepper
 from fipy.steppers.pidStepper import PIDStepper
+from fipy.steppers.adaptiveStepper import AdaptiveStepper
+from fipy.steppers.explicitStepper import ExplicitStepper
 from fipy.tools.numerix import L1norm
 
 __all__ = ["L1error", "L2error", "LINFerror", "sweepMonotonic",
-           "error", "residual"]
+           "error", "residual", "AdaptiveStepper", "ExplicitStepper"]
 from future.utils import text_to_native_str
 __all__ = [text_to_native_str(n) for n in __all__]
 
@@ -0,0 +1,359 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+
+__all__ = ["AdaptiveStepper"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class AdaptiveStepper(object):
+    r"""Take implicit time steps of a size chosen by the error they incur
+
+    Each step sweeps the equations in `vardata` to convergence.  The
+    local error of the (first order, backward Euler) step is estimated
+    from its difference to a prediction extrapolated from the previous
+    step,
+
+    .. math::
+
+       \vec{e} \approx \frac{\Delta t_n}{\Delta t_n + \Delta t_{n-1}}
+       \left(\vec{x}_{n+1} - \vec{x}_n
+       - \frac{\Delta t_n}{\Delta t_{n-1}} (\vec{x}_n - \vec{x}_{n-1})\right)
+
+    which costs no additional solutions.  The error is scaled by
+    :math:`\mathtt{atol} + \mathtt{rtol} |\vec{x}_{n+1}|` and its RMS norm
+    :math:`E_n` over all the variables determines whether a step is
+    accepted (:math:`E_n \le 1`).  Rejected steps are reset to the old
+    values and retried with a smaller time step.  After an accepted step,
+    the next time step is chosen by a PID controller,
+
+    .. math::
+
+       \Delta t_{n+1} = \Delta t_n
+       \left(\frac{E_{n-1}}{E_n}\right)^{k_P}
+       \left(\frac{1}{E_n}\right)^{k_I}
+       \left(\frac{E_{n-1}^2}{E_n E_{n-2}}\right)^{k_D}
+
+    and, when the sweeps are checked against a `sweepTolerance`, it is
+    kept from growing after a step that needed more than `targetSweeps`
+    sweeps to converge.  A step whose sweeps do not
+    converge within `sweeps` is rejected and retried with half the time
+    step.
+
+    The first step has no history to estimate its error from, so it is
+    taken with the initial time step `dt`.
+
+    Relaxation of a step to steady state
+
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, DiffusionTerm
+    >>> mesh = Grid1D(nx=50, dx=1. / 50)
+    >>> x = mesh.cellCenters[0]
+    >>> def problem():
+    ...     phi = CellVariable(mesh=mesh, value=(x > 0.5) * 1., hasOld=True)
+    ...     phi.constrain(0., where=mesh.facesLeft)
+    ...     phi.constrain(0., where=mesh.facesRight)
+    ...     return phi, TransientTerm() == DiffusionTerm()
+
+    decays quickly at first and then ever more slowly, so the steps grow
+
+    >>> phi, eq = problem()
+    >>> stepper = AdaptiveStepper(vardata=((phi, eq, ()),), dt=1e-5,
+    ...                           rtol=1e-2, atol=1e-4)
+    >>> while stepper.elapsed < 0.1:
+    ...     dt = stepper.step(until=0.1)
+    >>> print(numerix.allclose(stepper.elapsed, 0.1))
+    True
+    >>> print(stepper.accepted < 100)
+    True
+
+    The solution agrees with one taken in many more small steps to
+    within the accuracy of the first order steps
+
+    >>> psi, eq = problem()
+    >>> for step in range(1000):
+    ...     psi.updateOld()
+    ...     eq.solve(var=psi, dt=1e-4)
+    >>> print(numerix.allclose(phi, psi, atol=1e-2))
+    True
+
+    A time step that is too large is rejected and the variables are
+    reset before it is retried
+
+    >>> phi, eq = problem()
+    >>> stepper = AdaptiveStepper(vardata=((phi, eq, ()),), dt=1e-5,
+    ...                           rtol=1e-2, atol=1e-4)
+    >>> dt = stepper.step()
+    >>> start = phi.copy()
+    >>> stepper.dt = 1e-1
+    >>> dt = stepper.step()
+    >>> print(stepper.rejected > 0, dt < 1e-1)
+    True True
+    >>> psi, eq = problem()
+    >>> psi.value = start
+    >>> psi.updateOld()
+    >>> eq.solve(var=psi, dt=dt)
+    >>> print(numerix.allclose(phi, psi))
+    True
+
+    Coupled equations are swept together by giving their variables as
+    a tuple
+
+    >>> from fipy import ImplicitSourceTerm
+    >>> u = CellVariable(mesh=mesh, value=1., hasOld=True)
+    >>> v = CellVariable(mesh=mesh, value=0., hasOld=True)
+    >>> eq = ((TransientTerm(var=u) == DiffusionTerm(var=u) - ImplicitSourceTerm(coeff=v, var=u))
+    ...       & (TransientTerm(var=v) == DiffusionTerm(var=v) + u**2 - ImplicitSourceTerm(coeff=1., var=v)))
+    >>> stepper = AdaptiveStepper(vardata=(((u, v), eq, ()),), dt=1e-3,
+    ...                           sweeps=10, sweepTolerance=1e-8)
+    >>> while stepper.elapsed < 1.:
+    ...     dt = stepper.step(until=1.)
+    >>> print(numerix.allclose(stepper.elapsed, 1.))
+    True
+    >>> print(stepper.accepted < 100)
+    True
+
+    The residual after the last of the `sweeps` is also checked, so a
+    linear equation converges in a single sweep
+
+    >>> phi, eq = problem()
+    >>> stepper = AdaptiveStepper(vardata=((phi, eq, ()),), dt=1e-5,
+    ...                           rtol=1e-2, atol=1e-4,
+    ...                           sweeps=1, sweepTolerance=1e-6)
+    >>> while stepper.elapsed < 0.1:
+    ...     dt = stepper.step(until=0.1)
+    >>> print(numerix.allclose(stepper.elapsed, 0.1))
+    True
+    >>> print(stepper.accepted < 100, stepper.rejected < stepper.accepted)
+    True True
+
+    Without a `sweepTolerance`, every step takes all of its `sweeps`,
+    which does not keep the time step from growing
+
+    >>> phi, eq = problem()
+    >>> stepper = AdaptiveStepper(vardata=((phi, eq, ()),), dt=1e-4,
+    ...                           rtol=1e-2, atol=1e-4, sweeps=2)
+    >>> steps = [stepper.step() for i in range(20)]
+    >>> print(stepper.dt > 5 * min(steps))
+    True
+    """
+
+    def __init__(self, vardata=(), dt=1., dtMin=0., dtMax=None,
+                 rtol=1e-3, atol=1e-6, sweeps=1, sweepTolerance=None,
+                 targetSweeps=None, proportional=0.075, integral=0.175,
+                 derivative=0.01, solver=None):
+        """
+        Parameters
+        ----------
+        vardata : tuple of tuple
+            `(var, eqn, boundaryConditions)` for each equation to sweep,
+            where `var` is a `CellVariable` with an old value, or, for
+            coupled equations, a tuple of them.
+        dt : float
+            The first time step to try.
+        dtMin : float
+            The smallest time step allowed.
+        dtMax : float, optional
+            The largest time step allowed.
+        rtol, atol : float
+            Relative and absolute tolerance of the local error of each
+            step.
+        sweeps : int
+            Maximum number of sweeps of each step.
+        sweepTolerance : float, optional
+            The sweeps of a step have converged when the residual falls
+            below this value.  If `None`, exactly `sweeps` sweeps are
+            taken.
+        targetSweeps : int, optional
+            The time step is not allowed to grow after a step that
+            needed more sweeps than this to reach `sweepTolerance`
+            (default: half of `sweeps`).  Ignored if `sweepTolerance` is
+            `None`.
+        proportional, integral, derivative : float
+            Exponents of the PID controller.
+        solver : ~fipy.solvers.solver.Solver, optional
+            Linear solver for the sweeps.
+        """
+        self.vardata = vardata
+        self.dt = dt
+        self.dtMin = dtMin
+        self.dtMax = dtMax
+        self.rtol = rtol
+        self.atol = atol
+        self.sweeps = sweeps
+        self.sweepTolerance = sweepTolerance
+        self.targetSweeps = targetSweeps or max(sweeps // 2, 1)
+        self.proportional = proportional
+        self.integral = integral
+        self.derivative = derivative
+        self.solver = solver
+
+        self.elapsed = 0.
+        self.accepted = 0
+        self.rejected = 0
+
+        self._errors = [1., 1., 1.]
+        self._previous = None
+        self._dtPrev = None
+
+    @property
+    def _variables(self):
+        variables = []
+        for var, eqn, bcs in self.vardata:
+            if isinstance(var, (tuple, list)):
+                variables.extend(var)
+            else:
+                variables.append(var)
+        return variables
+
+    def _sweep(self, dt):
+        """Sweep the equations of a step
+
+        Returns
+        -------
+        int or None
+            The number of sweeps taken, or `None` if they did not
+            converge.
+        """
+        for sweep in range(self.sweeps):
+            residual = 0.
+            for var, eqn, bcs in self.vardata:
+                if isinstance(var, (tuple, list)):
+                    var = None
+                residual = max(residual,
+                               eqn.sweep(var=var, dt=dt,
+                                         boundaryConditions=bcs,
+                                         solver=self.solver))
+
+            if (self.sweepTolerance is not None
+                and sweep > 0
+                and residual <= self.sweepTolerance):
+                return sweep + 1
+
+        if self.sweepTolerance is None:
+            return self.sweeps
+
+        # each sweep returns the residual of the values it started from,
+        # so the values of the last sweep must be checked separately
+        residual = 0.
+        for var, eqn, bcs in self.vardata:
+            if isinstance(var, (tuple, list)):
+                var = None
+            residual = max(residual,
+                           eqn.residualVectorAndNorm(var=var, dt=dt,
+                                                     boundaryConditions=bcs,
+                                                     solver=self.solver)[1])
+
+        if residual <= self.sweepTolerance:
+            return self.sweeps
+        else:
+            return None
+
+    def _error(self, dt, old):
+        """Scaled RMS norm of the local error of the step just taken
+        """
+        if self._previous is None:
+            return None
+
+        error = 0.
+        count = 0
+        for var, old, older in zip(self._variables, old, self._previous):
+            value = numerix.array(var.value)
+            predicted = old + (dt / self._dtPrev) * (old - older)
+            local = (dt / (dt + self._dtPrev)) * (value - predicted)
+            scaled = local / (self.atol + self.rtol * abs(value))
+            error += numerix.sum(scaled**2)
+            count += scaled.size
+
+        return numerix.sqrt(error / count)
+
+    def _limit(self, dt):
+        if self.dtMax is not None:
+            dt = min(dt, self.dtMax)
+        dt = max(dt, self.dtMin)
+        if self.elapsed + dt == self.elapsed:
+            raise FloatingPointError("step size underflow: %g + %g == %g" % (self.elapsed, dt, self.elapsed))
+        return dt
+
+    def _reject(self):
+        self.rejected += 1
+        for var in self._variables:
+            var._resetToOld()
+
+    def step(self, until=None):
+        """Take one accepted time step
+
+        Parameters
+        ----------
+        until : float, optional
+            Time not to step beyond.  A step that is shortened to reach
+            it does not change the time step tried next.
+
+        Returns
+        -------
+        float
+            The size of the step taken.
+        """
+        for var in self._variables:
+            var.updateOld()
+        old = [numerix.array(var.old.value) for var in self._variables]
+
+        dtTry = self._limit(self.dt)
+        while True:
+            dt = dtTry
+            if until is not None and self.elapsed + dt > until:
+                dt = until - self.elapsed
+
+            taken = self._sweep(dt)
+            if taken is None:
+                if dt <= self.dtMin:
+                    raise FloatingPointError("sweeps do not converge with the smallest time step %g" % dt)
+                self._reject()
+                dtTry = self._limit(dt / 2.)
+                continue
+
+            error = self._error(dt, old)
+            if error is not None and error > 1. and dt > self.dtMin:
+                self._reject()
+                dtTry = self._limit(dt * max(0.9 / numerix.sqrt(error), 0.2))
+                continue
+
+            break
+
+        if error is None:
+            dtNext = dtTry
+        else:
+            error = max(error, 1e-10)
+            self._errors = [self._errors[1], self._errors[2], error]
+            e0, e1, e2 = self._errors
+            factor = ((e1 / e2)**self.proportional
+                      * (1. / e2)**self.integral
+                      * (e1**2 / (e2 * e0))**self.derivative)
+            factor = min(max(factor, 0.2), 5.)
+            if self.sweepTolerance is not None and taken > self.targetSweeps:
+                # a fixed number of sweeps says nothing about how hard
+                # the step was to converge
+                factor = min(factor, 1.)
+            dtNext = dt * factor
+            if dt < dtTry:
+                # shortened to reach `until`
+                dtNext = max(dtNext, dtTry)
+
+        self._previous = old
+        self._dtPrev = dt
+
+        self.dt = dtNext
+        self.elapsed += dt
+        self.accepted += 1
+
+        return dt
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
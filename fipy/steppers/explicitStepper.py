@@ -0,0 +1,228 @@
+from __future__ import division
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+from fipy.tools import numerix
+
+__all__ = ["ExplicitStepper"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+class ExplicitStepper(object):
+    r"""Take explicit, strong stability preserving Runge-Kutta time steps
+
+    The equation
+
+    .. math::
+
+       \frac{\partial (\rho \phi)}{\partial t} = f(\phi)
+
+    is advanced with the Shu-Osher form of the SSP Runge-Kutta schemes,
+    each stage of which is a convex combination of the value at the
+    start of the step and a forward Euler step from the previous stage,
+
+    .. math::
+
+       \phi^{(i)} = \alpha_i \phi^n
+       + (1 - \alpha_i) \left(\phi^{(i-1)} + \Delta t f(\phi^{(i-1)}) / \rho\right)
+
+    so each stage is as stable as forward Euler under the same time step
+    restriction.  The rate of change :math:`f` is evaluated by building
+    every term of the equation at the stage value and taking
+    :math:`\vec{b} - \mathsf{L}\vec{\phi}`.  The terms are built with the
+    matrix-free face operator of
+    :mod:`~fipy.matrices.scipyMatrixFree`, so no sparse matrix is
+    assembled and no linear system is solved.  Implicit terms in the
+    equation are simply evaluated explicitly.
+
+    First order upwind advection of a level set
+
+    >>> from fipy import CellVariable, Grid1D, TransientTerm, AdvectionTerm
+    >>> mesh = Grid1D(nx=100, dx=1. / 100)
+    >>> x = mesh.cellCenters[0]
+    >>> def problem():
+    ...     var = CellVariable(mesh=mesh, value=x - 0.25, hasOld=True)
+    ...     return var, TransientTerm() + AdvectionTerm(1.)
+
+    advances just as solving the explicit equation does
+
+    >>> var, eq = problem()
+    >>> stepper = ExplicitStepper(var=var, equation=eq, order=1)
+    >>> for step in range(10):
+    ...     dt = stepper.step(dt=0.005)
+    >>> print(numerix.allclose(stepper.elapsed, 0.05))
+    True
+    >>> phi, eq = problem()
+    >>> for step in range(10):
+    ...     phi.updateOld()
+    ...     eq.solve(var=phi, dt=0.005)
+    >>> print(numerix.allclose(var, phi))
+    True
+
+    and leaves the old value at the start of the last step
+
+    >>> print(numerix.allclose(var.old, phi.old))
+    True
+
+    The higher order schemes are accurate to their order in time
+
+    >>> from fipy import ImplicitSourceTerm
+    >>> mesh = Grid1D(nx=1)
+    >>> def error(order, steps):
+    ...     var = CellVariable(mesh=mesh, value=1., hasOld=True)
+    ...     eq = TransientTerm(coeff=2.) == -ImplicitSourceTerm(coeff=1.)
+    ...     stepper = ExplicitStepper(var=var, equation=eq, order=order)
+    ...     for step in range(steps):
+    ...         dt = stepper.step(dt=1. / steps)
+    ...     return abs(var.value[0] - numerix.exp(-0.5))
+    >>> for order in (1, 2, 3):
+    ...     print("%.0f" % (error(order, 20) / error(order, 40)))
+    2
+    4
+    8
+
+    Explicit diffusion from a fixed value
+
+    >>> from fipy import ExplicitDiffusionTerm, DiffusionTerm, FixedValue
+    >>> mesh = Grid1D(nx=20, dx=1. / 20)
+    >>> bcs = (FixedValue(faces=mesh.facesLeft, value=1.),)
+    >>> def problem(Term):
+    ...     var = CellVariable(mesh=mesh, value=0., hasOld=True)
+    ...     return var, TransientTerm() == Term()
+    >>> var, eq = problem(ExplicitDiffusionTerm)
+    >>> stepper = ExplicitStepper(var=var, equation=eq, boundaryConditions=bcs)
+    >>> for step in range(100):
+    ...     dt = stepper.step(dt=0.001)
+
+    is much closer to a solution with small implicit steps than
+    forward Euler is
+
+    >>> phi, eq = problem(ExplicitDiffusionTerm)
+    >>> for step in range(100):
+    ...     phi.updateOld()
+    ...     eq.solve(var=phi, dt=0.001, boundaryConditions=bcs)
+    >>> psi, eq = problem(DiffusionTerm)
+    >>> for step in range(1000):
+    ...     psi.updateOld()
+    ...     eq.solve(var=psi, dt=0.0001, boundaryConditions=bcs)
+    >>> print(max(abs(var - psi)) < max(abs(phi - psi)) / 5)
+    True
+
+    Only the scheme orders described above are available
+
+    >>> ExplicitStepper(var=var, equation=eq, order=4)
+    Traceback (most recent call last):
+        ...
+    ValueError: SSP Runge-Kutta schemes are only available for orders 1, 2 and 3
+    """
+
+    # weight of the value at the start of the step in each stage
+    _stageWeights = {
+        1: (0.,),
+        2: (0., 1. / 2),
+        3: (0., 3. / 4, 1. / 3)
+    }
+
+    def __init__(self, var, equation, boundaryConditions=(), order=3):
+        """
+        Parameters
+        ----------
+        var : ~fipy.variables.cellVariable.CellVariable
+            The variable to advance.  It must have an old value.
+        equation : ~fipy.terms.term.Term
+            The equation to advance, which must include a `TransientTerm`.
+        boundaryConditions : :obj:`tuple` of :obj:`~fipy.boundaryConditions.boundaryCondition.BoundaryCondition`
+        order : int
+            Order of accuracy in time of the SSP Runge-Kutta scheme: 1
+            (forward Euler), 2 or 3.
+        """
+        if order not in self._stageWeights:
+            raise ValueError("SSP Runge-Kutta schemes are only available for orders 1, 2 and 3")
+
+        if var.mesh.communicator.Nproc > 1:
+            raise Exception("ExplicitStepper cannot be used with multiple processors")
+
+        if type(boundaryConditions) not in (type(()), type([])):
+            boundaryConditions = (boundaryConditions,)
+
+        self.var = equation._verifyVar(var)
+        self.equation = equation
+        self.boundaryConditions = boundaryConditions
+        self.order = order
+
+        self.elapsed = 0.
+
+    @property
+    def _matrixClass(self):
+        if self.equation._vectorSize(self.var) == 1:
+            try:
+                from fipy.matrices.scipyMatrixFree import _ScipyMatrixFreeMeshMatrix
+                return _ScipyMatrixFreeMeshMatrix
+            except ImportError:
+                pass
+
+        solver = self.equation.getDefaultSolver(self.var, None)
+        return self.equation._getMatrixClass(solver, self.var)
+
+    def _rate(self, value, dt):
+        r"""The rate of change :math:`f(\phi) / \rho` at `value`
+        """
+        var = self.var
+        var.old.value = value
+        var.value = value
+
+        transientGeomCoeff = self.equation._getTransientGeomCoeff(var)
+        if transientGeomCoeff is None:
+            from fipy.terms import TransientTermError
+            raise TransientTermError
+
+        for bc in self.boundaryConditions:
+            bc._resetBoundaryConditionApplied()
+
+        var, L, b = self.equation._buildAndAddMatrices(var,
+                                                       self._matrixClass,
+                                                       boundaryConditions=self.boundaryConditions,
+                                                       dt=dt,
+                                                       transientGeomCoeff=transientGeomCoeff,
+                                                       diffusionGeomCoeff=self.equation._getDiffusionGeomCoeff(var),
+                                                       buildExplicitIfOther=self.equation._buildExplcitIfOther)
+
+        rate = numerix.asarray(b) - L * numerix.ravel(value)
+
+        return numerix.reshape(rate, value.shape) / numerix.array(transientGeomCoeff)
+
+    def step(self, dt):
+        """Take one time step
+
+        Parameters
+        ----------
+        dt : float
+            Time step size.
+
+        Returns
+        -------
+        float
+            The size of the step taken.
+        """
+        start = numerix.array(self.var.value, dtype=float)
+        value = start
+
+        for weight in self._stageWeights[self.order]:
+            value = (weight * start
+                     + (1 - weight) * (value + dt * self._rate(value, dt)))
+
+        self.var.old.value = start
+        self.var.value = value
+
+        self.elapsed += dt
+
+        return dt
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
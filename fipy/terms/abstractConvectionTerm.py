@@ -156,12 +156,7 @@ class _AbstractConvectionTerm(FaceTerm):
             if (len(coeffShape) == 0) or (coeffShape[0] != var.mesh.dim):
                 raise VectorCoeffError
 
-    def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
-
-        var, L, b = FaceTerm._buildMatrix(self, var, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
-
-##        if var.rank != 1:
-
+    def _getConstraints(self, var, transientGeomCoeff=None, diffusionGeomCoeff=None):
         mesh = var.mesh
 
         if (not hasattr(self, 'constraintL')) or (not hasattr(self, 'constraintB')):
@@ -188,12 +183,7 @@ class _AbstractConvectionTerm(FaceTerm):
                 (alpha_constraint - 1) * var.arithmeticFaceValue + (alpha - 1)  * dvar * var.faceGrad.constraintMask
             )
 
-
-        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-        L.addAt(numerix.array(self.constraintL).ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
-        b += numerix.reshape(self.constraintB.value, ids.shape).sum(0).ravel()
-
-        return (var, L, b)
+        return self.constraintL, self.constraintB
 
 
     def _test(self):
@@ -192,10 +192,9 @@ class _AbstractDiffusionTerm(_UnaryTerm):
         facesPerCell = mesh._facesPerCell[..., mesh._localNonOverlappingCellIDs]
         coefficientMatrix = SparseMatrix(mesh=mesh, nonZerosPerRow=facesPerCell + 1)
         interiorCoeff = numerix.take(coeff, interiorFaces, axis=-1).ravel()
-        coefficientMatrix.addAt(interiorCoeff, id1.ravel(), id1.swapaxes(0, 1).ravel())
-        coefficientMatrix.addAt(-interiorCoeff, id1.ravel(), id2.swapaxes(0, 1).ravel())
-        coefficientMatrix.addAt(-interiorCoeff, id2.ravel(), id1.swapaxes(0, 1).ravel())
-        coefficientMatrix.addAt(interiorCoeff, id2.ravel(), id2.swapaxes(0, 1).ravel())
+        coefficientMatrix._addAtFaces(id1, id2,
+                                      interiorCoeff, -interiorCoeff,
+                                      -interiorCoeff, interiorCoeff)
 
 ##         print 'coefficientMatrix',coefficientMatrix
 ##         raw_input('stopped')
@@ -285,7 +284,6 @@ class _AbstractDiffusionTerm(_UnaryTerm):
 
         """
 
-        var, L, b = self.__higherOrderbuildMatrix(var, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
         mesh = var.mesh
 
         if self.order == 2:
@@ -320,11 +318,43 @@ class _AbstractDiffusionTerm(_UnaryTerm):
                 self.constraintL = -constrainedNormalsDotCoeffOverdAP.divergence * mesh.cellVolumes
 
             ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
-            L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
-            b += numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
+
+            def build():
+                _, L, b = self.__higherOrderbuildMatrix(var, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+                L.addAt(self.constraintL.ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
+                return L, b
+
+            def dependencies():
+                deps = self.__coeffDictDependencies()
+                if deps is not None:
+                    deps = deps + [self.constraintL]
+                return deps
+
+            L, b = self._cachedContribution(build=build,
+                                            dependencies=dependencies,
+                                            var=var,
+                                            SparseMatrix=SparseMatrix,
+                                            boundaryConditions=boundaryConditions,
+                                            dt=dt)
+
+            # the constrained values change with `var`, so they are
+            # added to a copy of the cached vector
+            b = b + numerix.reshape(self.constraintB.ravel(), ids.shape).sum(-2).ravel()
+        else:
+            var, L, b = self.__higherOrderbuildMatrix(var, SparseMatrix, boundaryConditions=boundaryConditions, dt=dt, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
 
         return (var, L, b)
 
+    def __coeffDictDependencies(self):
+        if not hasattr(self, 'coeffDict'):
+            return None
+
+        dependencies = list(self.coeffDict.values())
+        if hasattr(self, 'anisotropySource'):
+            dependencies.append(self.anisotropySource)
+
+        return dependencies
+
     def __higherOrderbuildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
         mesh = var.mesh
 
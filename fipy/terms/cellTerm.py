@@ -118,19 +118,35 @@ class CellTerm(_NonDiffusionTerm):
         L.addAt(coeffVectors['new value'].ravel() / dt, ids.ravel(), ids.swapaxes(0, 1).ravel())
         L.addAt(coeffVectors['diagonal'].ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
 
+    def _coeffVectorDependencies(self, var):
+        if self.coeffVectors is None or var is not self._var:
+            return None
+        else:
+            return list(self.coeffVectors.values()) + [var.old]
+
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
 
-        b = numerix.zeros(var.shape, 'd').ravel()
-        L = SparseMatrix(mesh=var.mesh, nonZerosPerRow=1)
+        def build():
+            b = numerix.zeros(var.shape, 'd').ravel()
+            L = SparseMatrix(mesh=var.mesh, nonZerosPerRow=1)
 
-        coeffVectors = self._getCoeffVectors_(var=var, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
+            coeffVectors = self._getCoeffVectors_(var=var, transientGeomCoeff=transientGeomCoeff, diffusionGeomCoeff=diffusionGeomCoeff)
 
-        dt = self._checkDt(dt)
+            checkedDt = self._checkDt(dt)
 
-        if inline.doInline and var.rank == 0:
-            self._buildMatrixInline_(L=L, oldArray=var.old, b=b, dt=dt, coeffVectors=coeffVectors)
-        else:
-            self._buildMatrixNoInline_(L=L, oldArray=var.old, b=b, dt=dt, coeffVectors=coeffVectors)
+            if inline.doInline and var.rank == 0:
+                self._buildMatrixInline_(L=L, oldArray=var.old, b=b, dt=checkedDt, coeffVectors=coeffVectors)
+            else:
+                self._buildMatrixNoInline_(L=L, oldArray=var.old, b=b, dt=checkedDt, coeffVectors=coeffVectors)
+
+            return L, b
+
+        L, b = self._cachedContribution(build=build,
+                                        dependencies=lambda: self._coeffVectorDependencies(var),
+                                        var=var,
+                                        SparseMatrix=SparseMatrix,
+                                        boundaryConditions=boundaryConditions,
+                                        dt=dt)
 
         return (var, L, b)
 
@@ -41,10 +41,11 @@ class FaceTerm(_NonDiffusionTerm):
         id1 = self._reshapeIDs(var, id1)
         id2 = self._reshapeIDs(var, id2)
 
-        L.addAt(numerix.take(coeffMatrix['cell 1 diag'], interiorFaces, axis=-1).ravel(), id1.ravel(), id1.swapaxes(0, 1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 1 offdiag'], interiorFaces, axis=-1).ravel(), id1.ravel(), id2.swapaxes(0, 1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 2 offdiag'], interiorFaces, axis=-1).ravel(), id2.ravel(), id1.swapaxes(0, 1).ravel())
-        L.addAt(numerix.take(coeffMatrix['cell 2 diag'], interiorFaces, axis=-1).ravel(), id2.ravel(), id2.swapaxes(0, 1).ravel())
+        L._addAtFaces(id1, id2,
+                      numerix.take(coeffMatrix['cell 1 diag'], interiorFaces, axis=-1).ravel(),
+                      numerix.take(coeffMatrix['cell 1 offdiag'], interiorFaces, axis=-1).ravel(),
+                      numerix.take(coeffMatrix['cell 2 offdiag'], interiorFaces, axis=-1).ravel(),
+                      numerix.take(coeffMatrix['cell 2 diag'], interiorFaces, axis=-1).ravel())
 
         N = mesh.numberOfCells
         M = mesh._maxFacesPerCell
@@ -129,6 +130,18 @@ class FaceTerm(_NonDiffusionTerm):
             vector.putAdd(b, id1, -(cell1diag * oldArrayId1 + cell1offdiag * oldArrayId2))
             vector.putAdd(b, id2, -(cell2diag * oldArrayId2 + cell2offdiag * oldArrayId1))
 
+    def _getConstraints(self, var, transientGeomCoeff=None, diffusionGeomCoeff=None):
+        """Contributions of the constraints on `var`
+
+        Returns
+        -------
+        constraintL : ~fipy.variables.cellVariable.CellVariable
+            Added to the diagonal of the matrix, or `None`.
+        constraintB : ~fipy.variables.cellVariable.CellVariable
+            Added to the right-hand-side vector, or `None`.
+        """
+        return None, None
+
     def _buildMatrix(self, var, SparseMatrix, boundaryConditions=(), dt=None, transientGeomCoeff=None, diffusionGeomCoeff=None):
         """Implicit portion considers
         """
@@ -139,16 +152,45 @@ class FaceTerm(_NonDiffusionTerm):
         id1 = numerix.take(id1, interiorFaces)
         id2 = numerix.take(id2, interiorFaces)
 
-        b = numerix.zeros(var.shape, 'd').ravel()
-        facesPerCell = mesh._facesPerCell[..., mesh._localNonOverlappingCellIDs]
-        L = SparseMatrix(mesh=mesh, nonZerosPerRow=facesPerCell + 1)
-
         weight = self._getWeight(var, transientGeomCoeff, diffusionGeomCoeff)
 
-        if 'implicit' in weight:
-            self._implicitBuildMatrix_(SparseMatrix, L, id1, id2, b, weight['implicit'], var, boundaryConditions, interiorFaces, dt)
+        constraintL, constraintB = self._getConstraints(var, transientGeomCoeff, diffusionGeomCoeff)
+        ids = self._reshapeIDs(var, numerix.arange(mesh.numberOfCells))
+
+        def build():
+            b = numerix.zeros(var.shape, 'd').ravel()
+            facesPerCell = mesh._facesPerCell[..., mesh._localNonOverlappingCellIDs]
+            L = SparseMatrix(mesh=mesh, nonZerosPerRow=facesPerCell + 1)
+
+            if 'implicit' in weight:
+                self._implicitBuildMatrix_(SparseMatrix, L, id1, id2, b, weight['implicit'], var, boundaryConditions, interiorFaces, dt)
+
+            if 'explicit' in weight:
+                self._explicitBuildMatrix_(SparseMatrix, var.old, id1, id2, b, weight['explicit'], var, boundaryConditions, interiorFaces, dt)
+
+            if constraintL is not None:
+                L.addAt(numerix.array(constraintL).ravel(), ids.ravel(), ids.swapaxes(0, 1).ravel())
+
+            return L, b
+
+        def dependencies():
+            # explicit contributions are recalculated from the old values
+            # every time
+            if self.coeffMatrix is None or 'explicit' in weight:
+                return None
+            else:
+                return list(self.coeffMatrix.values()) + [constraintL]
+
+        L, b = self._cachedContribution(build=build,
+                                        dependencies=dependencies,
+                                        var=var,
+                                        SparseMatrix=SparseMatrix,
+                                        boundaryConditions=boundaryConditions,
+                                        dt=dt)
 
-        if 'explicit' in weight:
-            self._explicitBuildMatrix_(SparseMatrix, var.old, id1, id2, b, weight['explicit'], var, boundaryConditions, interiorFaces, dt)
+        if constraintB is not None:
+            # the constrained values change with `var`, so they are
+            # added to a copy of the cached vector
+            b = b + numerix.reshape(constraintB.value, ids.shape).sum(0).ravel()
 
         return (var, L, b)
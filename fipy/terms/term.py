@@ -41,6 +41,7 @@ class Term(object):
         self._matrix = None
         self._cacheRHSvector = False
         self._RHSvector = None
+        self._contribution = None
         self.var = var
 
         self._log = logging.getLogger(self.__class__.__module__
@@ -76,6 +77,144 @@ class Term(object):
         else:
             self._RHSvector = None
 
+    @staticmethod
+    def _matrixSlot(SparseMatrix):
+        """Identify where in the global matrix `SparseMatrix` deposits entries
+
+        `OffsetSparseMatrix` classes are generated afresh for every solve,
+        so they are identified by their base class, their block layout and
+        their current block offsets.
+        """
+        return (getattr(SparseMatrix, "_offsetBaseClass", SparseMatrix),
+                getattr(SparseMatrix, "_offsetBlocks", None),
+                getattr(SparseMatrix, "equationIndex", None),
+                getattr(SparseMatrix, "varIndex", None))
+
+    def _cachedContribution(self, build, dependencies, var, SparseMatrix, boundaryConditions=(), dt=None):
+        """Reuse the last `(L, b)` contribution if none of its inputs changed
+
+        Parameters
+        ----------
+        build : callable
+            Assembles and returns a fresh `(L, b)` pair.
+        dependencies : callable
+            Returns the coefficient `Variable` objects that `build` reads,
+            or `None` if they are not known (yet), in which case the
+            contribution is always rebuilt.
+        var : ~fipy.variables.cellVariable.CellVariable
+            Solution variable.
+        SparseMatrix : ~fipy.matrices.sparseMatrix.SparseMatrix
+            Class of the matrix to build.
+        boundaryConditions : tuple
+            Old-style `BoundaryCondition` objects track whether they have
+            been applied, so no contribution that involves them is reused.
+        dt : float
+            Time step.
+
+        Returns
+        -------
+        L : ~fipy.matrices.sparseMatrix.SparseMatrix
+            The matrix, which may be the cached one, so callers must add
+            it into a matrix of their own rather than modify it.
+        b : ndarray
+            The right-hand-side vector, which may also be cached.
+
+        The contribution is only reused while the term is rebuilt for the
+        same solution variable, matrix slot and time step, and while none
+        of the independent `Variable` objects that the `dependencies`
+        derive from have been assigned a new value.  A contribution is
+        only kept once it has been rebuilt from unchanged inputs, so terms
+        whose coefficients change at every build don't hold on to one.
+
+        >>> from fipy import CellVariable, Grid1D, DiffusionTerm, DefaultSolver
+        >>> m = Grid1D(nx=3)
+        >>> v = CellVariable(mesh=m)
+        >>> D = CellVariable(mesh=m, value=1.)
+        >>> term = DiffusionTerm(coeff=D)
+        >>> SparseMatrix = DefaultSolver()._matrixClass
+        >>> builds = []
+        >>> def build():
+        ...     builds.append(None)
+        ...     L = SparseMatrix(mesh=m)
+        ...     L.addAtDiagonal(D.value)
+        ...     return L, numerix.array(D.value)
+        >>> def contribution():
+        ...     return term._cachedContribution(build, lambda: [D], v, SparseMatrix, dt=1.)
+        >>> L, b = contribution()
+        >>> print(term._contribution["contribution"])
+        None
+        >>> L, b = contribution()
+        >>> L, b = contribution()
+        >>> print(len(builds), b)
+        2 [ 1.  1.  1.]
+        >>> print(contribution()[0] is term._contribution["contribution"][0])
+        True
+
+        Changing the coefficient forces a rebuild and drops the cached
+        contribution, as does a different time step
+
+        >>> D.setValue(2.)
+        >>> L, b = contribution()
+        >>> print(len(builds), b, L.takeDiagonal())
+        3 [ 2.  2.  2.] [ 2.  2.  2.]
+        >>> print(term._contribution["contribution"])
+        None
+        >>> L, b = term._cachedContribution(build, lambda: [D], v, SparseMatrix, dt=0.5)
+        >>> print(len(builds))
+        4
+        """
+        if dt is not None:
+            dt = float(dt)
+        slot = self._matrixSlot(SparseMatrix)
+        bcs = tuple(boundaryConditions)
+
+        entry = getattr(self, "_contribution", None)
+
+        def sameDependencies(deps):
+            return (entry is not None
+                    and deps is not None
+                    and len(entry["dependencies"]) == len(deps)
+                    and all(a is b for a, b in zip(entry["dependencies"], deps)))
+
+        unchanged = (len(bcs) == 0
+                     and sameDependencies(dependencies())
+                     and not entry["monitor"].stale
+                     and entry["var"] is var
+                     and entry["slot"] == slot
+                     and entry["dt"] == dt)
+
+        if unchanged and entry["contribution"] is not None:
+            return entry["contribution"]
+
+        self._contribution = None
+        L, b = build()
+        deps = dependencies()
+        if deps is not None and len(bcs) == 0:
+            from fipy.variables.variable import Variable
+            if sameDependencies(deps):
+                monitor = entry["monitor"]
+            else:
+                monitor = Variable(value=0)
+                for leaf in _independentVariables(deps):
+                    monitor._requires(leaf)
+            monitor._markFresh()
+            # only keep a contribution that has been built twice from
+            # the same inputs
+            self._contribution = dict(var=var, slot=slot, dt=dt,
+                                      dependencies=list(deps),
+                                      monitor=monitor,
+                                      contribution=(L, b) if unchanged else None)
+
+        return L, b
+
+    def _sharesContribution(self, matrix):
+        """Whether `matrix` is the cached contribution of this term
+        """
+        entry = getattr(self, "_contribution", None)
+        return (entry is not None
+                and entry["contribution"] is not None
+                and entry["contribution"][0] is matrix)
+
     def _verifyVar(self, var):
         if var is None:
             if self.var is None:
@@ -140,6 +279,13 @@ class Term(object):
                                                     diffusionGeomCoeff=self._getDiffusionGeomCoeff(var),
                                                     buildExplicitIfOther=self._buildExplcitIfOther)
 
+            if self._sharesContribution(matrix):
+                # the solver may modify its matrix and vector in place
+                contribution = matrix
+                matrix = self._getMatrixClass(solver, var)(mesh=var.mesh)
+                matrix += contribution
+                RHSvector = numerix.array(RHSvector, copy=True)
+
             self._buildCache(matrix, RHSvector)
 
             solver._storeMatrix(var=var, matrix=matrix, RHSvector=RHSvector)
@@ -849,6 +995,31 @@ class Term(object):
 
         """
 
+def _independentVariables(variables):
+    """Find the `Variable` objects that do not derive from any other
+
+    Derived `Variable` objects are frequently not cached, so their
+    staleness says nothing about whether their inputs have changed. The
+    independent `Variable` objects at the root of their expression trees
+    are, in contrast, always marked when they are assigned a new value.
+    """
+    from fipy.variables.variable import Variable
+
+    independent = []
+    seen = set()
+    stack = [var for var in variables if isinstance(var, Variable)]
+    while stack:
+        var = stack.pop()
+        if id(var) in seen:
+            continue
+        seen.add(id(var))
+        if len(var.requiredVariables) > 0:
+            stack.extend(var.requiredVariables)
+        else:
+            independent.append(var)
+
+    return independent
+
 class __Term(Term):
     """
     Dummy subclass for tests
@@ -19,6 +19,7 @@ def _suite():
         'variables.test',
         'viewers.test',
         'boundaryConditions.test',
+        'steppers.test',
     ), base = __name__)
 
 if __name__ == '__main__':
@@ -0,0 +1,367 @@
+"""Fused evaluation of `_OperatorVariable` expression trees
+
+Evaluating an expression like ``D * (1 - phi)**2 + eps`` node by node
+allocates a new array for every intermediate result. When the
+intermediate nodes are not cached, nothing ever looks at those
+intermediate values again, so the whole subtree can instead be
+evaluated by a single generated kernel that writes each ufunc result
+into the storage of an operand that is no longer needed.
+
+The operator of each node is traced once by calling it with proxies that
+record the ufuncs applied to them. Nodes whose operators do anything but
+apply element-wise ufuncs (indexing, reductions, dot products, ...) are
+treated as opaque leaves. Kernels are generated from the traced program,
+cached on the structure of the tree and the types and shapes of its
+leaves, and reused whenever a tree of the same form is evaluated.
+
+    >>> from fipy import CellVariable, Grid1D
+    >>> m = Grid1D(nx=4)
+    >>> phi = CellVariable(mesh=m, value=(0., .25, .5, 1.))
+    >>> expr = 2 * (1 - phi)**2 + phi / 4
+    >>> print(numerix.allclose(expr, 2 * (1 - phi.value)**2 + phi.value / 4))
+    True
+
+The first evaluation determines how intermediate storage can be shared
+and generates the kernel, which is then reused
+
+    >>> _kernels.clear()
+    >>> expr.value  # doctest: +ELLIPSIS
+    array([...])
+    >>> print(len(_kernels))
+    1
+    >>> phi.value = (1., .5, .25, 0.)
+    >>> print(numerix.allclose(expr, 2 * (1 - phi.value)**2 + phi.value / 4))
+    True
+    >>> print(len(_kernels))
+    1
+
+Operators that cannot be traced are evaluated as usual
+
+    >>> grad = phi.grad[0] * (1 + phi)
+    >>> print(numerix.allclose(grad, phi.grad.value[0] * (1 + phi.value)))
+    True
+
+Pass ``--no-fusion`` or set :envvar:`FIPY_NO_FUSION` to evaluate every
+node separately.
+"""
+from __future__ import unicode_literals
+from builtins import object
+from builtins import range
+__docformat__ = 'restructuredtext'
+
+__all__ = ["doFusion"]
+from future.utils import text_to_native_str
+__all__ = [text_to_native_str(n) for n in __all__]
+
+import os
+import sys
+
+from fipy.tools import numerix
+
+if '--no-fusion' in [s.lower() for s in sys.argv[1:]]:
+    doFusion = False
+else:
+    doFusion = 'FIPY_NO_FUSION' not in os.environ
+
+_maxKernels = 256
+_kernels = {}
+
+class _Tracer(object):
+    """Stand-in for an operand that records the ufuncs applied to it
+
+    Parameters
+    ----------
+    ref : tuple
+        ``('in', i)`` for the `i`-th operand of the operator or
+        ``('step', k)`` for the result of the `k`-th recorded ufunc
+    steps : list
+        The ufuncs recorded so far, shared by all the tracers of an
+        operator
+    """
+    def __init__(self, ref, steps):
+        self.ref = ref
+        self.steps = steps
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != '__call__' or len(kwargs) > 0 or ufunc.nout != 1:
+            return NotImplemented
+
+        refs = []
+        for arg in inputs:
+            if isinstance(arg, _Tracer):
+                refs.append(arg.ref)
+            else:
+                refs.append(('const', arg))
+        self.steps.append((ufunc, tuple(refs)))
+
+        return _Tracer(('step', len(self.steps) - 1), self.steps)
+
+    def __bool__(self):
+        raise TypeError("the truth value of a traced operand is unknown")
+
+    __nonzero__ = __bool__
+
+def _binary(ufunc):
+    return (lambda self, other: ufunc(self, other),
+            lambda self, other: ufunc(other, self))
+
+for _name, _ufunc in [("add", numerix.add),
+                      ("sub", numerix.subtract),
+                      ("mul", numerix.multiply),
+                      ("truediv", numerix.true_divide),
+                      ("div", numerix.true_divide),
+                      ("floordiv", numerix.floor_divide),
+                      ("mod", numerix.remainder),
+                      ("pow", numerix.power),
+                      ("and", numerix.bitwise_and),
+                      ("or", numerix.bitwise_or),
+                      ("xor", numerix.bitwise_xor)]:
+    _op, _rop = _binary(_ufunc)
+    setattr(_Tracer, "__%s__" % _name, _op)
+    setattr(_Tracer, "__r%s__" % _name, _rop)
+
+for _name, _ufunc in [("lt", numerix.less),
+                      ("le", numerix.less_equal),
+                      ("eq", numerix.equal),
+                      ("ne", numerix.not_equal),
+                      ("gt", numerix.greater),
+                      ("ge", numerix.greater_equal)]:
+    setattr(_Tracer, "__%s__" % _name, _binary(_ufunc)[0])
+
+for _name, _ufunc in [("neg", numerix.negative),
+                      ("pos", numerix.positive),
+                      ("abs", numerix.absolute),
+                      ("invert", numerix.invert)]:
+    setattr(_Tracer, "__%s__" % _name, lambda self, ufunc=_ufunc: ufunc(self))
+
+_Tracer.__hash__ = object.__hash__
+
+def _trace(op, nargs):
+    """Record the ufuncs that `op` applies to its `nargs` operands
+
+        >>> steps = _trace(lambda a, b: numerix.exp(-a) * b + 2., 2)
+        >>> for ufunc, refs in steps:
+        ...     print(ufunc.__name__, refs)
+        negative (('in', 0),)
+        exp (('step', 0),)
+        multiply (('step', 1), ('in', 1))
+        add (('step', 2), ('const', 2.0))
+
+    Returns
+    -------
+    list or None
+        The recorded `(ufunc, refs)` steps, the last of which is the
+        result, or `None` if `op` does more than apply ufuncs.
+
+        >>> print(_trace(lambda a: a[0], 1))
+        None
+        >>> print(_trace(lambda a, b: numerix.dot(a, b), 2))
+        None
+        >>> print(_trace(lambda a: a, 1))
+        None
+    """
+    steps = []
+    try:
+        result = op(*[_Tracer(('in', i), steps) for i in range(nargs)])
+    except Exception:
+        return None
+
+    if (not isinstance(result, _Tracer)
+        or result.ref != ('step', len(steps) - 1)):
+        return None
+
+    return steps
+
+def _steps(node):
+    """Traced program of an `_OperatorVariable`, or `None`"""
+    if not hasattr(node, "_fusionSteps"):
+        node._fusionSteps = _trace(node.op, len(node.var))
+    return node._fusionSteps
+
+def _isFusible(node):
+    return (hasattr(node, "op")
+            and getattr(node, "canInline", False)
+            and not getattr(node, "return_scalar", False)
+            and len(node.constraints) == 0
+            and _steps(node) is not None)
+
+def _signature(value):
+    """Everything about a leaf value that affects the kernel"""
+    if type(value) is numerix.ndarray:
+        if value.ndim == 0:
+            return (value.dtype.str, (), numerix.min_scalar_type(value).str)
+        return (value.dtype.str, value.shape)
+    elif type(value) in (bool, int, float, complex):
+        return (type(value), numerix.min_scalar_type(value).str)
+    else:
+        return None
+
+class _Program(object):
+    """Flattened sequence of ufuncs over the leaves of a tree"""
+    def __init__(self):
+        self.leaves = []
+        self.leafSlots = {}
+        self.steps = []
+
+    def leaf(self, obj, value):
+        slot = self.leafSlots.get(id(obj))
+        if slot is None:
+            slot = len(self.leaves)
+            self.leafSlots[id(obj)] = slot
+            self.leaves.append((obj, value))
+        return ('leaf', slot)
+
+    def expand(self, node):
+        from fipy.variables.variable import Variable
+
+        inputs = []
+        for var in node.var:
+            if (isinstance(var, Variable)
+                and not var._isCached()
+                and _isFusible(var)):
+                inputs.append(self.expand(var))
+            elif isinstance(var, Variable):
+                inputs.append(self.leaf(var, var.value))
+            else:
+                inputs.append(self.leaf(var, var))
+
+        local = []
+        for ufunc, refs in _steps(node):
+            args = []
+            for kind, which in refs:
+                if kind == 'in':
+                    args.append(inputs[which])
+                elif kind == 'step':
+                    args.append(local[which])
+                else:
+                    args.append(self.leaf(which, which))
+            self.steps.append((ufunc, tuple(args)))
+            local.append(('tmp', len(self.steps) - 1))
+
+        return local[-1]
+
+    @property
+    def key(self):
+        signatures = tuple(_signature(value) for obj, value in self.leaves)
+        if None in signatures:
+            return None
+        return (tuple(self.steps), signatures)
+
+def _interpret(steps, leaves):
+    values = []
+    for ufunc, refs in steps:
+        values.append(ufunc(*[leaves[i] if kind == 'leaf' else values[i]
+                              for kind, i in refs]))
+    return values
+
+def _compile(steps, values):
+    """Generate a kernel for `steps`
+
+    `values` are the results of each step from a previous evaluation,
+    which determine whether a result can be written into an operand.
+
+        >>> steps = _trace(lambda a, b: numerix.exp(-a) * b + 2., 2)
+        >>> steps = [(u, tuple(('leaf', i) if k == 'in' else
+        ...                    ('tmp', i) if k == 'step' else
+        ...                    ('leaf', 2) for k, i in refs))
+        ...          for u, refs in steps]
+        >>> leaves = [numerix.array((0., 1.)), numerix.array((1., 2.)), 2.]
+        >>> kernel = _compile(steps, _interpret(steps, leaves))
+        >>> print(kernel.source) # doctest: +NORMALIZE_WHITESPACE
+        def _kernel(l0, l1, l2):
+            t0 = u0(l0)
+            u1(t0, out=t0)
+            u2(t0, l1, out=t0)
+            u3(t0, l2, out=t0)
+            return t0
+        >>> print(numerix.allclose(kernel(*leaves), numerix.exp(-leaves[0]) * leaves[1] + 2.))
+        True
+    """
+    lastUse = {}
+    for i, (ufunc, refs) in enumerate(steps):
+        for kind, j in refs:
+            if kind == 'tmp':
+                lastUse[j] = i
+
+    namespace = {}
+    ufuncNames = {}
+    names = []
+    lines = []
+    for i, (ufunc, refs) in enumerate(steps):
+        if ufunc not in ufuncNames:
+            ufuncNames[ufunc] = "u%d" % len(ufuncNames)
+            namespace[ufuncNames[ufunc]] = ufunc
+
+        args = []
+        out = None
+        for kind, j in refs:
+            if kind == 'leaf':
+                args.append("l%d" % j)
+            else:
+                args.append(names[j])
+                if (out is None
+                    and lastUse[j] == i
+                    and isinstance(values[j], numerix.ndarray)
+                    and isinstance(values[i], numerix.ndarray)
+                    and values[j].shape == values[i].shape
+                    and values[j].dtype == values[i].dtype):
+                    out = names[j]
+
+        if out is None:
+            names.append("t%d" % i)
+            lines.append("    %s = %s(%s)" % (names[i], ufuncNames[ufunc], ", ".join(args)))
+        else:
+            names.append(out)
+            lines.append("    %s(%s, out=%s)" % (ufuncNames[ufunc], ", ".join(args), out))
+
+    nleaves = 1 + max([j for ufunc, refs in steps for kind, j in refs if kind == 'leaf'] + [-1])
+    source = "\n".join(["def _kernel(%s):" % ", ".join("l%d" % j for j in range(nleaves))]
+                       + lines
+                       + ["    return %s" % names[-1]])
+
+    exec(compile(source, "<fused operator>", "exec"), namespace)
+    kernel = namespace["_kernel"]
+    kernel.source = source
+
+    return kernel
+
+def _evaluate(node):
+    """Evaluate `node` and its uncached operands with a single kernel
+
+    Returns
+    -------
+    ndarray or None
+        The value of `node`, or `None` if `node` cannot be fused with
+        any of its operands.
+    """
+    if not _isFusible(node):
+        return None
+
+    program = _Program()
+    program.expand(node)
+
+    if len(program.steps) < 2:
+        return None
+
+    key = program.key
+    if key is None:
+        return None
+
+    leaves = [value for obj, value in program.leaves]
+
+    kernel = _kernels.get(key)
+    if kernel is None:
+        values = _interpret(program.steps, leaves)
+        if len(_kernels) >= _maxKernels:
+            _kernels.clear()
+        _kernels[key] = _compile(program.steps, values)
+        return values[-1]
+
+    return kernel(*leaves)
+
+def _test():
+    import fipy.tests.doctestPlus
+    return fipy.tests.doctestPlus.testmod()
+
+if __name__ == "__main__":
+    _test()
@@ -466,9 +466,36 @@ else:
         ## We can't use Numeric.dot on an array of vectors
         return sqrt(dot(a1, a2))
 
-def nearest(data, points, max_mem=1e8):
+def _nearestTree(data):
+    """build a spatial index for `nearest` from (D, N) `data`
+
+    >>> tree = _nearestTree(array([[0., 1., 2.], [0., 0., 1.]]))
+    >>> print(nearest(None, [[1.9, 0.1], [1.2, 0.]], tree=tree))
+    [2 0]
+    """
+    from scipy.spatial import cKDTree
+
+    return cKDTree(transpose(asarray(data)))
+
+def nearest(data, points, max_mem=1e8, tree=None):
     """find the indices of `data` that are closest to `points`
 
+    Unless either has physical units, `points` are located with a
+    KD-tree of `data`.
+
+    Parameters
+    ----------
+    data : array_like
+        (D, N) coordinates to search.
+    points : array_like
+        (D, M) coordinates to locate.
+    max_mem : float
+        Maximum number of bytes of distances to calculate at once when
+        comparing every point with all of `data`.
+    tree : ~scipy.spatial.cKDTree, optional
+        Prebuilt index of `data` (see `_nearestTree()`), in which case
+        `data` is ignored.
+
     >>> from fipy import *
     >>> m0 = Grid2D(dx=(.1, 1., 10.), dy=(.1, 1., 10.))
     >>> m1 = Grid2D(nx=2, ny=2, dx=5., dy=5.)
@@ -478,6 +505,32 @@ def nearest(data, points, max_mem=1e8):
     [4 5 7 8]
     >>> print(nearest(m0.cellCenters.globalValue, m1.cellCenters.globalValue, max_mem=10000))
     [4 5 7 8]
+    >>> print(_nearestByDistance(m0.cellCenters.globalValue, m1.cellCenters.globalValue, max_mem=100))
+    [4 5 7 8]
+    """
+    if tree is None:
+        data = asanyarray(data)
+        points = asanyarray(points)
+
+        if data.shape[-1] == 0:
+            return arange(0)
+
+        if _isPhysical(data) or _isPhysical(points):
+            return _nearestByDistance(data, points, max_mem=max_mem)
+
+        tree = _nearestTree(data)
+
+    points = asarray(points, dtype=float)
+    if points.shape[-1] == 0:
+        return arange(0)
+
+    _, nearestIndices = tree.query(transpose(points.reshape((tree.m, -1))))
+
+    return asarray(nearestIndices, dtype=INT_DTYPE)
+
+def _nearestByDistance(data, points, max_mem=1e8):
+    """find the indices of `data` that are closest to `points` by
+    comparing every point with all of `data`
     """
     data = asanyarray(data)
     points = asanyarray(points)
@@ -40,6 +40,8 @@ class CellVariable(MeshVariable):
             self._old = self.copy()
         else:
             self._old = None
+        self._older = None
+        self._oldUpdates = 0
 
     @property
     def _variableClass(self):
@@ -143,10 +145,19 @@ class CellVariable(MeshVariable):
 
     def __call__(self, points=None, order=0, nearestCellIDs=None):
         r"""
-        Interpolates the `CellVariable` to a set of points using a
-        method that has a memory requirement on the order of `Ncells` by
-        `Npoints` in general, but uses only `Ncells` when the
-        `CellVariable`'s mesh is a `UniformGrid` object.
+        Interpolates the `CellVariable` to a set of points.
+
+        With `order=0`, each point takes the value of the nearest cell.
+        With `order=1`, each point is located in a cell of the mesh and
+        interpolated from the vertices of that cell, with barycentric
+        weights in triangles, tetrahedra and segments and bilinear
+        weights in quadrilaterals.  The value at each vertex is fitted to
+        the cells around it, so linear fields are interpolated exactly,
+        even on the boundary.  The sparse interpolation operator is cached
+        by the mesh, so repeated interpolation to the same points is a
+        matrix-vector product.  Points outside the mesh (or any point, in
+        parallel) are extrapolated from the nearest cell with its
+        gradient.
 
         Tests
 
@@ -155,8 +166,9 @@ class CellVariable(MeshVariable):
             >>> v = CellVariable(mesh=m, value=m.cellCenters[0])
             >>> print(v(((0., 1.1, 1.2), (0., 1., 1.))))
             [ 0.5  1.5  1.5]
-            >>> print(v(((0., 1.1, 1.2), (0., 1., 1.)), order=1))
-            [ 0.25  1.1   1.2 ]
+            >>> print(numerix.allclose(v(((0., 1.1, 1.2), (0., 1., 1.)), order=1),
+            ...                        (0., 1.1, 1.2)))
+            True
             >>> m0 = Grid2D(nx=2, ny=2, dx=1., dy=1.)
             >>> m1 = Grid2D(nx=4, ny=4, dx=.5, dy=.5)
             >>> x, y = m0.cellCenters
@@ -165,8 +177,18 @@ class CellVariable(MeshVariable):
             [ 0.25  0.25  0.75  0.75  0.25  0.25  0.75  0.75  0.75  0.75  2.25  2.25
               0.75  0.75  2.25  2.25]
             >>> print(v0(m1.cellCenters.globalValue, order=1))
-            [ 0.125  0.25   0.5    0.625  0.25   0.375  0.875  1.     0.5    0.875
-              1.875  2.25   0.625  1.     2.25   2.625]
+            [-0.078125  0.140625  0.359375  0.578125  0.140625  0.546875  0.953125
+              1.359375  0.359375  0.953125  1.546875  2.140625  0.578125  1.359375
+              2.140625  2.921875]
+
+        Linear fields are interpolated exactly anywhere in the mesh
+
+            >>> m2 = Grid2D(nx=4, ny=4)
+            >>> x, y = m2.cellCenters
+            >>> v2 = CellVariable(mesh=m2, value=x + 2 * y)
+            >>> print(numerix.allclose(v2(((1.5, 2.25, 2.9, 0., 3.8), (1.5, 1.25, 2.6, 0., 0.1)), order=1),
+            ...                        (4.5, 4.75, 8.1, 0., 4.)))
+            True
 
         Parameters
         ----------
@@ -180,18 +202,32 @@ class CellVariable(MeshVariable):
         """
         if points is not None:
 
-            if nearestCellIDs is None:
-                nearestCellIDs = self.mesh._getNearestCellID(points)
-
             if order == 0:
+                if nearestCellIDs is None:
+                    nearestCellIDs = self.mesh._getNearestCellID(points)
+
                 return self.globalValue[..., nearestCellIDs]
 
             elif order == 1:
-                ##cellID = self.mesh._getNearestCellID(points)
-##                return self[...,self.mesh._getNearestCellID(points)] + numerix.dot(points - self.mesh.cellCenters[...,cellID], self.grad[...,cellID])
-                return (self.globalValue[..., nearestCellIDs]
-                        + numerix.dot(points - self.mesh.cellCenters.globalValue[..., nearestCellIDs],
-                                      self.grad.globalValue[..., nearestCellIDs]))
+                operator, outside = self.mesh._getInterpolationOperator(points)
+
+                value = self.globalValue
+                N = value.shape[-1]
+                M = len(outside)
+                interpolated = operator * numerix.reshape(value, (-1, N)).T
+                interpolated = numerix.reshape(interpolated.T, value.shape[:-1] + (M,))
+
+                if outside.any():
+                    points = numerix.reshape(numerix.asarray(points, dtype=float), (self.mesh.dim, M))
+                    if nearestCellIDs is None:
+                        nearestCellIDs = self.mesh._getNearestCellID(points[..., outside])
+                    else:
+                        nearestCellIDs = numerix.asarray(nearestCellIDs)[outside]
+                    interpolated[..., outside] = (value[..., nearestCellIDs]
+                                                  + numerix.dot(points[..., outside] - self.mesh.cellCenters.globalValue[..., nearestCellIDs],
+                                                                self.grad.globalValue[..., nearestCellIDs]))
+
+                return interpolated
 
             else:
                 raise ValueError('order should be either 0 or 1')
@@ -480,7 +516,43 @@ class CellVariable(MeshVariable):
         if self._old is None:
             raise AssertionError('The updateOld method requires the CellVariable to have an old value. Set hasOld to True when instantiating the CellVariable.')
         else:
+            if self._older is not None:
+                self._older.value = self._old.value.copy()
             self._old.value = self.value.copy()
+            self._oldUpdates += 1
+
+    @property
+    def older(self):
+        """
+        Return the values of the `CellVariable` from before the old
+        values, for time stepping schemes that use two previous time
+        steps.  The history is only kept once it has been asked for, so
+        it starts out equal to the old values.
+
+        >>> from fipy import *
+        >>> var = CellVariable(mesh=Grid1D(nx=2), value=(1, 2), hasOld=True)
+        >>> print(var.older)
+        [1 2]
+        >>> var.value = (3, 4)
+        >>> var.updateOld()
+        >>> var.value = (5, 6)
+        >>> var.updateOld()
+        >>> print(var.old)
+        [5 6]
+        >>> print(var.older)
+        [3 4]
+
+        Without an old value, there is no history either
+
+        >>> var = CellVariable(mesh=Grid1D(nx=2), value=(1, 2))
+        >>> print(var.older is var)
+        True
+        """
+        if self._old is None:
+            return self
+        if self._older is None:
+            self._older = self._old.copy()
+        return self._older
 
     def _resetToOld(self):
         if self._old is not None:
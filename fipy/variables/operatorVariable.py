@@ -53,6 +53,11 @@ def _OperatorVariableClass(baseClass=object):
                 if inline.doInline:
                     return self._execInline(comment=self.comment)
                 else:
+                    from fipy.tools import fusion
+                    if fusion.doFusion:
+                        value = fusion._evaluate(self)
+                        if value is not None:
+                            return value
                     return self._calcValue_()
 
         def _calcValue_(self):
@@ -60,7 +65,7 @@ def _OperatorVariableClass(baseClass=object):
 
         def _isCached(self):
             return (Variable._isCached(self)
-                    or (len(self.subscribedVariables) > 1 and not self._cacheNever))
+                    or (self._hasSubscribers(2) and not self._cacheNever))
 
         def _getCstring(self, argDict={}, id="", freshen=False):
             if self.canInline: # and not self._isCached():
@@ -68,7 +73,7 @@ def _OperatorVariableClass(baseClass=object):
             else:
                 s = baseClass._getCstring(self, argDict=argDict, id=id)
             if freshen:
-                self._markFresh()
+                self._markEvaluated()
 
             return s
 
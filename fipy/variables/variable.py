@@ -93,7 +93,6 @@ class Variable(object):
 
         self._cached = cached
 
-        self.stale = 1
         self._markFresh()
 
 ##    __array_priority__ and __array_wrap__ are required to override
@@ -492,7 +491,7 @@ class Variable(object):
                 self._setValueInternal(value=value)
             else:
                 self._setValueInternal(value=None)
-            self._markFresh()
+            self._markEvaluated()
         else:
             value = self._value
 
@@ -791,9 +790,7 @@ class Variable(object):
         raise NotImplementedError
 
     def _getSubscribedVariables(self):
-        self._subscribedVariables = [sub for sub in self._subscribedVariables if sub() is not None]
-
-        return self._subscribedVariables
+        return [sub for sub in self._subscribedVariables if sub() is not None]
 
     def _setSubscribedVariables(self, sVars):
         self._subscribedVariables = sVars
@@ -801,25 +798,104 @@ class Variable(object):
     subscribedVariables = property(_getSubscribedVariables,
                                    _setSubscribedVariables)
 
-    def __markStale(self):
-        for subscriber in self.subscribedVariables:
+    def _hasSubscribers(self, count):
+        """Whether at least `count` live `Variable` objects require `self`
+        """
+        live = 0
+        for subscriber in self._subscribedVariables:
             if subscriber() is not None:
-                ## Even though getSubscribedVariables() strips out dead
-                ## references, subscriber() might still be dead due to the
-                ## vagaries of garbage collection and the possibility that
-                ## later subscribedVariables were removed, changing the
-                ## dependencies of this subscriber.
-                ## See <https://github.com/usnistgov/fipy/issues/103> for more explanation.
-                subscriber()._markStale()
+                live += 1
+                if live >= count:
+                    return True
+        return False
+
+    ## Staleness is pulled, not pushed. Every assignment to a `Variable`
+    ## increments its `_version` and the global `_clock`, which is O(1)
+    ## regardless of how many `Variable` objects depend on it. A
+    ## dependent `Variable` records the versions of its
+    ## `requiredVariables` when it is evaluated and compares them when it
+    ## is next accessed. Nothing needs to be compared if nothing
+    ## anywhere has been assigned since the last comparison.
+
+    _clock = 0
+    _version = 0
+    _syncedAt = -1
+    _stale = True
+    _inputVersions = ()
+
+    def _sync(self):
+        """Bring `self` up to date with the versions of its inputs
+
+        Returns
+        -------
+        int
+            The current version of `self`, which changes whenever
+            `self` is assigned or any of its inputs change
+        """
+        if self._syncedAt != Variable._clock:
+            # mark as synchronized before descending, so that cycles in
+            # the graph terminate
+            self._syncedAt = Variable._clock
+            versions = [var._sync() for var in self.requiredVariables]
+            if versions != self._inputVersions:
+                self._inputVersions = versions
+                self._stale = True
+                self._version += 1
+        return self._version
+
+    @property
+    def stale(self):
+        """Whether the value of `self` must be recalculated
+
+            >>> a = Variable(value=3)
+            >>> b = a * 2
+            >>> c = b + 1
+            >>> print(c.value)
+            7
+            >>> print(c.stale)
+            False
+            >>> a.value = 4
+            >>> print(b.stale, c.stale)
+            True True
+            >>> print(c.value)
+            9
+            >>> print(c.stale)
+            False
+
+        Assignment costs the same no matter how many `Variable` objects
+        depend on `a`
+
+            >>> version = a._version
+            >>> a.value = 5
+            >>> print(a._version - version)
+            1
+        """
+        self._sync()
+        return self._stale
+
+    def _touch(self):
+        Variable._clock += 1
+        self._version += 1
+
+    def _markEvaluated(self):
+        """`self` has just been calculated from its current inputs
+        """
+        self._stale = False
+        self._inputVersions = [var._version for var in self.requiredVariables]
 
     def _markFresh(self):
-        self.stale = 0
-        self.__markStale()
+        """`self` has been assigned a new value
+        """
+        self._inputVersions = [var._sync() for var in self.requiredVariables]
+        self._stale = False
+        self._touch()
+        self._syncedAt = Variable._clock
 
     def _markStale(self):
-        if not self.stale:
-            self.stale = 1
-            self.__markStale()
+        """`self` must be recalculated before its value is next used
+        """
+        self._stale = True
+        self._touch()
 
     def _requires(self, var):
         if isinstance(var, Variable):
@@ -838,7 +914,8 @@ class Variable(object):
         # due to circular references between the subscriber
         # and the subscribee
         import weakref
-        self.subscribedVariables.append(weakref.ref(var))
+        self._subscribedVariables = self.subscribedVariables
+        self._subscribedVariables.append(weakref.ref(var))
 
     @property
     def _variableClass(self):